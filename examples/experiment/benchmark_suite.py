@@ -0,0 +1,251 @@
+"""Benchmark suite for the hot paths of the toolkit, with regression tracking.
+
+Runs `read_ohlc_csv`, `transform_ohlc` over a grid of timeframes and step sizes,
+`check_data_integrity`, `infer_time_step` and `percent_return` on deterministic
+synthetic 1-minute data of 10k, 1M and 7M rows, so no download is required.
+
+Each case runs in a fresh process, so that its peak resident set size (RSS) is
+not inflated by earlier cases. The peak RSS includes the input data. Throughput is
+the number of input rows per second of the fastest of at least `--repeat` runs
+(fast cases are repeated for at least half a second).
+
+Results are written to JSON, and compared against a stored baseline: a case
+regresses if its throughput drops, or its peak RSS grows, by more than
+`--tolerance` (ignoring slowdowns of less than 2 ms, which are within the noise of
+the smallest cases). The script exits with status 1 on regressions, so it can gate a
+release. Baselines are machine-specific: record one with `--update-baseline` on the
+machine that runs the comparison.
+
+Usage:
+    python examples/experiment/benchmark_suite.py --sizes 10k 1m
+    python examples/experiment/benchmark_suite.py --update-baseline
+"""
+
+import argparse
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # Keep the output readable
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from ohlc_toolkit.config.logging import get_logger
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+from ohlc_toolkit.pandas_ta.percent_return import percent_return
+from ohlc_toolkit.transform import transform_ohlc
+from ohlc_toolkit.utils import check_data_integrity, infer_time_step
+
+LOGGER = get_logger(__name__)
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "7m": 7_000_000}
+TRANSFORM_GRID = [
+    ("5m", 1),
+    ("5m", 5),
+    ("1h", 1),
+    ("1h", 15),
+    ("1h", 60),
+    ("1d", 1),
+    ("1d", 60),
+    ("1d", 1440),
+]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+DEFAULT_TOLERANCE = 0.25
+MIN_TOTAL_SECONDS = 0.5  # Fast cases are repeated until then, to reduce noise
+NOISE_FLOOR_SECONDS = 0.002  # Smaller slowdowns are not reported as regressions
+
+
+def synthetic_minute_data(num_rows: int) -> pd.DataFrame:
+    """Generate a deterministic random walk of 1-minute OHLC data."""
+    rng = np.random.default_rng(0)
+    close = 30000 + np.cumsum(rng.normal(0, 5, num_rows))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 3, num_rows))
+    df = pd.DataFrame(
+        {
+            "timestamp": 1325376000 + 60 * np.arange(num_rows, dtype="int32"),
+            "open": open_.astype("float32"),
+            "high": (np.maximum(open_, close) + spread).astype("float32"),
+            "low": (np.minimum(open_, close) - spread).astype("float32"),
+            "close": close.astype("float32"),
+            "volume": rng.exponential(2, num_rows).astype("float32"),
+        }
+    )
+    df.index = pd.to_datetime(df["timestamp"], unit="s")
+    df.index.name = "datetime"
+    return df
+
+
+def _csv_path(num_rows: int, data_dir: str) -> str:
+    """Write the synthetic data to a CSV file once, and return its path."""
+    path = f"{data_dir}/minute_data_{num_rows}.csv"
+    if not os.path.exists(path):
+        synthetic_minute_data(num_rows).to_csv(path, index=False)
+    return path
+
+
+def _setup_case(name: str, num_rows: int, data_dir: str) -> Callable[[], object]:
+    """Prepare the input of a case, and return the function to time."""
+    if name == "read_ohlc_csv":
+        path = _csv_path(num_rows, data_dir)
+        return lambda: read_ohlc_csv(path)
+
+    df = synthetic_minute_data(num_rows)
+    if name == "check_data_integrity":
+        return lambda: check_data_integrity(df, LOGGER, time_step_seconds=60)
+    if name == "infer_time_step":
+        return lambda: infer_time_step(df, LOGGER)
+    if name == "percent_return":
+        return lambda: percent_return(df["close"], length=60)
+
+    timeframe, step_size = name.removeprefix("transform_ohlc[").rstrip("]").split(",")
+    step_size_minutes = int(step_size.removeprefix("step="))
+    return lambda: transform_ohlc(df, timeframe, step_size_minutes)
+
+
+def case_names() -> list[str]:
+    """Get the names of all benchmark cases."""
+    return [
+        "read_ohlc_csv",
+        *(f"transform_ohlc[{tf},step={step}]" for tf, step in TRANSFORM_GRID),
+        "check_data_integrity",
+        "infer_time_step",
+        "percent_return",
+    ]
+
+
+def _peak_rss_bytes() -> int:
+    """Get the peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # KiB on Linux
+
+
+def run_case(name: str, num_rows: int, repeat: int, data_dir: str) -> dict:
+    """Run one case, and measure its throughput and peak RSS."""
+    run = _setup_case(name, num_rows, data_dir)
+    timings: list[float] = []
+    while len(timings) < repeat or sum(timings) < MIN_TOTAL_SECONDS:
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    seconds = min(timings)
+    return {
+        "rows": num_rows,
+        "seconds": seconds,
+        "rows_per_second": num_rows / seconds,
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+
+def metadata() -> dict:
+    """Describe the machine and library versions the results were measured with."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": int(time.time()),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """List the cases that regressed against the baseline."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        throughput_ratio = result["rows_per_second"] / reference["rows_per_second"]
+        rss_ratio = result["peak_rss_bytes"] / reference["peak_rss_bytes"]
+        slowdown = result["seconds"] - reference["seconds"]
+        if throughput_ratio < 1 - tolerance and slowdown > NOISE_FLOOR_SECONDS:
+            regressions.append(
+                f"{key}: throughput at {throughput_ratio:.0%} of baseline"
+            )
+        if rss_ratio > 1 + tolerance:
+            regressions.append(f"{key}: peak RSS at {rss_ratio:.0%} of baseline")
+    return regressions
+
+
+def main() -> int:
+    """Run the suite, and return the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=list(SIZES))
+    parser.add_argument("--filter", default="", help="Only run cases containing this")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the results as the new baseline instead of comparing",
+    )
+    args = parser.parse_args()
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as data_dir:
+        for size in args.sizes:
+            for name in case_names():
+                if args.filter not in name:
+                    continue
+                # A fresh process per case, for an accurate peak RSS
+                with context.Pool(processes=1, maxtasksperchild=1) as pool:
+                    result = pool.apply(
+                        run_case, (name, SIZES[size], args.repeat, data_dir)
+                    )
+                key = f"{name}@{size}"
+                results[key] = result
+                print(
+                    f"{key:<40} {result['seconds']:>9.4f} s "
+                    f"{result['rows_per_second'] / 1e6:>9.1f} M rows/s "
+                    f"{result['peak_rss_bytes'] / 2**20:>8.0f} MiB"
+                )
+
+    report = {"metadata": metadata(), "results": results}
+    with open(args.output, "wb") as file:
+        file.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        baseline = {"metadata": metadata(), "results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "rb") as file:
+                baseline = orjson.loads(file.read())
+        baseline["metadata"] = report["metadata"]
+        baseline["results"].update(results)
+        with open(args.baseline, "wb") as file:
+            file.write(orjson.dumps(baseline, option=orjson.OPT_INDENT_2))
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, nothing to compare against")
+        return 0
+    with open(args.baseline, "rb") as file:
+        baseline = orjson.loads(file.read())
+    if baseline["metadata"]["machine"] != report["metadata"]["machine"] or (
+        baseline["metadata"]["cpu_count"] != report["metadata"]["cpu_count"]
+    ):
+        print("Warning: the baseline was recorded on a different machine")
+
+    regressions = compare(results, baseline["results"], args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Experimental script to compare the cost of logging in `transform_ohlc` per mode.
+
+Calls `transform_ohlc` many times on a small synthetic dataset, as an API serving
+many small requests would, with each combination of plain or serialized logs,
+performance logging off or on, and the INFO or WARNING level. The logging
+configuration is read from the environment at import time, so each mode runs in a
+subprocess, with its log output sent to a pipe that is drained and discarded.
+Pass a call count as the first argument to change the number of calls.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+NUM_CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+MODES = {
+    "plain": {},
+    "plain, performance": {"ENABLE_PERFORMANCE_LOGGING": "TRUE"},
+    "serialized": {"ENABLE_SERIALIZE_LOGS": "TRUE"},
+    "serialized, performance": {
+        "ENABLE_SERIALIZE_LOGS": "TRUE",
+        "ENABLE_PERFORMANCE_LOGGING": "TRUE",
+    },
+    "level WARNING": {"LOG_LEVEL": "WARNING"},
+}
+
+WORKER = """
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.transform import transform_ohlc
+
+num_rows = 120
+df = pd.DataFrame(
+    {
+        "timestamp": 1325376000 + 60 * np.arange(num_rows),
+        "open": np.linspace(100, 110, num_rows),
+        "high": np.linspace(101, 111, num_rows),
+        "low": np.linspace(99, 109, num_rows),
+        "close": np.linspace(100, 110, num_rows),
+        "volume": np.ones(num_rows),
+    }
+)
+df.index = pd.to_datetime(df["timestamp"], unit="s")
+transform_ohlc(df, "1h", 15)  # Warm up
+seconds = timeit.timeit(lambda: transform_ohlc(df, "1h", 15), number=int(sys.argv[1]))
+print(seconds, file=sys.stderr)
+"""
+
+
+def run_mode(env: dict[str, str]) -> tuple[float, int]:
+    """Run the worker with the given env, and get its time and bytes logged."""
+    process = subprocess.Popen(
+        [sys.executable, "-c", WORKER, str(NUM_CALLS)],
+        env={**os.environ, "DISABLE_COLORIZE_LOGS": "TRUE", **env},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    assert process.stdout is not None and process.stderr is not None
+    stdout_pipe = process.stdout
+    bytes_logged = 0
+
+    def drain():
+        nonlocal bytes_logged
+        while chunk := stdout_pipe.read(1 << 16):
+            bytes_logged += len(chunk)
+
+    reader = threading.Thread(target=drain)
+    reader.start()
+    stderr = process.stderr.read()
+    process.wait()
+    reader.join()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode())
+    return float(stderr.decode().split()[-1]), bytes_logged
+
+
+print(f"transform_ohlc logging mode benchmark over {NUM_CALLS} calls")
+print("-" * 40)
+for mode, env in MODES.items():
+    seconds, bytes_logged = min(
+        (run_mode(env) for _ in range(5)), key=lambda result: result[0]
+    )
+    print(
+        f"{mode:<25} {seconds / NUM_CALLS * 1e6:8.1f} µs/call "
+        f"{bytes_logged / NUM_CALLS:8.0f} bytes logged/call"
+    )
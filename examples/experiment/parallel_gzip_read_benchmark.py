@@ -0,0 +1,65 @@
+"""Experimental script to compare serial and parallel reads of a gzip CSV file.
+
+`read_ohlc_csv` normally decompresses and parses a `.csv.gz` file on one thread.
+Once the file is rewritten as independent gzip members with `recompress_gzip`, its
+blocks can be decompressed and parsed on several threads. Uses synthetic 1-minute
+data, so no download is required. Pass a row count as the first argument to change
+the dataset size, and a worker count as the second (defaults to the CPU count).
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.csv_index import recompress_gzip
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+
+NUM_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+NUM_WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1  # noqa: PLR2004
+
+
+def synthetic_minute_data(num_rows: int) -> pd.DataFrame:
+    """Generate a deterministic random walk of 1-minute OHLC data."""
+    rng = np.random.default_rng(0)
+    close = 30000 + np.cumsum(rng.normal(0, 5, num_rows))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 3, num_rows))
+    return pd.DataFrame(
+        {
+            "timestamp": 1325376000 + 60 * np.arange(num_rows),
+            "open": open_.round(2),
+            "high": (np.maximum(open_, close) + spread).round(2),
+            "low": (np.minimum(open_, close) - spread).round(2),
+            "close": close.round(2),
+            "volume": rng.exponential(2, num_rows).round(8),
+        }
+    )
+
+
+with tempfile.TemporaryDirectory() as temp_dir:
+    path = f"{temp_dir}/btcusd.csv.gz"
+    blocked_path = f"{temp_dir}/btcusd_blocked.csv.gz"
+    synthetic_minute_data(NUM_ROWS).to_csv(path, index=False)
+
+    print(f"Gzip CSV read benchmark over {NUM_ROWS} rows, {NUM_WORKERS} workers")
+    print("-" * 40)
+
+    recompress_time = timeit.timeit(
+        lambda: recompress_gzip(path, blocked_path, num_workers=NUM_WORKERS), number=1
+    )
+    serial_time = timeit.timeit(lambda: read_ohlc_csv(path), number=1)
+    parallel_time = timeit.timeit(
+        lambda: read_ohlc_csv(blocked_path, num_workers=NUM_WORKERS), number=1
+    )
+    pd.testing.assert_frame_equal(
+        read_ohlc_csv(path), read_ohlc_csv(blocked_path, num_workers=NUM_WORKERS)
+    )
+
+    print(f"One-off recompression time: {recompress_time:.4f} seconds")
+    print(f"Serial read time: {serial_time:.4f} seconds")
+    print(f"Parallel read time: {parallel_time:.4f} seconds")
+    print(f"Speed-up: {serial_time / parallel_time:.1f}x")
@@ -0,0 +1,62 @@
+"""Experimental script to compare the numpy and pandas engines of `rolling_ohlc`.
+
+The pandas engine calls back into Python for every window (to get the open and close),
+so its runtime grows with the number of rows, while the numpy engine only uses
+vectorized sliding window kernels. Uses synthetic 1-minute data, so no download is
+required. Pass a row count as the first argument to change the dataset size.
+"""
+
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.timeframes import parse_timeframe
+from ohlc_toolkit.transform import rolling_ohlc
+
+NUM_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+TIMEFRAMES = ["5m", "15m", "1h", "4h", "1d", "1w", "4w"]
+
+
+def synthetic_minute_data(num_rows: int) -> pd.DataFrame:
+    """Generate a deterministic random walk of 1-minute OHLC data."""
+    rng = np.random.default_rng(0)
+    close = 30000 + np.cumsum(rng.normal(0, 5, num_rows))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 3, num_rows))
+    return pd.DataFrame(
+        {
+            "timestamp": 1325376000 + 60 * np.arange(num_rows, dtype="int32"),
+            "open": open_.astype("float32"),
+            "high": (np.maximum(open_, close) + spread).astype("float32"),
+            "low": (np.minimum(open_, close) - spread).astype("float32"),
+            "close": close.astype("float32"),
+            "volume": rng.exponential(2, num_rows).astype("float32"),
+        }
+    )
+
+
+df_1min = synthetic_minute_data(NUM_ROWS)
+print(f"Rolling OHLC engine benchmark over {NUM_ROWS} rows")
+print("-" * 40)
+
+for timeframe in TIMEFRAMES:
+    timeframe_minutes = parse_timeframe(timeframe)
+    numpy_result = rolling_ohlc(df_1min, timeframe_minutes)
+    pandas_result = rolling_ohlc(df_1min, timeframe_minutes, engine="pandas")
+    pd.testing.assert_frame_equal(numpy_result, pandas_result, rtol=1e-12)
+
+    numpy_time = (
+        timeit.timeit(lambda: rolling_ohlc(df_1min, timeframe_minutes), number=3) / 3  # noqa: B023
+    )
+    pandas_time = timeit.timeit(
+        lambda: rolling_ohlc(df_1min, timeframe_minutes, engine="pandas"),  # noqa: B023
+        number=1,
+    )
+
+    print(f"Timeframe: {timeframe} ({timeframe_minutes} minutes)")
+    print(f"numpy engine time: {numpy_time:.4f} seconds")
+    print(f"pandas engine time: {pandas_time:.4f} seconds")
+    print(f"Speed-up: {pandas_time / numpy_time:.1f}x")
+    print("-" * 40)
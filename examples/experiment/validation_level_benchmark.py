@@ -0,0 +1,71 @@
+"""Experimental script to compare the validation levels of `transform_ohlc`.
+
+With `validation="full"`, the output goes through `check_data_integrity` (null
+counts of every column, sort order, duplicates and gaps); "cheap" only checks that
+the timestamps are increasing, and "none" skips checks. An input with a datetime
+index skips the copy and sort, while an input with a plain index is indexed by
+timestamp first. The overhead matters most for large step sizes, where the
+aggregation itself is cheap. Uses synthetic 1-minute data, so no download is
+required. Pass a row count as the first argument to change the dataset size.
+"""
+
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.transform import VALIDATION_LEVELS, transform_ohlc
+
+NUM_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+CASES = [("1h", 60), ("1d", 60), ("1h", 1)]
+
+
+def synthetic_minute_data(num_rows: int) -> pd.DataFrame:
+    """Generate a deterministic random walk of 1-minute OHLC data."""
+    rng = np.random.default_rng(0)
+    close = 30000 + np.cumsum(rng.normal(0, 5, num_rows))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 3, num_rows))
+    df = pd.DataFrame(
+        {
+            "timestamp": 1325376000 + 60 * np.arange(num_rows, dtype="int32"),
+            "open": open_.astype("float32"),
+            "high": (np.maximum(open_, close) + spread).astype("float32"),
+            "low": (np.minimum(open_, close) - spread).astype("float32"),
+            "close": close.astype("float32"),
+            "volume": rng.exponential(2, num_rows).astype("float32"),
+        }
+    )
+    df.index = pd.to_datetime(df["timestamp"], unit="s")
+    df.index.name = "datetime"
+    return df
+
+
+inputs = {
+    "datetime index": synthetic_minute_data(NUM_ROWS),
+    "plain index": synthetic_minute_data(NUM_ROWS).reset_index(drop=True),
+}
+print(f"transform_ohlc validation level benchmark over {NUM_ROWS} rows")
+print("-" * 40)
+
+for timeframe, step_size_minutes in CASES:
+    print(f"Timeframe: {timeframe}, step size: {step_size_minutes} minutes")
+    for input_name, df in inputs.items():
+        for validation in VALIDATION_LEVELS:
+            run_time = (
+                min(
+                    timeit.repeat(
+                        lambda: transform_ohlc(
+                            df,  # noqa: B023
+                            timeframe,  # noqa: B023
+                            step_size_minutes,  # noqa: B023
+                            validation=validation,  # noqa: B023
+                        ),
+                        number=10,
+                        repeat=3,
+                    )
+                )
+                / 10
+            )
+            print(f"{input_name:<15} {validation:<6} {run_time * 1000:8.2f} ms")
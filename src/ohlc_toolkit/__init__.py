@@ -1,21 +1,51 @@
 """OHLC Toolkit."""
 
+from ohlc_toolkit.aggregation import aggregate_ohlc_arrays
+from ohlc_toolkit.bars import TradeBarBuilder, trades_to_bars
+from ohlc_toolkit.binary_format import open_ohlc_binary, write_ohlc_binary
 from ohlc_toolkit.bitstamp_dataset_downloader import DatasetDownloader
-from ohlc_toolkit.csv_reader import read_ohlc_csv
+from ohlc_toolkit.csv_index import recompress_gzip
+from ohlc_toolkit.csv_reader import iter_ohlc_csv, read_ohlc_csv
+from ohlc_toolkit.gaps import fill_gaps
+from ohlc_toolkit.multi_symbol import read_ohlc_csv_dir, transform_ohlc_symbols
+from ohlc_toolkit.profiling import PipelineStats
+from ohlc_toolkit.streaming import StreamingOHLCAggregator
 from ohlc_toolkit.timeframes import (
     format_timeframe,
     parse_timeframe,
     validate_timeframe,
     validate_timeframe_format,
 )
-from ohlc_toolkit.transform import transform_ohlc
+from ohlc_toolkit.transform import (
+    resample_ohlc,
+    transform_ohlc,
+    transform_ohlc_chunks,
+    transform_ohlc_many,
+)
+from ohlc_toolkit.transform_cache import TransformCache
 
 __all__ = [
     "DatasetDownloader",
+    "PipelineStats",
+    "StreamingOHLCAggregator",
+    "TradeBarBuilder",
+    "TransformCache",
+    "aggregate_ohlc_arrays",
+    "fill_gaps",
     "format_timeframe",
+    "iter_ohlc_csv",
+    "open_ohlc_binary",
     "parse_timeframe",
     "read_ohlc_csv",
+    "read_ohlc_csv_dir",
+    "recompress_gzip",
+    "resample_ohlc",
+    "trades_to_bars",
     "transform_ohlc",
+    "transform_ohlc_chunks",
+    "transform_ohlc_many",
+    "transform_ohlc_symbols",
     "validate_timeframe",
     "validate_timeframe_format",
+    "write_ohlc_binary",
 ]
@@ -0,0 +1,429 @@
+"""Vectorized window kernels for OHLC aggregation.
+
+The sliding reductions use the van Herk/Gil-Werman scheme: the input is split into
+blocks of `window` rows, and every window is the combination of one block suffix
+and one block prefix. This gives O(n) cost regardless of the window size, and only
+calls into NumPy ufuncs (no per-window Python callbacks). Maxima and minima are
+exact, but sums are added in another order than a running sum, so they can differ
+from pandas' rolling sums in the last bits (a few ULPs).
+
+The strided reductions compute only the windows that start every `step` rows, so
+their cost scales with the rows covered by the kept windows rather than with
+rows x window.
+
+The group reductions reduce runs of rows with equal keys (e.g. calendar buckets),
+touching each row once.
+
+`aggregate_ohlc_arrays` combines the kernels into a full OHLC aggregation over plain
+arrays, and is the core that the DataFrame functions of `transform` wrap.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+_IDENTITIES: dict[np.ufunc, float] = {
+    np.maximum: -np.inf,
+    np.minimum: np.inf,
+    np.add: 0.0,
+}
+
+
+def _sliding_reduce(values: np.ndarray, window: int, ufunc: np.ufunc) -> np.ndarray:
+    """Reduce every trailing window of `values` with `ufunc`.
+
+    Args:
+        values (np.ndarray): 1-D input array.
+        window (int): Number of rows per window.
+        ufunc (np.ufunc): One of `np.maximum`, `np.minimum` or `np.add`.
+
+    Returns:
+        np.ndarray: Float64 array with the same length as `values`. Element `i` holds
+            the reduction of `values[i - window + 1 : i + 1]`, or NaN for the first
+            `window - 1` rows.
+
+    """
+    if window < 1:
+        raise ValueError(f"Window size must be a positive integer, got {window}.")
+
+    num_rows = len(values)
+    result = np.full(num_rows, np.nan)
+    if window > num_rows:
+        return result
+
+    values = np.asarray(values, dtype=np.float64)
+    if window == 1:
+        result[:] = values
+        return result
+
+    pad = -num_rows % window
+    padded = np.concatenate([values, np.full(pad, _IDENTITIES[ufunc])])
+    blocks = padded.reshape(-1, window)
+    prefix = ufunc.accumulate(blocks, axis=1).ravel()
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    # The window starting at row i spans the suffix of its block from i and the
+    # prefix of the next block up to i + window - 1, except that a window starting
+    # on a block boundary is exactly one block (the suffix alone). Slices are views,
+    # so the only array written is the result.
+    windows = result[window - 1 :]
+    starts_suffix = suffix[: num_rows - window + 1]
+    ufunc(starts_suffix, prefix[window - 1 : num_rows], out=windows)
+    windows[::window] = starts_suffix[::window]
+    return result
+
+
+def sliding_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Compute the maximum over every trailing window of `window` rows."""
+    return _sliding_reduce(values, window, np.maximum)
+
+
+def sliding_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Compute the minimum over every trailing window of `window` rows."""
+    return _sliding_reduce(values, window, np.minimum)
+
+
+def sliding_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Compute the sum over every trailing window of `window` rows."""
+    return _sliding_reduce(values, window, np.add)
+
+
+def _window_edge(values: np.ndarray, window: int, *, first: bool) -> np.ndarray:
+    """Get the first or last value of every trailing window by shifted indexing.
+
+    Windows containing a NaN yield NaN, matching pandas' rolling semantics where a
+    window needs `window` valid observations.
+    """
+    if window < 1:
+        raise ValueError(f"Window size must be a positive integer, got {window}.")
+
+    num_rows = len(values)
+    result = np.full(num_rows, np.nan)
+    if window > num_rows:
+        return result
+
+    values = np.asarray(values, dtype=np.float64)
+    result[window - 1 :] = (
+        values[: num_rows - window + 1] if first else values[window - 1 :]
+    )
+
+    nan_mask = np.isnan(values)
+    if nan_mask.any():
+        result[sliding_max(nan_mask, window) > 0] = np.nan
+    return result
+
+
+def window_first(values: np.ndarray, window: int) -> np.ndarray:
+    """Get the first value of every trailing window of `window` rows."""
+    return _window_edge(values, window, first=True)
+
+
+def window_last(values: np.ndarray, window: int) -> np.ndarray:
+    """Get the last value of every trailing window of `window` rows."""
+    return _window_edge(values, window, first=False)
+
+
+def num_strided_windows(num_rows: int, window: int, step: int) -> int:
+    """Count the windows of `window` rows that start every `step` rows from row 0."""
+    if window < 1 or step < 1:
+        raise ValueError(
+            f"Window and step sizes must be positive integers, got {window} and {step}."
+        )
+    return max((num_rows - window) // step + 1, 0)
+
+
+def _strided_reduce(
+    values: np.ndarray, window: int, step: int, ufunc: np.ufunc
+) -> np.ndarray:
+    """Reduce the windows that start every `step` rows with `ufunc`.
+
+    Only the kept windows are computed. Non-overlapping windows (`window <= step`) are
+    reduced directly with `ufunc.reduceat`. Overlapping windows are first reduced into
+    blocks of `gcd(window, step)` rows, so that each window is a whole number of
+    blocks, and the sliding kernel then runs over the (much shorter) block array.
+
+    Args:
+        values (np.ndarray): 1-D input array.
+        window (int): Number of rows per window.
+        step (int): Number of rows between the starts of consecutive windows.
+        ufunc (np.ufunc): One of `np.maximum`, `np.minimum` or `np.add`.
+
+    Returns:
+        np.ndarray: Float64 array with one element per window, where element `j`
+            holds the reduction of `values[j * step : j * step + window]`.
+
+    """
+    num_windows = num_strided_windows(len(values), window, step)
+    if num_windows == 0:
+        return np.empty(0)
+
+    values = np.asarray(values, dtype=np.float64)
+    span = (num_windows - 1) * step + window  # Rows covered by the kept windows
+
+    if window == step:
+        return ufunc.reduce(values[:span].reshape(num_windows, window), axis=1)
+
+    if window < step:
+        indices = np.empty(2 * num_windows, dtype=np.intp)
+        indices[0::2] = np.arange(num_windows) * step
+        indices[1::2] = indices[0::2] + window
+        # The last window may end at the end of the array, which reduceat implies
+        return ufunc.reduceat(values[:span], indices[:-1])[0::2]
+
+    block_size = np.gcd(window, step)
+    blocks = ufunc.reduce(values[:span].reshape(-1, block_size), axis=1)
+    block_window = window // block_size
+    return _sliding_reduce(blocks, block_window, ufunc)[
+        block_window - 1 :: step // block_size
+    ]
+
+
+def strided_max(values: np.ndarray, window: int, step: int) -> np.ndarray:
+    """Compute the maximum over the windows that start every `step` rows."""
+    return _strided_reduce(values, window, step, np.maximum)
+
+
+def strided_min(values: np.ndarray, window: int, step: int) -> np.ndarray:
+    """Compute the minimum over the windows that start every `step` rows."""
+    return _strided_reduce(values, window, step, np.minimum)
+
+
+def strided_sum(values: np.ndarray, window: int, step: int) -> np.ndarray:
+    """Compute the sum over the windows that start every `step` rows."""
+    return _strided_reduce(values, window, step, np.add)
+
+
+def _strided_edge(
+    values: np.ndarray, window: int, step: int, *, first: bool
+) -> np.ndarray:
+    """Get the first or last value of the windows that start every `step` rows.
+
+    Windows containing a NaN yield NaN, consistent with the sliding kernels.
+    """
+    num_windows = num_strided_windows(len(values), window, step)
+    starts = np.arange(num_windows) * step
+    values = np.asarray(values, dtype=np.float64)
+    result = values[starts if first else starts + window - 1]
+
+    nan_mask = np.isnan(values)
+    if nan_mask.any():
+        result[strided_max(nan_mask, window, step) > 0] = np.nan
+    return result
+
+
+def strided_first(values: np.ndarray, window: int, step: int) -> np.ndarray:
+    """Get the first value of the windows that start every `step` rows."""
+    return _strided_edge(values, window, step, first=True)
+
+
+def strided_last(values: np.ndarray, window: int, step: int) -> np.ndarray:
+    """Get the last value of the windows that start every `step` rows."""
+    return _strided_edge(values, window, step, first=False)
+
+
+def _combine_windows(
+    values: np.ndarray, count: int, spacing: int, num_windows: int, ufunc: np.ufunc
+) -> np.ndarray:
+    """Combine `count` consecutive windows into larger windows.
+
+    Given the reductions of windows that start every `step` rows, the window of
+    `count * window` rows starting at window `j` is the reduction of windows
+    `j, j + spacing, ..., j + (count - 1) * spacing`, where `spacing = window / step`.
+    """
+    result = np.array(values[:num_windows], dtype=np.float64)
+    for offset in range(spacing, count * spacing, spacing):
+        ufunc(result, values[offset : offset + num_windows], out=result)
+    return result
+
+
+def combine_max(
+    values: np.ndarray, count: int, spacing: int, num_windows: int
+) -> np.ndarray:
+    """Combine strided window maxima into the maxima of larger windows."""
+    return _combine_windows(values, count, spacing, num_windows, np.maximum)
+
+
+def combine_min(
+    values: np.ndarray, count: int, spacing: int, num_windows: int
+) -> np.ndarray:
+    """Combine strided window minima into the minima of larger windows."""
+    return _combine_windows(values, count, spacing, num_windows, np.minimum)
+
+
+def combine_sum(
+    values: np.ndarray, count: int, spacing: int, num_windows: int
+) -> np.ndarray:
+    """Combine strided window sums into the sums of larger windows."""
+    return _combine_windows(values, count, spacing, num_windows, np.add)
+
+
+def group_starts(keys: np.ndarray) -> np.ndarray:
+    """Get the start rows of the runs of equal consecutive keys."""
+    keys = np.asarray(keys)
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.intp)
+    return np.concatenate([[0], np.flatnonzero(keys[1:] != keys[:-1]) + 1])
+
+
+def _group_reduce(
+    values: np.ndarray, starts: np.ndarray, ufunc: np.ufunc
+) -> np.ndarray:
+    """Reduce the groups of rows starting at `starts` with `ufunc`.
+
+    Args:
+        values (np.ndarray): 1-D input array.
+        starts (np.ndarray): Increasing start rows of the groups, beginning with 0.
+            Each group runs until the next start, and the last one until the end.
+        ufunc (np.ufunc): One of `np.maximum`, `np.minimum` or `np.add`.
+
+    Returns:
+        np.ndarray: Float64 array with one element per group.
+
+    """
+    if len(starts) == 0:
+        return np.empty(0)
+    return ufunc.reduceat(np.asarray(values, dtype=np.float64), starts)
+
+
+def group_max(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Compute the maximum of each group of rows."""
+    return _group_reduce(values, starts, np.maximum)
+
+
+def group_min(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Compute the minimum of each group of rows."""
+    return _group_reduce(values, starts, np.minimum)
+
+
+def group_sum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Compute the sum of each group of rows."""
+    return _group_reduce(values, starts, np.add)
+
+
+def _group_edge(values: np.ndarray, starts: np.ndarray, *, first: bool) -> np.ndarray:
+    """Get the first or last value of each group of rows.
+
+    Groups containing a NaN yield NaN, consistent with the window kernels.
+    """
+    if len(starts) == 0:
+        return np.empty(0)
+
+    values = np.asarray(values, dtype=np.float64)
+    if first:
+        result = values[starts]
+    else:
+        result = values[np.append(starts[1:], len(values)) - 1]
+
+    nan_mask = np.isnan(values)
+    if nan_mask.any():
+        result[group_max(nan_mask, starts) > 0] = np.nan
+    return result
+
+
+def group_first(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Get the first value of each group of rows."""
+    return _group_edge(values, starts, first=True)
+
+
+def group_last(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Get the last value of each group of rows."""
+    return _group_edge(values, starts, first=False)
+
+
+def aggregate_ohlc_arrays(  # noqa: PLR0913
+    timestamps: np.ndarray,
+    opens: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    volumes: np.ndarray,
+    window: int,
+    step: int = 1,
+    out: Sequence[np.ndarray] | None = None,
+) -> tuple[np.ndarray, ...]:
+    """Aggregate OHLC arrays over the windows that start every `step` rows.
+
+    This is the array-level core of the OHLC transforms, without any pandas
+    overhead. Windows start at row 0 and every `step` rows after it, and each one
+    covers `window` rows; a step of 1 gives every trailing window.
+
+    Args:
+        timestamps (np.ndarray): Timestamps of the input rows, e.g. int64.
+        opens (np.ndarray): Open prices, e.g. float32 or float64.
+        highs (np.ndarray): High prices.
+        lows (np.ndarray): Low prices.
+        closes (np.ndarray): Close prices.
+        volumes (np.ndarray): Volumes.
+        window (int): Number of rows per window.
+        step (int): Number of rows between the starts of consecutive windows.
+        out (Sequence[np.ndarray] | None): Six caller-provided 1-D arrays, one per
+            output column, each with one element per window. Results are cast into
+            their data types. If None, new arrays are allocated: the timestamps keep
+            their data type, and the other columns are float64.
+
+    Returns:
+        tuple[np.ndarray, ...]: The timestamp (of the last row), open, high, low,
+            close and volume of each window, in the `out` arrays if given.
+
+    """
+    num_windows = num_strided_windows(len(timestamps), window, step)
+    timestamps = np.asarray(timestamps)
+    if out is None:
+        out = (
+            np.empty(num_windows, dtype=timestamps.dtype),
+            *(np.empty(num_windows) for _ in range(5)),
+        )
+    elif len(out) != 6 or any(array.shape != (num_windows,) for array in out):  # noqa: PLR2004
+        raise ValueError(
+            f"Expected 6 output arrays of shape ({num_windows},), one per column."
+        )
+    if num_windows == 0:
+        return tuple(out)
+
+    if step == 1:
+        start = window - 1
+        results = (
+            window_first(opens, window)[start:],
+            sliding_max(highs, window)[start:],
+            sliding_min(lows, window)[start:],
+            window_last(closes, window)[start:],
+            sliding_sum(volumes, window)[start:],
+        )
+    else:
+        results = (
+            strided_first(opens, window, step),
+            strided_max(highs, window, step),
+            strided_min(lows, window, step),
+            strided_last(closes, window, step),
+            strided_sum(volumes, window, step),
+        )
+
+    out[0][:] = timestamps[window - 1 :: step][:num_windows]
+    for target, result in zip(out[1:], results, strict=True):
+        target[:] = result
+    return tuple(out)
+
+
+def aggregate_ohlc_columns(
+    columns: Sequence[np.ndarray],
+    window: int,
+    step: int = 1,
+    out: Sequence[np.ndarray] | None = None,
+) -> tuple[np.ndarray, ...]:
+    """Aggregate OHLC columns like `aggregate_ohlc_arrays`, given as one sequence.
+
+    Args:
+        columns (Sequence[np.ndarray]): The timestamp, open, high, low, close and
+            volume arrays, in this order.
+        window (int): Number of rows per window.
+        step (int): Number of rows between the starts of consecutive windows.
+        out (Sequence[np.ndarray] | None): Output arrays, see `aggregate_ohlc_arrays`.
+
+    Returns:
+        tuple[np.ndarray, ...]: The aggregated columns, in the same order.
+
+    """
+    timestamps, opens, highs, lows, closes, volumes = columns
+    return aggregate_ohlc_arrays(
+        timestamps, opens, highs, lows, closes, volumes, window, step, out=out
+    )
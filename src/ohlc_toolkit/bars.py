@@ -0,0 +1,235 @@
+"""Building OHLCV bars from trades.
+
+`TradeBarBuilder` consumes batches of trades, as timestamp (in seconds), price and
+size arrays sorted by timestamp, and aggregates them into bars. Each batch is
+handled by a few vectorized passes: a bar number is computed for every trade, and
+the bars are reduced with the group kernels of `aggregation`. Only the trades of
+the bar that is still open are kept between batches.
+
+Bars can be sampled by:
+
+- time: epoch-aligned buckets of any timeframe, down to one second, labelled by
+  the start of the bucket like `resample_ohlc`. Buckets without trades yield no
+  bar, so that `fill_gaps` or the `gap_policy` of `transform_ohlc` can fill them.
+- tick, volume or dollar: a bar closes on the trade that takes the cumulative
+  number of trades, size, or price times size to the next multiple of the
+  threshold, and is labelled by the timestamp of that trade. Whatever a closing
+  trade exceeds the threshold by counts towards the next bars, so bars hold the
+  threshold on average. A trade closes at most one bar: a trade worth several
+  thresholds makes the following bars close on their first trade.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.aggregation import (
+    group_first,
+    group_last,
+    group_max,
+    group_min,
+    group_starts,
+    group_sum,
+)
+from ohlc_toolkit.config import DEFAULT_COLUMNS
+from ohlc_toolkit.config.logging import get_logger
+from ohlc_toolkit.timeframes import parse_timeframe
+
+LOGGER = get_logger(__name__)
+
+BAR_TYPES = ("time", "tick", "volume", "dollar")
+TRADE_COLUMNS = ("timestamp", "price", "size")
+
+
+class TradeBarBuilder:
+    """Stateful builder of OHLCV bars from batches of trades."""
+
+    def __init__(self, bar_type: str = "time", size: int | float | str = 1):
+        """Initialize the bar builder.
+
+        Args:
+            bar_type (str): One of "time", "tick", "volume" or "dollar".
+            size (int | float | str): For time bars, the timeframe, either an
+                integer (in minutes) or a string (e.g., '1s', '5m'). For the other
+                bar types, the number of trades, size, or price times size per bar.
+
+        """
+        if bar_type not in BAR_TYPES:
+            raise ValueError(
+                f"Invalid bar type: {bar_type}. Must be one of {', '.join(BAR_TYPES)}."
+            )
+        threshold: int | float
+        if isinstance(size, str) and bar_type == "time":
+            threshold = parse_timeframe(size, to_minutes=False)
+        elif isinstance(size, str):
+            raise ValueError(f"Invalid bar size: {size}")
+        elif bar_type == "time":
+            threshold = size * 60
+        else:
+            threshold = size
+        if not threshold > 0 or (
+            bar_type in ("time", "tick") and threshold != int(threshold)
+        ):
+            raise ValueError(f"Invalid bar size: {size}")
+
+        self.bar_type = bar_type
+        self.size = threshold
+        self._pending = {column: np.empty(0) for column in TRADE_COLUMNS}
+        # Cumulative measure before the pending trades, less the completed bars
+        self._offset = 0.0
+        self._last_timestamp = np.empty(0)
+
+    def update(self, trades: pd.DataFrame | Mapping[str, np.ndarray]) -> pd.DataFrame:
+        """Add a batch of trades, and return the bars they complete.
+
+        Args:
+            trades (pd.DataFrame | Mapping[str, np.ndarray]): Trades with timestamp
+                (in seconds), price and size columns, sorted by timestamp, and not
+                before the trades of previous batches.
+
+        Returns:
+            pd.DataFrame: The completed bars, with a datetime index.
+
+        """
+        batch = {column: np.asarray(trades[column]).ravel() for column in TRADE_COLUMNS}
+        timestamps = batch["timestamp"]
+        if (np.diff(np.concatenate([self._last_timestamp, timestamps])) < 0).any():
+            raise ValueError("Trades must be sorted by timestamp.")
+        if len(timestamps):
+            self._last_timestamp = timestamps[-1:]
+
+        columns = {
+            column: np.concatenate([self._pending[column], batch[column]])
+            if len(self._pending[column])
+            else batch[column]
+            for column in TRADE_COLUMNS
+        }
+        if self.bar_type == "time":
+            num_complete, labels, starts = self._time_bars(columns["timestamp"])
+        else:
+            num_complete, labels, starts = self._threshold_bars(columns)
+
+        # The trades from the first incomplete bar on stay pending
+        num_trades = len(columns["timestamp"])
+        end = starts[num_complete] if num_complete < len(starts) else num_trades
+        self._pending = {column: values[end:] for column, values in columns.items()}
+        LOGGER.debug(
+            "Built {} {} bars from {} trades",
+            num_complete,
+            self.bar_type,
+            len(timestamps),
+        )
+        return _build_bars(
+            {column: values[:end] for column, values in columns.items()},
+            labels[:num_complete],
+            starts[:num_complete],
+        )
+
+    def flush(self) -> pd.DataFrame:
+        """Return the bar of the pending trades, even though it is not complete.
+
+        Returns:
+            pd.DataFrame: The pending bar, or an empty DataFrame if there are no
+                pending trades.
+
+        """
+        columns = self._pending
+        if self.bar_type == "time":
+            _, labels, starts = self._time_bars(columns["timestamp"])
+        else:
+            _, labels, starts = self._threshold_bars(columns)
+
+        self._pending = {column: values[:0] for column, values in columns.items()}
+        self._offset = 0.0
+        return _build_bars(columns, labels, starts)
+
+    def _time_bars(self, timestamps: np.ndarray) -> tuple[int, np.ndarray, np.ndarray]:
+        """Group trades into time buckets. The last bucket may get more trades."""
+        buckets = timestamps // self.size
+        starts = group_starts(buckets)
+        labels = (buckets[starts] * self.size).astype(timestamps.dtype)
+        return max(len(starts) - 1, 0), labels, starts
+
+    def _threshold_bars(
+        self, columns: dict[str, np.ndarray]
+    ) -> tuple[int, np.ndarray, np.ndarray]:
+        """Group trades into bars of a threshold of trades, size, or dollars."""
+        if self.bar_type == "tick":
+            measure = np.ones(len(columns["timestamp"]))
+        elif self.bar_type == "volume":
+            measure = np.asarray(columns["size"], dtype=np.float64)
+        else:
+            measure = np.multiply(columns["price"], columns["size"], dtype=np.float64)
+
+        cumulative = np.cumsum(measure)
+        cumulative += self._offset
+        num_trades = len(cumulative)
+        max_bars = (
+            min(num_trades, int(cumulative[-1] // self.size)) if num_trades else 0
+        )
+
+        # Bar k closes on the first trade that takes the cumulative measure to
+        # (k + 1) * size, but no earlier than the trade after the one closing bar
+        # k - 1: ends[k] = max(ends[k - 1] + 1, first[k]), as a running maximum
+        bar_numbers = np.arange(max_bars)
+        first = np.searchsorted(cumulative, (bar_numbers + 1) * self.size)
+        ends = bar_numbers + np.maximum.accumulate(first - bar_numbers)
+        ends = ends[ends < num_trades]
+
+        num_complete = len(ends)
+        starts = np.append(0, ends + 1)
+        starts = starts[starts < num_trades]
+        last_trades = np.append(starts[1:], num_trades)[: len(starts)] - 1
+        labels = columns["timestamp"][last_trades]
+        if num_complete:
+            # Carry the excess of the closing trade over to the next bars
+            self._offset = float(cumulative[ends[-1]] - num_complete * self.size)
+        return num_complete, labels, starts
+
+
+def _build_bars(
+    columns: dict[str, np.ndarray], labels: np.ndarray, starts: np.ndarray
+) -> pd.DataFrame:
+    """Aggregate the trades of each bar into OHLCV columns."""
+    prices = columns["price"]
+    df_bars = pd.DataFrame(
+        {
+            "timestamp": labels,
+            "open": group_first(prices, starts),
+            "high": group_max(prices, starts),
+            "low": group_min(prices, starts),
+            "close": group_last(prices, starts),
+            "volume": group_sum(columns["size"], starts),
+        },
+        columns=DEFAULT_COLUMNS,
+    )
+    df_bars.index = pd.to_datetime(df_bars["timestamp"], unit="s")
+    df_bars.index.name = "datetime"
+    return df_bars
+
+
+def trades_to_bars(
+    trades: pd.DataFrame | Mapping[str, np.ndarray],
+    bar_type: str = "time",
+    size: int | float | str = 1,
+) -> pd.DataFrame:
+    """Build OHLCV bars from trades, including the last, possibly incomplete, bar.
+
+    Args:
+        trades (pd.DataFrame | Mapping[str, np.ndarray]): Trades with timestamp (in
+            seconds), price and size columns, sorted by timestamp.
+        bar_type (str): One of "time", "tick", "volume" or "dollar".
+        size (int | float | str): The timeframe of time bars, or the threshold of
+            the other bar types, see `TradeBarBuilder`.
+
+    Returns:
+        pd.DataFrame: The bars, with a datetime index.
+
+    """
+    builder = TradeBarBuilder(bar_type, size)
+    df_bars = builder.update(trades)
+    df_pending = builder.flush()
+    if df_pending.empty:
+        return df_bars
+    return pd.concat([df_bars, df_pending])
@@ -0,0 +1,246 @@
+"""Memory-mapped binary format for OHLC data.
+
+A binary OHLC file holds a fixed header, a column table, and one contiguous array
+per column (with the data types of `config.DEFAULT_DTYPE`), each starting on a page
+boundary. An optional timestamp index block holds every `index_stride`-th
+timestamp, so that a time range is located by touching a handful of pages.
+
+Layout (all integers little-endian):
+
+- Header: magic (`OHLCBIN` and a NUL byte), version (uint32), number of columns
+  (uint32), number of rows (uint64), index stride (uint64, 0 if no index) and
+  index offset (uint64).
+- Column table: per column, its name (24 bytes, NUL-padded), its NumPy data type
+  string (8 bytes, e.g. `<f4`) and the offset of its array (uint64).
+- Column arrays and the index block, each aligned to `PAGE_SIZE` bytes.
+
+Opening a file only reads the header and column table, and maps the columns with
+`np.memmap`, so loading is O(1) regardless of the history length. Pages are read
+from disk only when they are accessed.
+"""
+
+import os
+import struct
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.config import DEFAULT_COLUMNS, DEFAULT_DTYPE
+from ohlc_toolkit.config.logging import get_logger
+
+LOGGER = get_logger(__name__)
+
+MAGIC = b"OHLCBIN\0"
+FORMAT_VERSION = 1
+PAGE_SIZE = 4096
+DEFAULT_INDEX_STRIDE = 4096  # Rows per timestamp index entry
+
+_HEADER = struct.Struct("<8sIIQQQ")
+_COLUMN_ENTRY = struct.Struct("<24s8sQ")
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to the next page boundary."""
+    return -(-offset // PAGE_SIZE) * PAGE_SIZE
+
+
+def write_ohlc_binary(
+    df: pd.DataFrame, filepath: str, *, index_stride: int = DEFAULT_INDEX_STRIDE
+) -> str:
+    """Write OHLC data to a binary OHLC file.
+
+    The data is sorted by timestamp if needed, and stored with the data types of
+    `config.DEFAULT_DTYPE`. The file is written to a temporary path first and then
+    atomically renamed, so readers never see a partial file.
+
+    Args:
+        df (pd.DataFrame): OHLC data with the default columns.
+        filepath (str): Path of the binary file.
+        index_stride (int): Number of rows per timestamp index entry, or 0 to write
+            no index.
+
+    Returns:
+        str: The path of the binary file.
+
+    """
+    if (np.diff(df["timestamp"].to_numpy(dtype=np.int64)) < 0).any():
+        df = df.sort_values("timestamp", kind="stable")
+    arrays = [
+        np.ascontiguousarray(df[column].to_numpy(dtype=DEFAULT_DTYPE[column]))
+        for column in DEFAULT_COLUMNS
+    ]
+    num_rows = len(df)
+
+    offset = _align(_HEADER.size + _COLUMN_ENTRY.size * len(arrays))
+    column_offsets = []
+    for array in arrays:
+        column_offsets.append(offset)
+        offset = _align(offset + array.nbytes)
+
+    index = None
+    index_offset = 0
+    if index_stride > 0 and num_rows > 0:
+        index = np.ascontiguousarray(arrays[0][::index_stride], dtype=np.int64)
+        index_offset = offset
+
+    temp_path = f"{filepath}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(
+            _HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                len(arrays),
+                num_rows,
+                index_stride if index is not None else 0,
+                index_offset,
+            )
+        )
+        for column, array, column_offset in zip(
+            DEFAULT_COLUMNS, arrays, column_offsets, strict=True
+        ):
+            file.write(
+                _COLUMN_ENTRY.pack(
+                    column.encode(), array.dtype.str.encode(), column_offset
+                )
+            )
+        for array, column_offset in zip(arrays, column_offsets, strict=True):
+            file.seek(column_offset)
+            array.tofile(file)
+        if index is not None:
+            file.seek(index_offset)
+            index.tofile(file)
+    os.replace(temp_path, filepath)
+
+    LOGGER.info("Wrote {} rows to binary OHLC file `{}`", num_rows, filepath)
+    return filepath
+
+
+def open_ohlc_binary(filepath: str) -> "OHLCBinaryFile":
+    """Open a binary OHLC file, memory-mapping its columns.
+
+    Args:
+        filepath (str): Path of the binary file.
+
+    Returns:
+        OHLCBinaryFile: The opened file.
+
+    """
+    return OHLCBinaryFile(filepath)
+
+
+class OHLCBinaryFile:
+    """A binary OHLC file, with its columns memory-mapped."""
+
+    def __init__(self, filepath: str):
+        """Open a binary OHLC file.
+
+        Args:
+            filepath (str): Path of the binary file.
+
+        """
+        self.filepath = filepath
+        with open(filepath, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size or header[:8] != MAGIC:
+                raise ValueError(f"Not a binary OHLC file: {filepath}")
+
+            (_, version, num_columns, num_rows, index_stride, index_offset) = (
+                _HEADER.unpack(header)
+            )
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported binary OHLC file version: {version}")
+            entries = [
+                _COLUMN_ENTRY.unpack(file.read(_COLUMN_ENTRY.size))
+                for _ in range(num_columns)
+            ]
+
+        self.num_rows = num_rows
+        self.index_stride = index_stride
+        self.columns = {
+            name.rstrip(b"\0").decode(): self._map(
+                np.dtype(dtype.rstrip(b"\0").decode()), offset, num_rows
+            )
+            for name, dtype, offset in entries
+        }
+        self.index = (
+            self._map(np.dtype(np.int64), index_offset, -(-num_rows // index_stride))
+            if index_stride
+            else None
+        )
+        LOGGER.debug("Opened binary OHLC file `{}` with {} rows", filepath, num_rows)
+
+    def _map(self, dtype: np.dtype, offset: int, length: int) -> np.ndarray:
+        """Memory-map an array of the file, read-only."""
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(
+            self.filepath, dtype=dtype, mode="r", offset=offset, shape=(length,)
+        )
+
+    def __len__(self) -> int:
+        """Get the number of rows."""
+        return self.num_rows
+
+    def row_range(self, start: int | None = None, end: int | None = None) -> slice:
+        """Get the rows within a timestamp range.
+
+        Uses the timestamp index, if any, to narrow the search down to one block
+        of `index_stride` rows, so only a few pages of timestamps are read.
+
+        Args:
+            start: First timestamp to include. Defaults to the first row.
+            end: Last timestamp to include. Defaults to the last row.
+
+        Returns:
+            slice: The rows within the range.
+
+        """
+        first = 0 if start is None else self._search(start, "left")
+        last = self.num_rows if end is None else self._search(end, "right")
+        return slice(first, max(first, last))
+
+    def _search(self, timestamp: int, side: Literal["left", "right"]) -> int:
+        """Find the insertion row of a timestamp, like `np.searchsorted`."""
+        timestamps = self.columns["timestamp"]
+        if self.index is None:
+            return int(np.searchsorted(timestamps, timestamp, side=side))
+
+        # The row lies between the index entries around the timestamp
+        block = int(np.searchsorted(self.index, timestamp, side=side))
+        low = max(block - 1, 0) * self.index_stride
+        high = min(block * self.index_stride + 1, self.num_rows)
+        return low + int(np.searchsorted(timestamps[low:high], timestamp, side=side))
+
+    def read(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+        *,
+        datetime_index: bool = True,
+    ) -> pd.DataFrame:
+        """Read the rows within a timestamp range, without copying the columns.
+
+        The DataFrame columns are views of the memory-mapped arrays, so only the
+        pages that are later accessed (e.g. by `transform_ohlc`) are read from disk.
+
+        Args:
+            start: First timestamp to include. Defaults to the first row.
+            end: Last timestamp to include. Defaults to the last row.
+            datetime_index: Whether to index the rows by datetime, as `read_ohlc_csv`
+                does. Building the index reads the timestamps of the range; without
+                it, the rows keep a range index.
+
+        Returns:
+            pd.DataFrame: The OHLC data of the range.
+
+        """
+        rows = self.row_range(start, end)
+        df = pd.DataFrame(
+            {name: np.asarray(values[rows]) for name, values in self.columns.items()},
+            copy=False,
+        )
+        if datetime_index:
+            df.index = pd.to_datetime(df["timestamp"], unit="s")
+            df.index.name = "datetime"
+        return df
@@ -1,22 +1,68 @@
 """Functions for loading OHLC data from a CSV file."""
 
 import os
+from http import HTTPStatus
 
+import orjson
 import pandas as pd
 import requests
 from tqdm import tqdm
 
 from ohlc_toolkit.config.logging import get_logger
+from ohlc_toolkit.dataset_cache import ParsedDatasetCache
+from ohlc_toolkit.history_store import HistoryStore
 
 LOGGER = get_logger(__name__)
 
+DOWNLOAD_BLOCK_SIZE = 1024 * 1024  # 1 Mebibyte
+DOWNLOAD_TIMEOUT = (10, 60)  # Connect and read timeouts, in seconds
+
+
+def _load_download_meta(path: str) -> dict[str, str | None] | None:
+    """Load the HTTP validators (ETag and Last-Modified) saved for a download."""
+    meta_path = f"{path}.meta.json"
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, "rb") as file:
+        return orjson.loads(file.read())
+
+
+def _save_download_meta(path: str, meta: dict[str, str | None]):
+    """Save the HTTP validators (ETag and Last-Modified) of a download."""
+    with open(f"{path}.meta.json", "wb") as file:
+        file.write(orjson.dumps(meta))
+
+
+def _remove_download_meta(path: str):
+    """Remove the saved HTTP validators of a download, if any."""
+    meta_path = f"{path}.meta.json"
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+
+def _remove_download(path: str):
+    """Remove a (partial) download and its saved HTTP validators, if any."""
+    if os.path.exists(path):
+        os.remove(path)
+    _remove_download_meta(path)
+
 
 class DatasetDownloader:
     """Class for downloading Bitstamp datasets from https://github.com/ff137/bitstamp-btcusd-minute-data."""
 
-    def __init__(self, data_dir: str = "data"):
-        """Initialize the Bitstamp dataset downloader."""
+    def __init__(self, data_dir: str = "data", *, cache: bool = False):
+        """Initialize the Bitstamp dataset downloader.
+
+        Args:
+            data_dir: Directory to download the datasets to.
+            cache: Whether to cache the parsed datasets as columnar files (in
+                `{data_dir}/.cache`), so later reads skip CSV parsing. Requires
+                `pyarrow`.
+
+        """
         self.data_dir = data_dir.rstrip("/")
+        self.session = requests.Session()
+        self.cache = ParsedDatasetCache(f"{self.data_dir}/.cache") if cache else None
 
         self.DATA_BASE_URL = "https://raw.githubusercontent.com/ff137/bitstamp-btcusd-minute-data/main/data"
         self.BITSTAMP_BULK_DATA_URL = (
@@ -26,35 +72,112 @@ class DatasetDownloader:
             f"{self.DATA_BASE_URL}/updates/btcusd_bitstamp_1min_latest.csv"
         )
 
-    def _download_file(self, url: str, output_path: str):
-        """Download a file from a URL with a progress bar."""
+    def _download_file(self, url: str, output_path: str) -> bool:
+        """Download a file from a URL with a progress bar.
+
+        Downloads are incremental: if the file was downloaded before, the request is
+        conditional (`If-None-Match`/`If-Modified-Since`) and an unchanged file is
+        not transferred again. A partial download left by an interrupted run is
+        resumed with a `Range` request, guarded by `If-Range` so that a changed file
+        is downloaded from scratch. Data is written to a temporary `.part` file that
+        is atomically renamed once complete.
+
+        Returns:
+            bool: True if the file was (re)downloaded, False if it was unchanged.
+
+        """
         LOGGER.info("Initializing download of file from `{}`", url)
-        response = requests.get(url, stream=True, allow_redirects=True)
-        total_size = int(response.headers.get("content-length", 0))
-        block_size = 1024  # 1 Kibibyte
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        part_path = f"{output_path}.part"
+        output_meta = _load_download_meta(output_path)
+        part_meta = _load_download_meta(part_path)
+
+        headers: dict[str, str] = {}
+        resume_from = 0
+        part_validator = (
+            part_meta.get("etag") or part_meta.get("last_modified")
+            if part_meta
+            else None
+        )
+        if part_validator and os.path.exists(part_path):
+            resume_from = os.path.getsize(part_path)
+            headers["Range"] = f"bytes={resume_from}-"
+            headers["If-Range"] = part_validator
+        elif output_meta and os.path.exists(output_path):
+            if etag := output_meta.get("etag"):
+                headers["If-None-Match"] = etag
+            if last_modified := output_meta.get("last_modified"):
+                headers["If-Modified-Since"] = last_modified
+
+        response = self.session.get(
+            url,
+            headers=headers,
+            stream=True,
+            allow_redirects=True,
+            timeout=DOWNLOAD_TIMEOUT,
+        )
+        with response:
+            if response.status_code == HTTPStatus.NOT_MODIFIED:
+                LOGGER.info("File at `{}` is unchanged, skipping download", output_path)
+                return False
+
+            if response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+                LOGGER.info("Partial download is not resumable, restarting download")
+                _remove_download(part_path)
+                return self._download_file(url, output_path)
+
+            response.raise_for_status()
+            if response.status_code != HTTPStatus.PARTIAL_CONTENT:
+                resume_from = 0  # The server sent the full file
+
+            remote_meta = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+            }
+            if remote_meta["etag"] or remote_meta["last_modified"]:
+                _save_download_meta(part_path, remote_meta)
+
+            self._write_response(response, part_path, resume_from)
+
+        os.replace(part_path, output_path)
+        _save_download_meta(output_path, remote_meta)
+        _remove_download_meta(part_path)
+        return True
+
+    @staticmethod
+    def _write_response(response: requests.Response, part_path: str, resume_from: int):
+        """Stream a response body to a partial download file."""
+        total_size = int(response.headers.get("content-length", 0)) + resume_from
 
         with (
-            open(output_path, "wb") as file,
+            open(part_path, "ab" if resume_from else "wb") as file,
             tqdm(
-                desc=output_path,
+                desc=part_path,
                 total=total_size,
+                initial=resume_from,
                 unit="iB",
                 unit_scale=True,
                 unit_divisor=1024,
             ) as progress_bar,
         ):
-            for data in response.iter_content(block_size):
+            for data in response.iter_content(DOWNLOAD_BLOCK_SIZE):
                 file.write(data)
                 progress_bar.update(len(data))
 
-        # Get the actual file size using tqdm's n attribute
-        file_size_mb = progress_bar.n / (1024 * 1024)  # Convert to MB
+        # Get the transferred size using tqdm's n attribute
+        file_size_mb = (progress_bar.n - resume_from) / (1024 * 1024)  # Convert to MB
         LOGGER.info(
-            "Successfully downloaded file to `{}` ({:.2f} MB)",
-            output_path,
+            "Successfully downloaded file to `{}` ({:.2f} MB transferred)",
+            part_path,
             file_size_mb,
         )
 
+    def _read_dataset(self, file_path: str, **read_csv_kwargs) -> pd.DataFrame:
+        """Read a downloaded dataset, through the parsed dataset cache if enabled."""
+        if self.cache is None:
+            return pd.read_csv(file_path, **read_csv_kwargs)
+        return self.cache.read_csv(file_path, **read_csv_kwargs)
+
     def download_bitstamp_btcusd_minute_data(
         self,
         *,
@@ -77,8 +200,8 @@ class DatasetDownloader:
                 Default behaviour will read and return the DataFrames.
 
         Returns:
-            pd.DataFrame: If skip_read = False, the downloaded datasets, merged if both
-                are requested. If skip_read = True, None is returned.
+            pd.DataFrame: If skip_read = False, the downloaded datasets, merged (with
+                one row per timestamp) if both are requested. If skip_read = True, None is returned.
 
         """
         if not (bulk or recent):
@@ -92,15 +215,13 @@ class DatasetDownloader:
             # check if the file already exists
             if os.path.exists(bulk_file_path) and not overwrite_bulk:
                 LOGGER.info("Bulk dataset already exists, skipping download")
-                df_bulk = pd.read_csv(bulk_file_path, compression="gzip")
-                dataframes.append(df_bulk)
             else:
                 LOGGER.info("Downloading bulk dataset")
                 self._download_file(self.BITSTAMP_BULK_DATA_URL, bulk_file_path)
 
             if not skip_read:
                 LOGGER.info("Reading bulk dataset into DataFrame")
-                df_bulk = pd.read_csv(bulk_file_path, compression="gzip")
+                df_bulk = self._read_dataset(bulk_file_path, compression="gzip")
                 dataframes.append(df_bulk)
 
         if recent:
@@ -110,18 +231,46 @@ class DatasetDownloader:
             # check if the file already exists
             if os.path.exists(recent_file_path) and not overwrite_recent:
                 LOGGER.info("Recent dataset already exists, skipping download")
-                df_recent = pd.read_csv(recent_file_path)
-                dataframes.append(df_recent)
             else:
                 LOGGER.info("Downloading recent dataset")
                 self._download_file(self.BITSTAMP_RECENT_DATA_URL, recent_file_path)
 
             if not skip_read:
                 LOGGER.info("Reading recent dataset into DataFrame")
-                df_recent = pd.read_csv(recent_file_path)
+                df_recent = self._read_dataset(recent_file_path)
                 dataframes.append(df_recent)
 
-        return pd.concat(dataframes) if dataframes else None
+        if not dataframes:
+            return None
+
+        df = pd.concat(dataframes)
+        if "timestamp" in df.columns:
+            # The bulk and recent datasets overlap, so keep one row per timestamp
+            df = df.drop_duplicates(subset="timestamp", keep="last")
+        return df
+
+    def update_history_store(self, store: HistoryStore) -> int:
+        """Download the recent dataset and merge its new rows into a history store.
+
+        Only the rows after the store's high-water mark are appended, and the recent
+        dataset is only transferred if it changed since the last download.
+
+        Args:
+            store: The history store to update.
+
+        Returns:
+            int: The number of rows appended to the store.
+
+        """
+        recent_file_name = self.BITSTAMP_RECENT_DATA_URL.split("/")[-1]
+        recent_file_path = f"{self.data_dir}/{recent_file_name}"
+
+        changed = self._download_file(self.BITSTAMP_RECENT_DATA_URL, recent_file_path)
+        if not changed and store.high_water_mark is not None:
+            LOGGER.info("Recent dataset unchanged, history store is up to date")
+            return 0
+
+        return store.merge_csv(recent_file_path)
 
     def download_all_bitstamp_btcusd_minute_data(
         self,
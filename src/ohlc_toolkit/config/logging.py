@@ -1,8 +1,24 @@
-"""Logger definitions and configuration."""
-
+"""Logger definitions and configuration.
+
+Set `ENABLE_PERFORMANCE_LOGGING=TRUE` for hot loops, e.g. an API that transforms
+data thousands of times per minute. Records below the configured level are always
+dropped before they are formatted. In performance mode, the records that are logged
+are also:
+- written to stdout by a background thread, in batches, so the calling thread
+  does not wait on the write and flush of each record. At most 10,000 records
+  are queued; when the writer falls behind, further records are dropped and
+  counted in the output;
+- logged without variable values (`diagnose`) or extended tracebacks (`backtrace`)
+  in exceptions.
+"""
+
+import atexit
 import os
+import queue
 import sys
+import threading
 from datetime import datetime
+from typing import TextIO
 
 import orjson
 from loguru._logger import Core as _Core
@@ -14,9 +30,13 @@ ENABLE_FILE_LOGGING = os.getenv("ENABLE_FILE_LOGGING", "").upper() == "TRUE"
 DISABLE_COLORIZE_LOGS = os.getenv("DISABLE_COLORIZE_LOGS", "").upper() == "TRUE"
 ENABLE_SERIALIZE_LOGS = os.getenv("ENABLE_SERIALIZE_LOGS", "").upper() == "TRUE"
 LOGURU_DIAGNOSE = os.getenv("LOGURU_DIAGNOSE", "").upper() == "TRUE"
+ENABLE_PERFORMANCE_LOGGING = (
+    os.getenv("ENABLE_PERFORMANCE_LOGGING", "").upper() == "TRUE"
+)
 
 colorize = not DISABLE_COLORIZE_LOGS
 serialize = ENABLE_SERIALIZE_LOGS
+performance = ENABLE_PERFORMANCE_LOGGING
 
 # Create a mapping of module name to color
 color_map = {
@@ -146,13 +166,99 @@ def _serialize_record(record):
     return "{extra[serialized]}\n"
 
 
+class _BackgroundWriter:
+    """Stream sink that writes messages from a background thread, in batches.
+
+    `write` only puts the message on a bounded queue. A daemon thread waits on the
+    queue, then writes and flushes all the queued messages together, so the calling
+    thread is not blocked on the write and flush of each message. When the queue is
+    full, new messages are dropped (and the number dropped is reported in the
+    stream), unless `block` is set, in which case `write` waits for room. Errors
+    writing to the stream are reported on stderr, and do not stop the thread.
+    `stop` (called when the sink is removed, and at exit) writes the remaining
+    messages.
+    """
+
+    FLUSH_INTERVAL_SECONDS = 0.1
+    MAX_QUEUED_MESSAGES = 10_000
+
+    def __init__(
+        self,
+        stream: TextIO,
+        max_queued: int = MAX_QUEUED_MESSAGES,
+        *,
+        block: bool = False,
+    ):
+        self._stream = stream
+        self._block = block
+        self._queue: queue.Queue[str | None] = queue.Queue(maxsize=max_queued)
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, message: str):
+        """Queue a message to be written, or drop it if the queue is full."""
+        try:
+            self._queue.put(message, block=self._block)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        reported_dropped = 0
+        stopped = False
+        while not stopped:
+            try:
+                batch = [self._queue.get(timeout=self.FLUSH_INTERVAL_SECONDS)]
+            except queue.Empty:
+                batch = []
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopped = None in batch
+
+            messages = [message for message in batch if message is not None]
+            if self.dropped > reported_dropped:
+                messages.append(
+                    f"Dropped {self.dropped - reported_dropped} log messages, "
+                    "the log queue was full\n"
+                )
+                reported_dropped = self.dropped
+            if messages:
+                self._write_batch("".join(messages))
+
+    def _write_batch(self, text: str):
+        try:
+            self._stream.write(text)
+            self._stream.flush()
+        except Exception as error:
+            # Logging the error would queue it again, so report it on stderr
+            print(f"Failed to write log messages: {error!r}", file=sys.stderr)
+
+    def stop(self):
+        """Write the queued messages, and stop the background thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)  # Waits for room, even if messages are dropped
+            self._thread.join()
+
+
+def _stdout_sink() -> TextIO | _BackgroundWriter:
+    if not performance:
+        return sys.stdout
+    writer = _BackgroundWriter(sys.stdout)
+    atexit.register(writer.stop)
+    return writer
+
+
 def _setup_stdout_logging(logger_: _Logger, main_module_name: str):
     color = color_map.get(main_module_name, "blue")
     formatter = _formatter_builder(color)
     logger_.add(
-        sys.stdout,
+        _stdout_sink(),
         level=STDOUT_LOG_LEVEL,
-        diagnose=True,
+        diagnose=not performance,
+        backtrace=not performance,
         format=formatter,
         colorize=colorize,
     )
@@ -160,9 +266,10 @@ def _setup_stdout_logging(logger_: _Logger, main_module_name: str):
 
 def _setup_serialized_logging(logger_: _Logger):
     logger_.add(
-        sys.stdout,
+        _stdout_sink(),
         level=STDOUT_LOG_LEVEL,
-        diagnose=LOGURU_DIAGNOSE,
+        diagnose=LOGURU_DIAGNOSE and not performance,
+        backtrace=not performance,
         format=_serialize_record,
     )
 
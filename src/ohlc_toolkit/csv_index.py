@@ -0,0 +1,427 @@
+"""Sparse timestamp index over OHLC CSV files, for fast time-range reads.
+
+The index splits a CSV file into blocks and records, per block, its minimum and
+maximum timestamp and where its bytes are in the file. Reading a time range then
+only seeks to and parses the blocks that overlap it, instead of the whole file.
+
+- For plain CSV files, a block is `block_rows` consecutive lines, located by its
+  byte offset and length.
+- For gzip files, a block is one or more whole gzip members, located by their
+  compressed byte offset and length. Members can be decompressed independently, so
+  a multi-member file (e.g. one recompressed in blocks) gets one block per member,
+  while a single-member file is a single block and gains nothing from the index.
+
+The index is stored next to the file as `{filepath}.index.json`, and is rebuilt
+when the file's size or modification time changes. The blocks of the binary OHLC
+format are indexed by row instead, see `binary_format`.
+
+Since blocks are independent, they can also be decompressed and parsed on several
+threads at once (zlib and the pandas CSV parser release the GIL). A single-member
+gzip file, such as the bulk Bitstamp dataset, has no access points to split it at,
+so `recompress_gzip` rewrites it as a multi-member file, indexing it on the way.
+"""
+
+import gzip
+import io
+import os
+import zlib
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Literal
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from ohlc_toolkit.config.logging import get_logger
+
+LOGGER = get_logger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_BLOCK_ROWS = 16_384
+READ_BLOCK_SIZE = 16 * 1024 * 1024  # 16 MiB
+GZIP_READ_SIZE = 1024 * 1024  # Compressed bytes decompressed at a time when indexing
+DEFAULT_GZIP_BLOCK_BYTES = 4 * 1024 * 1024  # Uncompressed bytes per gzip member
+
+
+def _index_path(filepath: str) -> str:
+    return f"{filepath}.index.json"
+
+
+def _is_gzip(filepath: str) -> bool:
+    return ".gz" in filepath
+
+
+def build_csv_index(
+    filepath: str, *, header: bool, block_rows: int = DEFAULT_INDEX_BLOCK_ROWS
+) -> dict[str, Any]:
+    """Build the timestamp index of a CSV file, and save it next to the file.
+
+    Args:
+        filepath (str): Path to the CSV file. The timestamp is its first column.
+        header (bool): Whether the first line of the file is a header.
+        block_rows (int): Number of lines per block of a plain CSV file.
+
+    Returns:
+        dict[str, Any]: The index, with a list of `[min_timestamp, max_timestamp,
+            offset, length]` blocks.
+
+    """
+    LOGGER.info("Building timestamp index of `{}`", filepath)
+    if _is_gzip(filepath):
+        blocks = _gzip_blocks(filepath, header)
+    else:
+        blocks = _csv_blocks(filepath, header, block_rows, os.path.getsize(filepath))
+
+    return _save_index(filepath, header, blocks)
+
+
+def _save_index(filepath: str, header: bool, blocks: list[list[int]]) -> dict:
+    """Save the index of a file, stamped with the file's current size and mtime."""
+    stat = os.stat(filepath)
+    index = {
+        "version": INDEX_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "header": header,
+        "blocks": blocks,
+    }
+    try:
+        with open(_index_path(filepath), "wb") as file:
+            file.write(orjson.dumps(index))
+    except OSError as e:
+        LOGGER.warning("Could not save timestamp index of `{}`: {}", filepath, e)
+    LOGGER.info("Indexed `{}` in {} blocks", filepath, len(blocks))
+    return index
+
+
+def load_csv_index(filepath: str) -> dict[str, Any] | None:
+    """Load the timestamp index of a CSV file, or None if it is missing or stale."""
+    index_path = _index_path(filepath)
+    if not os.path.exists(index_path):
+        return None
+
+    with open(index_path, "rb") as file:
+        index = orjson.loads(file.read())
+
+    stat = os.stat(filepath)
+    if (index.get("version"), index["size"], index["mtime_ns"]) != (
+        INDEX_VERSION,
+        stat.st_size,
+        stat.st_mtime_ns,
+    ):
+        LOGGER.debug("Timestamp index of `{}` is stale", filepath)
+        return None
+    return index
+
+
+def read_csv_range(
+    filepath: str,
+    start: int | None,
+    end: int | None,
+    index: dict[str, Any],
+    *,
+    num_workers: int = 1,
+    **read_csv_kwargs: Any,
+) -> pd.DataFrame:
+    """Read the rows of a CSV file within a timestamp range, using its index.
+
+    Args:
+        filepath (str): Path to the CSV file.
+        start (int | None): First timestamp to include, or None for no lower bound.
+        end (int | None): Last timestamp to include, or None for no upper bound.
+        index (dict[str, Any]): The index of the file, from `build_csv_index`.
+        num_workers (int): Number of threads to decompress and parse blocks with.
+        read_csv_kwargs: Keyword arguments for `pd.read_csv`, e.g. `names` and
+            `dtype`.
+
+    Returns:
+        pd.DataFrame: The rows within the range.
+
+    """
+    lower = -np.inf if start is None else start
+    upper = np.inf if end is None else end
+    selected = [
+        block for block in index["blocks"] if block[1] >= lower and block[0] <= upper
+    ]
+    LOGGER.debug(
+        "Reading {} of {} indexed blocks of `{}`",
+        len(selected),
+        len(index["blocks"]),
+        filepath,
+    )
+
+    def read_block(byte_range: tuple[int, int]) -> pd.DataFrame:
+        offset, length = byte_range
+        with open(filepath, "rb") as file:
+            file.seek(offset)
+            data = file.read(length)
+        skip_header = False
+        if _is_gzip(filepath):
+            data = gzip.decompress(data)
+            # Gzip blocks start at a member boundary, and the first holds the header
+            skip_header = index["header"] and offset == 0
+        return pd.read_csv(
+            io.BytesIO(data),
+            header=None,
+            skiprows=1 if skip_header else 0,
+            **read_csv_kwargs,
+        )
+
+    # Adjacent blocks are read in one go, but split evenly among the workers
+    max_length = -(-sum(block[3] for block in selected) // num_workers)
+    byte_ranges = _merge_byte_ranges(selected, max_length)
+    if num_workers > 1 and len(byte_ranges) > 1:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            frames = list(executor.map(read_block, byte_ranges))
+    else:
+        frames = [read_block(byte_range) for byte_range in byte_ranges]
+
+    if not frames:
+        return pd.read_csv(io.BytesIO(b""), header=None, **read_csv_kwargs)
+
+    df = pd.concat(frames, ignore_index=True)
+    timestamps = df["timestamp"].to_numpy()
+    return df[(timestamps >= lower) & (timestamps <= upper)].reset_index(drop=True)
+
+
+def _merge_byte_ranges(
+    blocks: list[list[int]], max_length: int
+) -> list[tuple[int, int]]:
+    """Merge the byte ranges of adjacent blocks, up to a maximum merged length."""
+    ranges: list[tuple[int, int]] = []
+    for _, _, offset, length in blocks:
+        if (
+            ranges
+            and sum(ranges[-1]) == offset
+            and ranges[-1][1] + length <= max_length
+        ):
+            ranges[-1] = (ranges[-1][0], ranges[-1][1] + length)
+        else:
+            ranges.append((offset, length))
+    return ranges
+
+
+def recompress_gzip(
+    filepath: str,
+    output_path: str | None = None,
+    *,
+    block_bytes: int = DEFAULT_GZIP_BLOCK_BYTES,
+    num_workers: int = 1,
+) -> str:
+    """Rewrite a gzip CSV file as independent gzip members, and index them.
+
+    The output is still a valid gzip file for any reader, but each member of about
+    `block_bytes` uncompressed bytes (ending on a line boundary) can be decompressed
+    on its own, so that `read_ohlc_csv` can read time ranges and parse blocks in
+    parallel. Members are compressed on `num_workers` threads.
+
+    Args:
+        filepath (str): Path to the gzip CSV file. The timestamp is its first column.
+        output_path (str | None): Path of the rewritten file. Defaults to replacing
+            the input file.
+        block_bytes (int): Number of uncompressed bytes per gzip member.
+        num_workers (int): Number of threads to compress members with.
+
+    Returns:
+        str: The path of the rewritten file.
+
+    """
+    output_path = output_path or filepath
+    LOGGER.info("Recompressing `{}` in blocks of {} bytes", filepath, block_bytes)
+
+    def compress(data: bytes, first: bool) -> tuple[bytes, np.ndarray]:
+        return gzip.compress(data, compresslevel=6), _read_timestamps(
+            io.BytesIO(data), header and first
+        )
+
+    blocks: list[list[int]] = []
+    offset = 0
+    temp_path = f"{output_path}.tmp"
+    with (
+        gzip.open(filepath, "rb") as source,
+        open(temp_path, "wb") as output,
+        ThreadPoolExecutor(max_workers=num_workers) as executor,
+    ):
+        header = _has_header(source.peek(1024))
+        pending: deque[Future[tuple[bytes, np.ndarray]]] = deque()
+        while data := source.read(block_bytes):
+            data += source.readline()  # Finish the last line
+            pending.append(executor.submit(compress, data, offset == 0 and not pending))
+            # Bound memory use to a few blocks in flight per worker
+            if len(pending) > 2 * num_workers:
+                future = pending.popleft()
+                offset = _write_member(output, future.result(), offset, blocks)
+        for future in pending:
+            offset = _write_member(output, future.result(), offset, blocks)
+    os.replace(temp_path, output_path)
+
+    _save_index(output_path, header, blocks)
+    return output_path
+
+
+def _write_member(
+    output: io.BufferedWriter,
+    member: tuple[bytes, np.ndarray],
+    offset: int,
+    blocks: list[list[int]],
+) -> int:
+    """Write a gzip member and record its block, returning the next offset."""
+    compressed, timestamps = member
+    output.write(compressed)
+    if len(timestamps) > 0:
+        blocks.append(
+            [int(timestamps.min()), int(timestamps.max()), offset, len(compressed)]
+        )
+    return offset + len(compressed)
+
+
+def _has_header(first_bytes: bytes) -> bool:
+    """Check whether CSV data starts with a header, i.e. a non-numeric field."""
+    first_field = first_bytes.split(b"\n", 1)[0].split(b",", 1)[0].strip()
+    try:
+        float(first_field)
+    except ValueError:
+        return bool(first_field)
+    return False
+
+
+def _csv_blocks(
+    filepath: str, header: bool, block_rows: int, file_size: int
+) -> list[list[int]]:
+    """Index the blocks of `block_rows` lines of a plain CSV file."""
+    # Byte offsets of the start of every line
+    line_starts = [np.zeros(1, dtype=np.int64)]
+    position = 0
+    with open(filepath, "rb") as file:
+        while chunk := file.read(READ_BLOCK_SIZE):
+            newlines = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord("\n"))
+            line_starts.append(newlines + position + 1)
+            position += len(chunk)
+    row_starts = np.concatenate(line_starts)
+    row_starts = row_starts[row_starts < file_size][int(header) :]
+
+    timestamps = _read_timestamps(filepath, header)
+    if len(timestamps) != len(row_starts):
+        raise ValueError(
+            f"Cannot index `{filepath}`: found {len(row_starts)} lines but "
+            f"{len(timestamps)} rows. Blank lines are not supported."
+        )
+    if len(timestamps) == 0:
+        return []
+
+    block_starts = np.arange(0, len(timestamps), block_rows)
+    offsets = row_starts[block_starts]
+    lengths = np.diff(np.append(offsets, file_size))
+    return np.column_stack(
+        [
+            np.minimum.reduceat(timestamps, block_starts),
+            np.maximum.reduceat(timestamps, block_starts),
+            offsets,
+            lengths,
+        ]
+    ).tolist()
+
+
+def _gzip_blocks(filepath: str, header: bool) -> list[list[int]]:
+    """Index the members of a gzip file, merging members that split a line.
+
+    The file is decompressed as a stream, and only the timestamps of each piece of
+    complete lines are kept, so memory use does not grow with the file size.
+    """
+    blocks: list[list[int]] = []
+    block_offset = 0  # Compressed offset of the current block
+    block_end = 0  # Compressed offset of the end of the last complete member
+    extremes: list[tuple[int, int]] = []  # Timestamp range of each piece of a block
+    partial_line = b""
+    skip_header = header
+    for piece, member_end in _iter_gzip_members(filepath):
+        data = partial_line + piece
+        cut = data.rfind(b"\n") + 1
+        partial_line = data[cut:]
+        if cut > 0:
+            timestamps = _read_timestamps(io.BytesIO(data[:cut]), skip_header)
+            skip_header = False
+            if len(timestamps) > 0:
+                extremes.append((int(timestamps.min()), int(timestamps.max())))
+
+        if member_end is None:
+            continue
+        block_end = member_end
+        if partial_line:
+            continue  # The member ends mid-line, so merge it with the next one
+
+        if extremes:
+            blocks.append(_gzip_block(extremes, block_offset, block_end))
+        block_offset = block_end
+        extremes = []
+
+    if partial_line:  # The file does not end with a newline
+        timestamps = _read_timestamps(io.BytesIO(partial_line), skip_header)
+        if len(timestamps) > 0:
+            extremes.append((int(timestamps.min()), int(timestamps.max())))
+    if extremes:
+        blocks.append(_gzip_block(extremes, block_offset, block_end))
+    return blocks
+
+
+def _gzip_block(extremes: list[tuple[int, int]], offset: int, end: int) -> list[int]:
+    """Get the index entry of a block from the timestamp ranges of its pieces."""
+    return [
+        min(low for low, _ in extremes),
+        max(high for _, high in extremes),
+        offset,
+        end - offset,
+    ]
+
+
+def _iter_gzip_members(filepath: str) -> Iterator[tuple[bytes, int | None]]:
+    """Decompress the members of a gzip file, reading it in chunks.
+
+    Yields:
+        tuple[bytes, int | None]: The decompressed data of each chunk, split at the
+            member boundaries. If the data ends a member, it comes with the
+            compressed offset where the member ends, and otherwise with None.
+
+    """
+    decompressor = zlib.decompressobj(wbits=31)
+    offset = 0  # Compressed offset of the start of `chunk`
+    member_offset = 0  # Compressed offset of the start of the current member
+    with open(filepath, "rb") as file:
+        while chunk := file.read(GZIP_READ_SIZE):
+            while chunk:
+                data = decompressor.decompress(chunk)
+                if not decompressor.eof:
+                    offset += len(chunk)
+                    yield data, None
+                    break
+
+                rest = decompressor.unused_data
+                offset += len(chunk) - len(rest)
+                member_offset = offset
+                yield data, offset
+                decompressor = zlib.decompressobj(wbits=31)
+                chunk = rest
+
+    if offset > member_offset:
+        raise ValueError(f"Cannot index `{filepath}`: truncated gzip data.")
+
+
+def _read_timestamps(source: str | io.BytesIO, header: bool) -> np.ndarray:
+    """Read the timestamps (first column) of CSV data."""
+    compression: Literal["gzip"] | None = (
+        "gzip" if isinstance(source, str) and _is_gzip(source) else None
+    )
+    try:
+        df = pd.read_csv(
+            source,
+            header=None,
+            skiprows=1 if header else 0,
+            usecols=[0],
+            dtype=np.int64,
+            compression=compression,
+        )
+    except pd.errors.EmptyDataError:
+        return np.empty(0, dtype=np.int64)
+    return df.iloc[:, 0].to_numpy()
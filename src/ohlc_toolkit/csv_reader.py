@@ -1,9 +1,17 @@
 """Module for loading OHLC data from a CSV file."""
 
+import gzip
+import os
+from collections.abc import Iterator
+from typing import Any
+
 import pandas as pd
+from loguru._logger import Logger
 
 from ohlc_toolkit.config import DEFAULT_COLUMNS, DEFAULT_DTYPE
 from ohlc_toolkit.config.logging import get_logger
+from ohlc_toolkit.csv_index import build_csv_index, load_csv_index, read_csv_range
+from ohlc_toolkit.profiling import NULL_STATS, PipelineStats, StageRecorder
 from ohlc_toolkit.timeframes import (
     parse_timeframe,
     validate_timeframe,
@@ -14,92 +22,278 @@ from ohlc_toolkit.utils import check_data_integrity, infer_time_step
 LOGGER = get_logger(__name__)
 
 
-def read_ohlc_csv(
+def read_ohlc_csv(  # noqa: PLR0913
     filepath: str,
     timeframe: str | None = None,
     *,
     header_row: int | None = None,
     columns: list[str] | None = None,
     dtype: dict[str, str] | None = None,
+    start: int | None = None,
+    end: int | None = None,
+    num_workers: int | None = 1,
+    stats: PipelineStats | None = None,
 ) -> pd.DataFrame:
     """Read OHLC data from a CSV file.
 
+    If `start` or `end` is given, only the rows within that timestamp range are
+    returned, and only the blocks of the file that overlap it are read, using a
+    sparse timestamp index stored next to the file (see `csv_index`). The index is
+    built on the first range read, and rebuilt whenever the file changes.
+
+    With `num_workers` above 1, the indexed blocks are decompressed and parsed on
+    that many threads, and concatenated in order. A gzip file only splits into
+    blocks at gzip member boundaries, so a single-member file (such as the bulk
+    Bitstamp dataset) should first be rewritten with `recompress_gzip`.
+
     Arguments:
         filepath (str): Path to the CSV file.
         timeframe (Optional[str]): User-defined timeframe (e.g., '1m', '5m', '1h').
         header_row (Optional[int]): The row number to use as the header.
         columns (Optional[list[str]]): The expected columns in the CSV file.
         dtype (Optional[dict[str, str]]): The data type for the columns.
+        start (Optional[int]): First timestamp to read, in seconds.
+        end (Optional[int]): Last timestamp to read, in seconds.
+        num_workers (Optional[int]): Number of threads to decompress and parse the
+            file with. None uses one thread per CPU core.
+        stats (Optional[PipelineStats]): If given, the wall time, rows and size of
+            each stage are recorded into it, see `profiling`.
 
     Returns:
         pd.DataFrame: Processed OHLC dataset.
 
     """
+    recorder: StageRecorder = NULL_STATS if stats is None else stats
     bound_logger = LOGGER.bind(body=filepath)
     bound_logger.info("Reading OHLC data")
 
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    if num_workers < 1:
+        raise ValueError(f"Invalid number of workers: {num_workers}")
+
     columns = columns or DEFAULT_COLUMNS
     dtype = dtype or DEFAULT_DTYPE
 
-    read_csv_params = {
-        "filepath_or_buffer": filepath,
-        "names": columns,
-        "dtype": dtype,
-    }
+    read_csv_params = _build_read_csv_params(filepath, columns, dtype)
 
-    if ".gz" in filepath:
-        read_csv_params["compression"] = "gzip"
+    if header_row is None:
+        # User doesn't specify header - sniff the first line to decide once
+        header_row = 0 if _sniff_header(filepath) else None
+        bound_logger.debug("Sniffed header row: {}", header_row)
 
-    def _read_csv(header: int | None = None) -> pd.DataFrame:
-        return pd.read_csv(**read_csv_params, header=header)
-
-    # If header_row is provided, use it directly
-    if header_row is not None:
-        df = _read_csv(header=header_row)
-    else:
-        # User doesn't specify header - let's try reading without header first
-        try:
-            bound_logger.debug("Trying to read file without header")
-            df = _read_csv(header=None)
-        except FileNotFoundError as e:
-            raise FileNotFoundError(f"File not found: {filepath}") from e
-        except ValueError:
-            # If that fails, try with header
-            bound_logger.debug("Trying to read file with header")
-            try:
-                df = _read_csv(header=0)
-            except ValueError as e:
-                raise ValueError(
-                    f"Data for file {filepath} does not match expected schema. "
-                    f"Please validate the file data aligns with the expected "
-                    f"columns ({columns}) and data types ({dtype})"
-                ) from e
+    try:
+        with recorder.stage("parse", 0, bound_logger) as stage:
+            if start is None and end is None and num_workers == 1:
+                df = pd.read_csv(**read_csv_params, header=header_row)
+            else:
+                df = _read_indexed(
+                    filepath, start, end, header_row, columns, dtype, num_workers
+                )
+            stage.set_output(df)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {filepath}") from e
+    except ValueError as e:
+        raise ValueError(
+            f"Data for file {filepath} does not match expected schema. "
+            f"Please validate the file data aligns with the expected "
+            f"columns ({columns}) and data types ({dtype})"
+        ) from e
 
     bound_logger.debug(
         "Read {} rows and {} columns: {}", df.shape[0], df.shape[1], df.columns.tolist()
     )
 
     # Infer time step from data
-    time_step_seconds = infer_time_step(df, logger=bound_logger)
+    with recorder.stage("infer_time_step", len(df), bound_logger) as stage:
+        time_step_seconds = infer_time_step(df, logger=bound_logger)
+        stage.set_output(df)
 
-    # Convert user-defined timeframe to seconds
-    timeframe_seconds = None
+    # Validate user-defined timeframe against the inferred time step
     if timeframe:
-        if not validate_timeframe_format(timeframe):
-            raise ValueError(f"Invalid timeframe format: {timeframe}")
-
-        timeframe_seconds = parse_timeframe(timeframe, to_minutes=False)
+        _validate_user_timeframe(timeframe, time_step_seconds, bound_logger)
 
-        validate_timeframe(time_step_seconds, timeframe_seconds, bound_logger)
-
-    df = df.sort_values("timestamp")  # Ensure timestamp is sorted
+    with recorder.stage("sort", len(df), bound_logger) as stage:
+        df = df.sort_values("timestamp")  # Ensure timestamp is sorted
+        stage.set_output(df)
 
     # Perform integrity checks
-    check_data_integrity(df, logger=bound_logger, time_step_seconds=time_step_seconds)
+    with recorder.stage("check_data_integrity", len(df), bound_logger) as stage:
+        check_data_integrity(
+            df, logger=bound_logger, time_step_seconds=time_step_seconds
+        )
+        stage.set_output(df)
 
     # Convert the timestamp column to a datetime index
-    df.index = pd.to_datetime(df["timestamp"], unit="s")
-    df.index.name = "datetime"
+    with recorder.stage("datetime_index", len(df), bound_logger) as stage:
+        df.index = pd.to_datetime(df["timestamp"], unit="s")
+        df.index.name = "datetime"
+        stage.set_output(df)
 
     bound_logger.info("OHLC data successfully loaded.")
     return df
+
+
+def iter_ohlc_csv(  # noqa: PLR0913
+    filepath: str,
+    chunksize: int = 1_000_000,
+    timeframe: str | None = None,
+    *,
+    header_row: int | None = None,
+    columns: list[str] | None = None,
+    dtype: dict[str, str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Read OHLC data from a CSV file in chunks, to keep memory use bounded.
+
+    The file must be sorted by timestamp. The same integrity checks as
+    `read_ohlc_csv` are performed on every chunk, and gaps, duplicates and
+    out-of-order timestamps across chunk boundaries are also reported.
+    The chunks can be passed straight to `transform_ohlc_chunks`.
+
+    Arguments:
+        filepath (str): Path to the CSV file.
+        chunksize (int): Number of rows per chunk.
+        timeframe (Optional[str]): User-defined timeframe (e.g., '1m', '5m', '1h').
+        header_row (Optional[int]): The row number to use as the header.
+        columns (Optional[list[str]]): The expected columns in the CSV file.
+        dtype (Optional[dict[str, str]]): The data type for the columns.
+
+    Yields:
+        pd.DataFrame: Processed OHLC chunks, each with a datetime index.
+
+    """
+    bound_logger = LOGGER.bind(body=filepath)
+    bound_logger.info("Reading OHLC data in chunks of {} rows", chunksize)
+
+    columns = columns or DEFAULT_COLUMNS
+    dtype = dtype or DEFAULT_DTYPE
+    read_csv_params = _build_read_csv_params(filepath, columns, dtype)
+
+    if header_row is None:
+        header_row = 0 if _sniff_header(filepath) else None
+
+    try:
+        reader = pd.read_csv(**read_csv_params, header=header_row, chunksize=chunksize)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {filepath}") from e
+
+    time_step_seconds = None
+    previous_timestamp = None
+    with reader:
+        for df in reader:
+            if time_step_seconds is None:
+                time_step_seconds = infer_time_step(df, logger=bound_logger)
+                if timeframe:
+                    _validate_user_timeframe(timeframe, time_step_seconds, bound_logger)
+
+            if previous_timestamp is not None:
+                _check_chunk_boundary(
+                    previous_timestamp,
+                    int(df["timestamp"].iloc[0]),
+                    time_step_seconds,
+                    bound_logger,
+                )
+            previous_timestamp = int(df["timestamp"].iloc[-1])
+
+            check_data_integrity(
+                df, logger=bound_logger, time_step_seconds=time_step_seconds
+            )
+
+            df.index = pd.to_datetime(df["timestamp"], unit="s")
+            df.index.name = "datetime"
+            yield df
+
+    bound_logger.info("OHLC data successfully streamed.")
+
+
+def _read_indexed(  # noqa: PLR0913
+    filepath: str,
+    start: int | None,
+    end: int | None,
+    header_row: int | None,
+    columns: list[str],
+    dtype: dict[str, str],
+    num_workers: int,
+) -> pd.DataFrame:
+    """Read the rows of a CSV file within a timestamp range, using its index."""
+    index = load_csv_index(filepath)
+    if index is None or index["header"] != (header_row is not None):
+        index = build_csv_index(filepath, header=header_row is not None)
+    if num_workers > 1 and len(index["blocks"]) == 1:
+        LOGGER.warning(
+            "`{}` has a single block, so it is read on one thread. Rewrite it with "
+            "`recompress_gzip` to read it in parallel.",
+            filepath,
+        )
+    return read_csv_range(
+        filepath,
+        start,
+        end,
+        index,
+        num_workers=num_workers,
+        names=columns,
+        dtype=dtype,
+    )
+
+
+def _build_read_csv_params(
+    filepath: str, columns: list[str], dtype: dict[str, str]
+) -> dict[str, Any]:
+    """Build the keyword arguments for `pd.read_csv`."""
+    read_csv_params: dict[str, Any] = {
+        "filepath_or_buffer": filepath,
+        "names": columns,
+        "dtype": dtype,
+    }
+
+    if ".gz" in filepath:
+        read_csv_params["compression"] = "gzip"
+
+    return read_csv_params
+
+
+def _sniff_header(filepath: str) -> bool:
+    """Check whether the first line of a CSV file is a header.
+
+    The first line is a header if its first field is not numeric. If the file cannot
+    be opened, False is returned and the error is left to `pd.read_csv` to report.
+    """
+    open_fn = gzip.open if ".gz" in filepath else open
+    try:
+        with open_fn(filepath, "rt") as file:
+            first_line = file.readline()
+    except (OSError, EOFError):
+        return False
+
+    first_field = first_line.split(",", 1)[0].strip()
+    if not first_field:
+        return False
+    try:
+        float(first_field)
+    except ValueError:
+        return True
+    return False
+
+
+def _validate_user_timeframe(timeframe: str, time_step_seconds: int, logger: Logger):
+    """Validate a user-defined timeframe string against the data time step."""
+    if not validate_timeframe_format(timeframe):
+        raise ValueError(f"Invalid timeframe format: {timeframe}")
+
+    timeframe_seconds = parse_timeframe(timeframe, to_minutes=False)
+
+    validate_timeframe(time_step_seconds, timeframe_seconds, logger)
+
+
+def _check_chunk_boundary(
+    previous_timestamp: int, next_timestamp: int, time_step_seconds: int, logger: Logger
+):
+    """Check the timestamps on either side of a chunk boundary."""
+    difference = next_timestamp - previous_timestamp
+    if difference < 0:
+        logger.warning("Timestamps are out of order across a chunk boundary.")
+    elif difference == 0:
+        logger.warning("Duplicate timestamps found across a chunk boundary.")
+    elif difference > time_step_seconds:
+        missing = difference // time_step_seconds - 1
+        logger.warning(f"Missing {missing} timestamps across a chunk boundary.")
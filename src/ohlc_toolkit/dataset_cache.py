@@ -0,0 +1,231 @@
+"""Columnar on-disk cache for parsed datasets.
+
+Parsing a large CSV (especially a gzip-compressed one) is much slower than loading
+the same data from a columnar file. `ParsedDatasetCache` writes the parsed DataFrame
+to a Feather (Arrow IPC) or Parquet file once per source file, and later loads use
+that file instead, memory-mapped where possible.
+
+Cache entries are keyed by the source file's size, modification time and checksum,
+and by the parameters it was parsed with (the reader and its keyword arguments). An
+entry whose size and modification time match is used without reading the source
+file, so a change that keeps both (e.g. an edit with a restored mtime) is not
+detected. Only when the modification time changed is the file hashed, to keep the
+entry of a file that was rewritten with the same contents. This module requires the
+optional `pyarrow` dependency (e.g. `pip install pyarrow`).
+"""
+
+import hashlib
+import os
+from collections.abc import Callable, Mapping
+from typing import Any
+
+import orjson
+import pandas as pd
+
+from ohlc_toolkit.config.logging import get_logger
+
+LOGGER = get_logger(__name__)
+
+CHECKSUM_BLOCK_SIZE = 1024 * 1024  # 1 MiB
+FILE_FORMATS = ("feather", "parquet")
+
+
+def _import_pyarrow():
+    """Import pyarrow, which is an optional dependency."""
+    try:
+        import pyarrow as pa
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "The parsed dataset cache requires `pyarrow`. "
+            "Please install it with `pip install pyarrow`."
+        ) from e
+    return pa
+
+
+def file_checksum(filepath: str) -> str:
+    """Compute the BLAKE2b checksum of a file, reading it in blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as file:
+        while block := file.read(CHECKSUM_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _parameters_digest(parameters: Mapping[str, Any] | None) -> str:
+    """Compute a digest of the parameters a file is parsed with."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(
+        orjson.dumps(
+            parameters or {},
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+    )
+    return digest.hexdigest()
+
+
+class ParsedDatasetCache:
+    """Cache of parsed datasets, stored as columnar files next to each other."""
+
+    def __init__(self, cache_dir: str = "data/.cache", file_format: str = "feather"):
+        """Initialize the parsed dataset cache.
+
+        Args:
+            cache_dir: Directory to store the cached files in.
+            file_format: Either "feather" (default, uncompressed and memory-mappable)
+                or "parquet" (compressed, smaller on disk).
+
+        """
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"Invalid cache file format: {file_format}")
+
+        self.cache_dir = cache_dir.rstrip("/")
+        self.file_format = file_format
+
+    def _paths(self, source_path: str) -> tuple[str, str]:
+        """Get the data and metadata paths of the cache entry for a source file."""
+        base_path = f"{self.cache_dir}/{os.path.basename(source_path)}"
+        return f"{base_path}.{self.file_format}", f"{base_path}.meta.json"
+
+    @staticmethod
+    def _source_key(
+        source_path: str, parameters: Mapping[str, Any] | None
+    ) -> dict[str, Any]:
+        """Build the cache key of a source file, parsed with the given parameters."""
+        stat = os.stat(source_path)
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "checksum": file_checksum(source_path),
+            "parameters": _parameters_digest(parameters),
+        }
+
+    def is_valid(
+        self, source_path: str, parameters: Mapping[str, Any] | None = None
+    ) -> bool:
+        """Check whether a source file has a valid cache entry.
+
+        Args:
+            source_path: Path to the source file.
+            parameters: The parameters the file is parsed with, as given to `store`.
+
+        Returns:
+            bool: Whether the cache entry is valid.
+
+        """
+        data_path, meta_path = self._paths(source_path)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return False
+
+        with open(meta_path, "rb") as file:
+            cached_key = orjson.loads(file.read())
+        if cached_key.get("parameters") != _parameters_digest(parameters):
+            return False
+
+        stat = os.stat(source_path)
+        if cached_key["size"] != stat.st_size:
+            return False
+        if cached_key["mtime_ns"] == stat.st_mtime_ns:
+            return True
+        # Rewritten, e.g. downloaded again: hash it, in case the contents are the same
+        if cached_key["checksum"] != file_checksum(source_path):
+            return False
+        cached_key["mtime_ns"] = stat.st_mtime_ns
+        with open(meta_path, "wb") as file:
+            file.write(orjson.dumps(cached_key))
+        return True
+
+    def load(
+        self, source_path: str, parameters: Mapping[str, Any] | None = None
+    ) -> pd.DataFrame | None:
+        """Load the cached DataFrame of a source file, or None if it is not cached."""
+        if not self.is_valid(source_path, parameters):
+            LOGGER.debug("No valid cache entry for `{}`", source_path)
+            return None
+
+        pa = _import_pyarrow()
+        data_path, _ = self._paths(source_path)
+        LOGGER.info("Loading cached dataset from `{}`", data_path)
+        if self.file_format == "feather":
+            table = pa.feather.read_table(data_path, memory_map=True)
+        else:
+            table = pa.parquet.read_table(data_path, memory_map=True)
+        return table.to_pandas()
+
+    def store(
+        self,
+        source_path: str,
+        df: pd.DataFrame,
+        parameters: Mapping[str, Any] | None = None,
+    ) -> str:
+        """Store the parsed DataFrame of a source file in the cache.
+
+        Any previous metadata is removed first, and the new metadata is written last,
+        so that an interrupted write never leaves a valid-looking entry behind.
+
+        Args:
+            source_path: Path to the source file.
+            df: The parsed DataFrame.
+            parameters: The parameters the file was parsed with. The entry is only
+                valid for loads with the same parameters.
+
+        Returns:
+            str: The path of the cached data file.
+
+        """
+        pa = _import_pyarrow()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path, meta_path = self._paths(source_path)
+
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+
+        source_key = self._source_key(source_path, parameters)
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        if self.file_format == "feather":
+            pa.feather.write_feather(table, data_path, compression="uncompressed")
+        else:
+            pa.parquet.write_table(table, data_path)
+
+        with open(meta_path, "wb") as file:
+            file.write(orjson.dumps(source_key))
+
+        LOGGER.info("Cached parsed dataset to `{}`", data_path)
+        return data_path
+
+    def read_csv(
+        self,
+        source_path: str,
+        reader: Callable[..., pd.DataFrame] | None = None,
+        **reader_kwargs: Any,
+    ) -> pd.DataFrame:
+        """Load a CSV file from the cache, parsing and caching it on a miss.
+
+        Args:
+            source_path: Path to the CSV file.
+            reader: Function that parses the file, called as
+                `reader(source_path, **reader_kwargs)`. Defaults to `pd.read_csv`.
+            reader_kwargs: Keyword arguments for the reader. Together with the
+                reader, they are part of the cache key.
+
+        Returns:
+            pd.DataFrame: The parsed dataset.
+
+        """
+        parameters = dict(reader_kwargs)
+        if reader is not None:
+            parameters["reader"] = f"{reader.__module__}.{reader.__qualname__}"
+        reader = reader or pd.read_csv
+        df = self.load(source_path, parameters)
+        if df is None:
+            df = reader(source_path, **reader_kwargs)
+            self.store(source_path, df, parameters)
+        return df
+
+    def clear(self, source_path: str):
+        """Remove the cache entry of a source file, if any."""
+        for path in self._paths(source_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -1,9 +1,14 @@
 """Functions for calculating percentage returns."""
 
+from collections.abc import Sequence
+
+import numpy as np
 import pandas as pd
 
 from ohlc_toolkit.pandas_ta.percent_return import percent_return
 
+RETURN_DIRECTIONS = ("backward", "forward")
+
 
 def calculate_percentage_return(  # noqa: PLR0913
     close: pd.Series,
@@ -41,3 +46,83 @@ def calculate_percentage_return(  # noqa: PLR0913
     )
 
     return pct_return
+
+
+def calculate_return_matrix(  # noqa: PLR0913
+    close: pd.Series | np.ndarray,
+    *,
+    timestep_size: int,
+    future_return_lengths: Sequence[int],
+    direction: str = "backward",
+    log: bool = False,
+    dtype: np.dtype | type = np.float32,
+    as_frame: bool = True,
+) -> pd.DataFrame | np.ndarray:
+    """Calculate the returns of a series over many horizons at once.
+
+    Each horizon is computed by dividing two shifted views of the prices straight
+    into its column of a preallocated matrix, so no shifted copies of the series
+    are made. Returns are computed in float64 and only then stored as `dtype`.
+
+    Args:
+        close (pd.Series | np.ndarray): Series of 'close' prices.
+        timestep_size (int): The size of each timestep in minutes.
+        future_return_lengths (Sequence[int]): The return lengths in minutes, one
+            column per length.
+        direction (str): "backward" gives, at each row, the return over the
+            preceding length (as `calculate_percentage_return` does); "forward"
+            gives the return over the following length, e.g. for labelling.
+        log (bool): If True, returns log returns instead of percentage returns.
+        dtype (np.dtype | type): Data type of the returns. Default is float32.
+        as_frame (bool): If True, returns a DataFrame with the index of `close`,
+            otherwise a 2-D array of shape (len(close), len(future_return_lengths)).
+
+    Returns:
+        pd.DataFrame | np.ndarray: The returns, NaN where a horizon runs past the
+            start (or end) of the series. DataFrame columns are named after the
+            kind of return and the length in minutes, e.g. `PCTRET_60` or
+            `FWD_LOGRET_60`.
+
+    """
+    if direction not in RETURN_DIRECTIONS:
+        raise ValueError(
+            f"Invalid direction: {direction}. Expected one of {RETURN_DIRECTIONS}."
+        )
+    lengths = [
+        future_return_length // timestep_size
+        for future_return_length in future_return_lengths
+    ]
+    if any(length < 1 for length in lengths):
+        raise ValueError(
+            f"Return lengths must be at least the timestep size ({timestep_size} "
+            f"minutes), got {list(future_return_lengths)}"
+        )
+
+    prices = np.asarray(close, dtype=np.float64)
+    num_rows = len(prices)
+    # Column-major, so that each horizon's column is contiguous
+    returns = np.full((num_rows, len(lengths)), np.nan, dtype=dtype, order="F")
+    ratio = np.empty(num_rows, dtype=np.float64)
+
+    for column, length in enumerate(lengths):
+        if length >= num_rows:
+            continue
+        size = num_rows - length
+        rows = slice(length, None) if direction == "backward" else slice(None, size)
+        np.divide(prices[length:], prices[:-length], out=ratio[:size])
+        if log:
+            np.log(ratio[:size], out=returns[rows, column])
+        else:
+            np.subtract(ratio[:size], 1, out=returns[rows, column])
+
+    if not as_frame:
+        return returns
+
+    prefix = "FWD_" if direction == "forward" else ""
+    kind = "LOGRET" if log else "PCTRET"
+    return pd.DataFrame(
+        returns,
+        index=close.index if isinstance(close, pd.Series) else None,
+        columns=[f"{prefix}{kind}_{length}" for length in future_return_lengths],
+        copy=False,
+    )
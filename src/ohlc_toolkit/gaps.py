@@ -0,0 +1,124 @@
+"""Repair missing timestamps in OHLC data before aggregation.
+
+Window aggregation works on row counts, so a window that spans a gap in the data
+covers more time than its timeframe. `fill_gaps` reindexes the data onto the full
+time grid, so that every window of `n` rows covers exactly `n` time steps.
+"""
+
+import numpy as np
+import pandas as pd
+from loguru._logger import Logger
+
+from ohlc_toolkit.config.logging import get_logger
+
+LOGGER = get_logger(__name__)
+
+GAP_POLICIES = ("ffill", "nan", "drop")
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
+def fill_gaps(
+    df_input: pd.DataFrame,
+    policy: str = "ffill",
+    time_step_seconds: int = 60,
+    logger: Logger = LOGGER,
+) -> pd.DataFrame:
+    """Reindex OHLC data onto the full time grid, filling in the missing rows.
+
+    The grid runs from the first to the last timestamp, every `time_step_seconds`.
+    Missing rows are filled according to the policy:
+
+    - "ffill": a flat bar at the previous close (open = high = low = close) with
+      zero volume. Other columns are forward-filled.
+    - "nan" and "drop": NaN in every column but the timestamp. Any window that
+      covers a missing row then aggregates to NaN. The "drop" policy is applied by
+      `transform_ohlc`, which removes those windows after aggregation.
+
+    Args:
+        df_input (pd.DataFrame): OHLC data with a UNIX timestamp column. It is sorted
+            and de-duplicated (keeping the last row per timestamp) if needed.
+        policy (str): One of "ffill", "nan" or "drop".
+        time_step_seconds (int): Time step of the grid, in seconds.
+        logger (Logger): The logger to use.
+
+    Returns:
+        pd.DataFrame: The data on the full time grid, with a datetime index.
+
+    """
+    if policy not in GAP_POLICIES:
+        raise ValueError(
+            f"Invalid gap policy: {policy}. Must be one of {', '.join(GAP_POLICIES)}."
+        )
+
+    df = df_input
+    timestamps = df["timestamp"].to_numpy(dtype=np.int64)
+    if len(timestamps) > 1 and (np.diff(timestamps) <= 0).any():
+        logger.debug("Sorting and de-duplicating timestamps before filling gaps")
+        df = df.sort_values("timestamp", kind="stable").drop_duplicates(
+            subset="timestamp", keep="last"
+        )
+        timestamps = df["timestamp"].to_numpy(dtype=np.int64)
+
+    if len(timestamps) == 0:
+        return _with_datetime_index(df.copy())
+
+    offsets = timestamps - timestamps[0]
+    if (offsets % time_step_seconds).any():
+        raise ValueError(
+            f"Timestamps are not aligned to a {time_step_seconds}-second grid."
+        )
+
+    positions = offsets // time_step_seconds
+    num_rows = int(positions[-1]) + 1
+    num_missing = num_rows - len(timestamps)
+    if num_missing == 0:
+        logger.debug("No gaps to fill")
+        return _with_datetime_index(df.copy())
+
+    logger.info("Filling {} missing timestamps with policy '{}'.", num_missing, policy)
+    present = np.zeros(num_rows, dtype=bool)
+    present[positions] = True
+    # Row of `df` holding the latest present row at or before each grid row
+    source_rows = np.cumsum(present) - 1
+
+    columns = {}
+    for column in df.columns:
+        values = df[column].to_numpy()
+        if column == "timestamp":
+            grid = timestamps[0] + np.arange(num_rows) * time_step_seconds
+            columns[column] = grid.astype(values.dtype)
+        elif policy == "ffill":
+            columns[column] = _ffill_column(column, values, df, present, source_rows)
+        else:
+            filled = np.full(num_rows, np.nan, dtype=np.result_type(values, np.float32))
+            filled[positions] = values
+            columns[column] = filled
+
+    return _with_datetime_index(pd.DataFrame(columns))
+
+
+def _ffill_column(
+    column: str,
+    values: np.ndarray,
+    df: pd.DataFrame,
+    present: np.ndarray,
+    source_rows: np.ndarray,
+) -> np.ndarray:
+    """Fill the missing rows of a column for the "ffill" policy."""
+    if column == "volume":
+        filled = np.zeros(len(present), dtype=values.dtype)
+        filled[present] = values
+        return filled
+    if column in PRICE_COLUMNS and "close" in df.columns:
+        # Missing bars are flat at the previous close
+        filled = df["close"].to_numpy().astype(values.dtype)[source_rows]
+        filled[present] = values
+        return filled
+    return values[source_rows]
+
+
+def _with_datetime_index(df: pd.DataFrame) -> pd.DataFrame:
+    """Index a DataFrame by the datetimes of its timestamp column."""
+    df.index = pd.to_datetime(df["timestamp"], unit="s")
+    df.index.name = "datetime"
+    return df
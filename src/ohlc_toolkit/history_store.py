@@ -0,0 +1,211 @@
+"""Append-only local store for the full minute history of a dataset.
+
+The store keeps OHLC rows in monthly CSV partitions (`{root}/{YYYY}/{YYYY-MM}.csv`)
+and a high-water mark: the latest timestamp stored. Merging an update file only
+appends the rows after the high-water mark to the partitions they belong to, so a
+daily update costs O(new rows) rather than rebuilding the full history.
+"""
+
+import os
+from collections.abc import Iterator
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from ohlc_toolkit.config import DEFAULT_COLUMNS, DEFAULT_DTYPE
+from ohlc_toolkit.config.logging import get_logger
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+
+LOGGER = get_logger(__name__)
+
+METADATA_FILE_NAME = "_metadata.json"
+TAIL_READ_SIZE = 4096  # Bytes read from the end of a partition to find its last row
+
+
+class HistoryStore:
+    """Append-only OHLC history, partitioned by month."""
+
+    def __init__(self, root_dir: str):
+        """Open (or create) a history store.
+
+        Args:
+            root_dir: Directory of the store.
+
+        """
+        self.root_dir = root_dir.rstrip("/")
+        os.makedirs(self.root_dir, exist_ok=True)
+        self.high_water_mark = self._load_high_water_mark()
+
+    @property
+    def _metadata_path(self) -> str:
+        return f"{self.root_dir}/{METADATA_FILE_NAME}"
+
+    def _partition_path(self, month: np.datetime64) -> str:
+        """Get the partition path of a month, e.g. `{root}/2025/2025-01.csv`."""
+        month_str = str(month)
+        return f"{self.root_dir}/{month_str[:4]}/{month_str}.csv"
+
+    def _load_high_water_mark(self) -> int | None:
+        """Load the high-water mark, recovering it from the partitions if needed.
+
+        Rows are appended before the metadata is updated, so after an interrupted
+        merge the latest partition may hold rows beyond the saved high-water mark,
+        and may end with a partially written row, which is removed.
+        """
+        high_water_mark = None
+        if os.path.exists(self._metadata_path):
+            with open(self._metadata_path, "rb") as file:
+                high_water_mark = orjson.loads(file.read())["high_water_mark"]
+
+        for path in reversed(self.partitions()):
+            last_timestamp = _repair_last_row(path)
+            if last_timestamp is None:
+                continue  # Nothing was written to this partition yet
+            if high_water_mark is None or last_timestamp > high_water_mark:
+                LOGGER.info("Recovered high-water mark from partition data")
+                high_water_mark = last_timestamp
+            break
+        return high_water_mark
+
+    def _save_high_water_mark(self):
+        with open(self._metadata_path, "wb") as file:
+            file.write(orjson.dumps({"high_water_mark": self.high_water_mark}))
+
+    def partitions(self) -> list[str]:
+        """Get the paths of all partitions, in chronological order."""
+        paths: list[str] = []
+        for year in sorted(os.listdir(self.root_dir)):
+            year_dir = f"{self.root_dir}/{year}"
+            if year.isdigit() and os.path.isdir(year_dir):
+                paths.extend(
+                    f"{year_dir}/{name}"
+                    for name in sorted(os.listdir(year_dir))
+                    if name.endswith(".csv")
+                )
+        return paths
+
+    def merge(self, df: pd.DataFrame) -> int:
+        """Append the rows of `df` after the high-water mark to the store.
+
+        Args:
+            df: OHLC data, e.g. from the latest update file. It may overlap with the
+                stored history, and may contain duplicate timestamps (the last one
+                is kept).
+
+        Returns:
+            int: The number of rows appended.
+
+        """
+        timestamps = df["timestamp"].to_numpy(dtype=np.int64)
+        if self.high_water_mark is not None:
+            df = df[timestamps > self.high_water_mark]
+        df = (
+            df[DEFAULT_COLUMNS]
+            .drop_duplicates(subset="timestamp", keep="last")
+            .sort_values("timestamp")
+        )
+        if df.empty:
+            LOGGER.info("No new rows to merge into the history store")
+            return 0
+
+        timestamps = df["timestamp"].to_numpy(dtype=np.int64)
+        months = timestamps.astype("datetime64[s]").astype("datetime64[M]")
+        boundaries = np.flatnonzero(months[1:] != months[:-1]) + 1
+        starts = np.concatenate([[0], boundaries])
+        ends = np.concatenate([boundaries, [len(df)]])
+
+        for start, end in zip(starts, ends, strict=True):
+            path = self._partition_path(months[start])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            df.iloc[start:end].to_csv(path, mode="a", header=False, index=False)
+
+        self.high_water_mark = int(timestamps[-1])
+        self._save_high_water_mark()
+        LOGGER.info(
+            "Merged {} new rows into {} partitions, up to timestamp {}",
+            len(df),
+            len(starts),
+            self.high_water_mark,
+        )
+        return len(df)
+
+    def merge_csv(self, filepath: str) -> int:
+        """Append the new rows of an OHLC CSV file (e.g. the latest update file)."""
+        return self.merge(read_ohlc_csv(filepath))
+
+    def iter_partitions(
+        self, start: int | None = None, end: int | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Read the partitions overlapping a timestamp range, one month at a time.
+
+        Args:
+            start: First timestamp to include. Defaults to the start of the history.
+            end: Last timestamp to include. Defaults to the end of the history.
+
+        Yields:
+            pd.DataFrame: The rows of each partition within the range.
+
+        """
+        first_month = _month_of(start) if start is not None else None
+        last_month = _month_of(end) if end is not None else None
+        for path in self.partitions():
+            month = np.datetime64(os.path.basename(path).removesuffix(".csv"), "M")
+            if (first_month is not None and month < first_month) or (
+                last_month is not None and month > last_month
+            ):
+                continue
+
+            df = pd.read_csv(path, names=DEFAULT_COLUMNS, dtype=DEFAULT_DTYPE)
+            if start is not None:
+                df = df[df["timestamp"] >= start]
+            if end is not None:
+                df = df[df["timestamp"] <= end]
+            df.index = pd.to_datetime(df["timestamp"], unit="s")
+            df.index.name = "datetime"
+            yield df
+
+    def read(self, start: int | None = None, end: int | None = None) -> pd.DataFrame:
+        """Read the stored history within a timestamp range into one DataFrame."""
+        frames = list(self.iter_partitions(start, end))
+        if not frames:
+            df = pd.DataFrame(columns=DEFAULT_COLUMNS).astype(DEFAULT_DTYPE)
+            df.index = pd.to_datetime(df["timestamp"], unit="s")
+            df.index.name = "datetime"
+            return df
+        return pd.concat(frames)
+
+
+def _month_of(timestamp: int) -> np.datetime64:
+    """Get the month of a UNIX timestamp."""
+    return np.datetime64(int(timestamp), "s").astype("datetime64[M]")
+
+
+def _repair_last_row(path: str) -> int | None:
+    """Get the timestamp of the last row of a partition, reading only its tail.
+
+    A last row without a trailing newline was cut off by an interrupted append, so
+    it is truncated from the file; its data is merged again by the next update.
+
+    Returns:
+        int | None: The timestamp of the last complete row, or None if there is none.
+
+    """
+    with open(path, "rb+") as file:
+        file_size = file.seek(0, os.SEEK_END)
+        tail_start = file.seek(max(file_size - TAIL_READ_SIZE, 0))
+        tail = file.read()
+        if tail and not tail.endswith(b"\n"):
+            end = tail_start + tail.rfind(b"\n") + 1
+            LOGGER.warning(
+                "Removing partially written row at the end of `{}`: {!r}",
+                path,
+                tail[end - tail_start :],
+            )
+            file.truncate(end)
+            tail = tail[: end - tail_start]
+
+    last_line = tail.rstrip(b"\n").rsplit(b"\n", 1)[-1]
+    if not last_line:
+        return None
+    return int(last_line.split(b",", 1)[0])
@@ -0,0 +1,211 @@
+"""Batch processing of OHLC data for many symbols at once.
+
+Data for several instruments is handled in long format: one DataFrame with a
+`symbol` column next to the OHLC columns. `transform_ohlc_symbols` aggregates all
+symbols with the array kernel of `aggregate_ohlc_arrays` over the concatenated
+columns, instead of paying the per-call overhead of `transform_ohlc` once per
+symbol.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from ohlc_toolkit.aggregation import aggregate_ohlc_columns, group_starts
+from ohlc_toolkit.config import DEFAULT_COLUMNS
+from ohlc_toolkit.config.logging import get_logger
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+from ohlc_toolkit.timeframes import (
+    parse_timeframe_to_seconds,
+    rows_per_interval,
+    validate_timeframe,
+)
+
+LOGGER = get_logger(__name__)
+
+SYMBOL_COLUMN = "symbol"
+CSV_SUFFIXES = (".csv", ".csv.gz")
+
+
+def read_ohlc_csv_dir(
+    directory: str, *, num_workers: int = 1, show_progress: bool = True
+) -> pd.DataFrame:
+    """Read a directory of OHLC CSV files, one per symbol, into a long-format frame.
+
+    Each file is named after its symbol, e.g. `BTCUSD.csv` or `ETHUSD.csv.gz`.
+    Files that fail to read are skipped, and their errors are reported in
+    `df.attrs["errors"]` rather than aborting the whole batch.
+
+    Args:
+        directory (str): Directory of the CSV files.
+        num_workers (int): Number of threads to read files with.
+        show_progress (bool): Whether to show a progress bar.
+
+    Returns:
+        pd.DataFrame: The data of all symbols, with a `symbol` column and a datetime
+            index. `df.attrs["errors"]` maps each failed symbol to its error.
+
+    """
+    file_names = sorted(
+        name for name in os.listdir(directory) if name.endswith(CSV_SUFFIXES)
+    )
+    LOGGER.info("Reading {} OHLC files from `{}`", len(file_names), directory)
+
+    def read_symbol(file_name: str) -> tuple[str, pd.DataFrame | Exception]:
+        symbol = _symbol_of(file_name)
+        try:
+            return symbol, read_ohlc_csv(f"{directory.rstrip('/')}/{file_name}")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            return symbol, e
+
+    frames = []
+    errors = {}
+    with (
+        ThreadPoolExecutor(max_workers=num_workers) as executor,
+        tqdm(
+            total=len(file_names), desc="Reading", disable=not show_progress
+        ) as progress_bar,
+    ):
+        for symbol, result in executor.map(read_symbol, file_names):
+            progress_bar.update(1)
+            if isinstance(result, Exception):
+                LOGGER.warning("Failed to read symbol {}: {}", symbol, result)
+                errors[symbol] = str(result)
+            else:
+                frames.append(result.assign(**{SYMBOL_COLUMN: symbol}))
+
+    if frames:
+        df = pd.concat(frames)
+    else:
+        df = pd.DataFrame(columns=[*DEFAULT_COLUMNS, SYMBOL_COLUMN])
+    df.attrs["errors"] = errors
+    return df
+
+
+def transform_ohlc_symbols(
+    data: pd.DataFrame | str,
+    timeframe: int | str,
+    step_size_minutes: int = 1,
+    *,
+    num_workers: int = 1,
+    show_progress: bool = True,
+) -> pd.DataFrame:
+    """Transform OHLC data of many symbols to a different timeframe resolution.
+
+    Each symbol gets the same windows as `transform_ohlc` on its own data: windows
+    start every `step_size_minutes` rows from the symbol's first row. With a step
+    size of 1, all symbols are aggregated in one pass over the concatenated columns,
+    keeping only the windows that lie within a single symbol. Otherwise the strided
+    kernel runs over each symbol's rows, computing only the kept windows, and writes
+    straight into the shared output arrays.
+
+    Symbols with too little data for the timeframe are skipped, and reported in
+    `df.attrs["errors"]` along with any files that failed to read.
+
+    Args:
+        data (pd.DataFrame | str): Long-format OHLC data with a `symbol` column, or
+            a directory of CSV files, one per symbol (see `read_ohlc_csv_dir`).
+        timeframe (int | str): Desired timeframe resolution, either an integer (in
+            minutes) or a string (e.g., '1h', '4h30m').
+        step_size_minutes (int): Step size in minutes between consecutive windows.
+        num_workers (int): Number of threads to read CSV files with.
+        show_progress (bool): Whether to show a progress bar when reading files.
+
+    Returns:
+        pd.DataFrame: The transformed OHLC data of all symbols, with a `symbol`
+            column and a datetime index. `df.attrs["errors"]` maps each failed
+            symbol to its error.
+
+    """
+    if isinstance(data, str):
+        data = read_ohlc_csv_dir(
+            data, num_workers=num_workers, show_progress=show_progress
+        )
+    errors = dict(data.attrs.get("errors", {}))
+
+    bound_logger = LOGGER.bind(
+        body={"timeframe": timeframe, "step_size": step_size_minutes}
+    )
+    timeframe_seconds = parse_timeframe_to_seconds(timeframe, bound_logger)
+    validate_timeframe(
+        time_step=step_size_minutes * 60,
+        user_timeframe=timeframe_seconds,
+        logger=bound_logger,
+    )
+    timeframe_minutes = rows_per_interval(timeframe_seconds, 60, "Timeframe")
+
+    missing_columns = {SYMBOL_COLUMN, *DEFAULT_COLUMNS} - set(data.columns)
+    if missing_columns:
+        raise KeyError(f"Missing columns: {sorted(missing_columns)}")
+
+    df = data.sort_values([SYMBOL_COLUMN, "timestamp"], kind="stable")
+    symbols = df[SYMBOL_COLUMN].to_numpy()
+    starts = group_starts(symbols)
+    lengths = np.diff(np.append(starts, len(df)))
+    num_windows = np.maximum((lengths - timeframe_minutes) // step_size_minutes + 1, 0)
+
+    for symbol in symbols[starts[num_windows == 0]]:
+        bound_logger.warning("Not enough data for symbol {}, skipping", symbol)
+        errors[symbol] = (
+            f"Timeframe too large. Symbol {symbol} has too little data for this "
+            f"timeframe: {timeframe_minutes} minutes."
+        )
+
+    # Row of the last bar of every kept window, symbol by symbol
+    window_symbols = np.repeat(np.arange(len(starts)), num_windows)
+    first_windows = np.cumsum(num_windows) - num_windows
+    window_numbers = np.arange(len(window_symbols)) - np.repeat(
+        first_windows, num_windows
+    )
+    window_ends = (
+        starts[window_symbols]
+        + timeframe_minutes
+        - 1
+        + window_numbers * step_size_minutes
+    )
+
+    bound_logger.info(
+        "Aggregating {} windows over {} symbols.", len(window_ends), len(starts)
+    )
+    columns = [df[column].to_numpy() for column in DEFAULT_COLUMNS]
+    out = [np.empty(len(window_ends), dtype=values.dtype) for values in columns]
+    if step_size_minutes == 1:
+        # Every window within a symbol is kept, so aggregate all windows in one pass
+        # over the concatenated columns, and drop those that span two symbols
+        for target, values in zip(
+            out, aggregate_ohlc_columns(columns, timeframe_minutes), strict=True
+        ):
+            target[:] = values[window_ends - (timeframe_minutes - 1)]
+    else:
+        # Only every `step` window is kept, and they start at each symbol's first row
+        for start, length, first_window, count in zip(
+            starts, lengths, first_windows, num_windows, strict=True
+        ):
+            if count == 0:
+                continue
+            aggregate_ohlc_columns(
+                [values[start : start + length] for values in columns],
+                timeframe_minutes,
+                step_size_minutes,
+                out=[values[first_window : first_window + count] for values in out],
+            )
+
+    df_agg = pd.DataFrame(
+        {
+            SYMBOL_COLUMN: symbols[window_ends],
+            **dict(zip(DEFAULT_COLUMNS, out, strict=True)),
+        },
+        copy=False,
+    )
+    df_agg.index = pd.to_datetime(df_agg["timestamp"], unit="s")
+    df_agg.index.name = "datetime"
+    df_agg.attrs["errors"] = errors
+    return df_agg
+
+
+def _symbol_of(file_name: str) -> str:
+    """Get the symbol of a CSV file from its name, e.g. `BTCUSD.csv.gz` -> BTCUSD."""
+    return file_name.removesuffix(".gz").removesuffix(".csv")
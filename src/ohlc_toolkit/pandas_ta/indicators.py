@@ -0,0 +1,383 @@
+"""Rolling indicators from pandas-ta, computed with NumPy sweep kernels.
+
+Each indicator is available on its own, with the pandas-ta signature and column
+name (e.g. `ema(close, length=10)` gives `EMA_10`), and in bulk through
+`compute_indicators`, which computes many indicators and lengths over one OHLCV
+frame into a single preallocated matrix. Intermediate series that several lengths
+or indicators need (true range, gains and losses, log returns) are computed once.
+"""
+
+from collections.abc import Callable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.aggregation import group_starts
+from ohlc_toolkit.pandas_ta import kernels
+from ohlc_toolkit.pandas_ta.utils import v_offset, v_pos_default, v_series
+
+IndicatorKernel = Callable[[pd.DataFrame, Sequence, np.ndarray, dict], None]
+
+
+def _close(df: pd.DataFrame, shared: dict) -> np.ndarray:
+    if "close" not in shared:
+        shared["close"] = df["close"].to_numpy(dtype=np.float64)
+    return shared["close"]
+
+
+def _sma_kernel(df: pd.DataFrame, lengths: Sequence, out: np.ndarray, shared: dict):
+    kernels.rolling_mean(_close(df, shared), lengths, out)
+
+
+def _ema_kernel(df: pd.DataFrame, lengths: Sequence, out: np.ndarray, shared: dict):
+    kernels.ema(_close(df, shared), lengths, out)
+
+
+def _rsi_kernel(df: pd.DataFrame, lengths: Sequence, out: np.ndarray, shared: dict):
+    close = _close(df, shared)
+    change = np.empty_like(close)
+    change[:1] = np.nan
+    np.subtract(close[1:], close[:-1], out=change[1:])
+
+    gains = kernels.rma(np.maximum(change, 0), lengths, np.empty(out.shape))
+    losses = kernels.rma(np.maximum(-change, 0), lengths, np.empty(out.shape))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.multiply(100, gains / (gains + losses), out=out)
+
+
+def _atr_kernel(df: pd.DataFrame, lengths: Sequence, out: np.ndarray, shared: dict):
+    high = df["high"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    previous_close = np.empty_like(high)
+    previous_close[:1] = np.nan
+    previous_close[1:] = _close(df, shared)[:-1]
+
+    true_range = np.fmax(high, previous_close) - np.fmin(low, previous_close)
+    true_range[:1] = np.nan
+    kernels.rma(true_range, lengths, out)
+
+
+def _volatility_kernel(
+    df: pd.DataFrame, lengths: Sequence, out: np.ndarray, shared: dict
+):
+    close = _close(df, shared)
+    log_returns = np.empty_like(close)
+    log_returns[:1] = np.nan
+    np.log(close[1:] / close[:-1], out=log_returns[1:])
+    kernels.rolling_std(log_returns, lengths, out)
+
+
+def _zscore_kernel(df: pd.DataFrame, lengths: Sequence, out: np.ndarray, shared: dict):
+    close = _close(df, shared)
+    means = kernels.rolling_mean(close, lengths, np.empty(out.shape))
+    stds = kernels.rolling_std(close, lengths, np.empty(out.shape))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(close[:, None] - means, stds, out=out)
+
+
+def _vwap_kernel(df: pd.DataFrame, anchors: Sequence, out: np.ndarray, shared: dict):
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise TypeError("VWAP requires a DatetimeIndex to anchor its periods.")
+
+    typical_price = (
+        df["high"].to_numpy(dtype=np.float64)
+        + df["low"].to_numpy(dtype=np.float64)
+        + _close(df, shared)
+    ) / 3
+    volume = df["volume"].to_numpy(dtype=np.float64)
+    for column, anchor in enumerate(anchors):
+        # Cumulative sums that restart at the start of every period
+        starts = group_starts(df.index.to_period(anchor).astype(np.int64).to_numpy())
+        lengths = np.diff(np.append(starts, len(df)))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[:, column] = _group_cumsum(
+                typical_price * volume, starts, lengths
+            ) / _group_cumsum(volume, starts, lengths)
+
+
+def _group_cumsum(
+    values: np.ndarray, starts: np.ndarray, lengths: np.ndarray
+) -> np.ndarray:
+    """Compute the cumulative sum of `values` within each group of rows."""
+    sums = np.cumsum(values)
+    if len(starts) > 1:
+        offsets = np.concatenate([[0], sums[starts[1:] - 1]])
+        sums -= np.repeat(offsets, lengths)
+    return sums
+
+
+INDICATORS: dict[str, tuple[str, IndicatorKernel]] = {
+    "sma": ("SMA_{}", _sma_kernel),
+    "ema": ("EMA_{}", _ema_kernel),
+    "rsi": ("RSI_{}", _rsi_kernel),
+    "atr": ("ATRr_{}", _atr_kernel),
+    "volatility": ("VOL_{}", _volatility_kernel),
+    "zscore": ("ZS_{}", _zscore_kernel),
+    "vwap": ("VWAP_{}", _vwap_kernel),
+}
+
+
+def compute_indicators(
+    df: pd.DataFrame,
+    indicators: Mapping[str, Sequence[int | str]],
+    *,
+    dtype: np.dtype | type = np.float64,
+) -> pd.DataFrame:
+    """Compute many indicators and lengths over one OHLCV frame in a single pass.
+
+    All columns are written into one preallocated matrix, and the DataFrame wraps it
+    without copying. A sweep such as `{"ema": range(5, 201)}` runs the shared work
+    once and fills one column per length.
+
+    Args:
+        df (pd.DataFrame): OHLCV data, e.g. the output of `transform_ohlc`.
+        indicators (Mapping[str, Sequence[int | str]]): The lengths of each
+            indicator to compute, by name: "sma", "ema", "rsi", "atr", "volatility"
+            and "zscore". For "vwap", the anchors instead (pandas period aliases,
+            e.g. "D" or "W"), which require a datetime index.
+        dtype (np.dtype | type): Data type of the result.
+
+    Returns:
+        pd.DataFrame: The indicators, with the index of `df` and pandas-ta column
+            names (e.g. `EMA_10`, `RSI_14`, `ATRr_14`, `ZS_30`, `VWAP_D`).
+
+    """
+    unknown = set(indicators) - set(INDICATORS)
+    if unknown:
+        raise ValueError(
+            f"Unknown indicators: {sorted(unknown)}. "
+            f"Expected some of {list(INDICATORS)}."
+        )
+    for name, parameters in indicators.items():
+        if name != "vwap" and any(
+            not isinstance(length, int | np.integer) or length < 1
+            for length in parameters
+        ):
+            raise ValueError(f"Invalid {name} lengths: {list(parameters)}")
+
+    columns = [
+        INDICATORS[name][0].format(parameter)
+        for name, parameters in indicators.items()
+        for parameter in parameters
+    ]
+    # Column-major, so that each indicator's columns are contiguous
+    result = np.empty((len(df), len(columns)), dtype=dtype, order="F")
+
+    shared: dict[str, np.ndarray] = {}
+    column = 0
+    for name, parameters in indicators.items():
+        block = result[:, column : column + len(parameters)]
+        INDICATORS[name][1](df, list(parameters), block, shared)
+        column += len(parameters)
+
+    return pd.DataFrame(result, index=df.index, columns=columns, copy=False)
+
+
+def _indicator(  # noqa: PLR0913
+    name: str,
+    df: pd.DataFrame,
+    parameter: int | str,
+    offset: int | None,
+    fillna: object | None,
+    category: str,
+) -> pd.Series:
+    """Compute one indicator as a named Series, like pandas-ta does."""
+    result = compute_indicators(df, {name: [parameter]}).iloc[:, 0]
+
+    offset = v_offset(offset)
+    if offset != 0:
+        result = result.shift(offset)
+    if fillna is not None:
+        result = result.fillna(fillna)  # type: ignore[arg-type]
+
+    result.category = category  # type: ignore[attr-defined]
+    return result
+
+
+def _validate(series: pd.Series, length: int) -> pd.Series:
+    """Validate a series is long enough for an indicator of the given length."""
+    validated = v_series(series, length)
+    if validated is None:
+        raise ValueError(
+            "Series length does not meet the minimum length required for the indicator."
+        )
+    return validated
+
+
+def sma(
+    close: pd.Series,
+    length: int = 10,
+    offset: int | None = None,
+    fillna: object | None = None,
+) -> pd.Series:
+    """Compute the Simple Moving Average (SMA).
+
+    Args:
+        close (pd.Series): Series of 'close's
+        length (int): Its period. Default: 10
+        offset (int): How many periods to offset the result. Default: 0
+        fillna (object, optional): Value to fill NaN values with. Default is None.
+
+    Returns:
+        pd.Series: New feature generated.
+
+    """
+    length = v_pos_default(length, 10)
+    close = _validate(close, length)
+    return _indicator("sma", close.to_frame("close"), length, offset, fillna, "overlap")
+
+
+def ema(
+    close: pd.Series,
+    length: int = 10,
+    offset: int | None = None,
+    fillna: object | None = None,
+) -> pd.Series:
+    """Compute the Exponential Moving Average (EMA), seeded with an SMA.
+
+    Args:
+        close (pd.Series): Series of 'close's
+        length (int): Its period. Default: 10
+        offset (int): How many periods to offset the result. Default: 0
+        fillna (object, optional): Value to fill NaN values with. Default is None.
+
+    Returns:
+        pd.Series: New feature generated.
+
+    """
+    length = v_pos_default(length, 10)
+    close = _validate(close, length)
+    return _indicator("ema", close.to_frame("close"), length, offset, fillna, "overlap")
+
+
+def rsi(
+    close: pd.Series,
+    length: int = 14,
+    offset: int | None = None,
+    fillna: object | None = None,
+) -> pd.Series:
+    """Compute the Relative Strength Index (RSI), with Wilder's smoothing.
+
+    Args:
+        close (pd.Series): Series of 'close's
+        length (int): Its period. Default: 14
+        offset (int): How many periods to offset the result. Default: 0
+        fillna (object, optional): Value to fill NaN values with. Default is None.
+
+    Returns:
+        pd.Series: New feature generated.
+
+    """
+    length = v_pos_default(length, 14)
+    close = _validate(close, length + 1)
+    return _indicator(
+        "rsi", close.to_frame("close"), length, offset, fillna, "momentum"
+    )
+
+
+def atr(  # noqa: PLR0913
+    high: pd.Series,
+    low: pd.Series,
+    close: pd.Series,
+    length: int = 14,
+    offset: int | None = None,
+    fillna: object | None = None,
+) -> pd.Series:
+    """Compute the Average True Range (ATR), with Wilder's smoothing.
+
+    Args:
+        high (pd.Series): Series of 'high's
+        low (pd.Series): Series of 'low's
+        close (pd.Series): Series of 'close's
+        length (int): Its period. Default: 14
+        offset (int): How many periods to offset the result. Default: 0
+        fillna (object, optional): Value to fill NaN values with. Default is None.
+
+    Returns:
+        pd.Series: New feature generated.
+
+    """
+    length = v_pos_default(length, 14)
+    close = _validate(close, length + 1)
+    df = pd.DataFrame({"high": high, "low": low, "close": close})
+    return _indicator("atr", df, length, offset, fillna, "volatility")
+
+
+def volatility(
+    close: pd.Series,
+    length: int = 30,
+    offset: int | None = None,
+    fillna: object | None = None,
+) -> pd.Series:
+    """Compute the rolling volatility, i.e. the standard deviation of log returns.
+
+    Args:
+        close (pd.Series): Series of 'close's
+        length (int): Its period. Default: 30
+        offset (int): How many periods to offset the result. Default: 0
+        fillna (object, optional): Value to fill NaN values with. Default is None.
+
+    Returns:
+        pd.Series: New feature generated.
+
+    """
+    length = v_pos_default(length, 30)
+    close = _validate(close, length + 1)
+    return _indicator(
+        "volatility", close.to_frame("close"), length, offset, fillna, "volatility"
+    )
+
+
+def zscore(
+    close: pd.Series,
+    length: int = 30,
+    offset: int | None = None,
+    fillna: object | None = None,
+) -> pd.Series:
+    """Compute the rolling Z Score of the close, relative to its SMA.
+
+    Args:
+        close (pd.Series): Series of 'close's
+        length (int): Its period. Default: 30
+        offset (int): How many periods to offset the result. Default: 0
+        fillna (object, optional): Value to fill NaN values with. Default is None.
+
+    Returns:
+        pd.Series: New feature generated.
+
+    """
+    length = v_pos_default(length, 30)
+    close = _validate(close, length)
+    return _indicator(
+        "zscore", close.to_frame("close"), length, offset, fillna, "statistics"
+    )
+
+
+def vwap(  # noqa: PLR0913
+    high: pd.Series,
+    low: pd.Series,
+    close: pd.Series,
+    volume: pd.Series,
+    anchor: str = "D",
+    offset: int | None = None,
+    fillna: object | None = None,
+) -> pd.Series:
+    """Compute the Volume Weighted Average Price (VWAP), restarting every period.
+
+    Args:
+        high (pd.Series): Series of 'high's
+        low (pd.Series): Series of 'low's
+        close (pd.Series): Series of 'close's, with a DatetimeIndex
+        volume (pd.Series): Series of 'volume's
+        anchor (str): The period the VWAP restarts at, as a pandas period alias.
+            Default: "D"
+        offset (int): How many periods to offset the result. Default: 0
+        fillna (object, optional): Value to fill NaN values with. Default is None.
+
+    Returns:
+        pd.Series: New feature generated.
+
+    """
+    close = _validate(close, 1)
+    df = pd.DataFrame({"high": high, "low": low, "close": close, "volume": volume})
+    return _indicator("vwap", df, anchor, offset, fillna, "overlap")
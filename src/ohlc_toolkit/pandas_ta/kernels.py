@@ -0,0 +1,137 @@
+"""NumPy kernels for parameter sweeps of rolling indicators.
+
+Every kernel computes one indicator for many lengths at once, writing each length
+into its own column of a preallocated `out` matrix of shape (rows, lengths), and
+shares the work that does not depend on the length:
+
+- `rolling_mean` takes one cumulative sum of the input, then every length is a
+  single subtraction of shifted views of it. A cumulative count of NaNs marks the
+  windows that contain one.
+- `ema`, `rma` and `rolling_std` wrap one pandas Series around the input, and run
+  pandas' compiled recursive/rolling kernels once per length.
+
+Rows before a length's first full window are NaN, as in pandas-ta.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def rolling_mean(
+    values: np.ndarray, lengths: Sequence[int], out: np.ndarray
+) -> np.ndarray:
+    """Compute the simple moving average of `values` for every length.
+
+    Windows that contain a NaN are NaN, as with `rolling(length).mean()`.
+
+    Args:
+        values (np.ndarray): 1-D input array.
+        lengths (Sequence[int]): Window lengths, one per column of `out`.
+        out (np.ndarray): Output matrix of shape (len(values), len(lengths)).
+
+    Returns:
+        np.ndarray: `out`, filled.
+
+    """
+    num_rows = len(values)
+    nan_mask = np.isnan(values)
+    has_nans = bool(nan_mask.any())
+    # Center the values before summing, to keep the cumulative sum small
+    valid = np.flatnonzero(~nan_mask)
+    reference = float(values[valid[0]]) if len(valid) else 0.0
+    centered = np.subtract(values, reference, dtype=np.float64)
+    sums = np.zeros(num_rows + 1)
+    if has_nans:
+        centered[nan_mask] = 0.0
+        nan_counts = np.zeros(num_rows + 1, dtype=np.intp)
+        np.cumsum(nan_mask, out=nan_counts[1:])
+    np.cumsum(centered, out=sums[1:])
+
+    window_sums = np.empty(num_rows)
+    for column, length in enumerate(lengths):
+        result = out[:, column]
+        result[: length - 1] = np.nan
+        if length > num_rows:
+            continue
+        means = window_sums[: num_rows - length + 1]
+        np.subtract(sums[length:], sums[:-length], out=means)
+        means /= length
+        if has_nans:
+            means[nan_counts[length:] > nan_counts[:-length]] = np.nan
+        np.add(means, reference, out=result[length - 1 :])
+    return out
+
+
+def ema(values: np.ndarray, lengths: Sequence[int], out: np.ndarray) -> np.ndarray:
+    """Compute the exponential moving average of `values` for every length.
+
+    Like pandas-ta, each average is seeded with the simple moving average of its
+    first `length` values, and then follows `ewm(span=length, adjust=False)`.
+
+    Args:
+        values (np.ndarray): 1-D input array, without NaNs.
+        lengths (Sequence[int]): Spans, one per column of `out`.
+        out (np.ndarray): Output matrix of shape (len(values), len(lengths)).
+
+    Returns:
+        np.ndarray: `out`, filled.
+
+    """
+    num_rows = len(values)
+    seeded = np.empty(num_rows)
+    for column, length in enumerate(lengths):
+        if length > num_rows:
+            out[:, column] = np.nan
+            continue
+        seeded[:] = values
+        seeded[: length - 1] = np.nan
+        seeded[length - 1] = values[:length].mean()
+        out[:, column] = (
+            pd.Series(seeded, copy=False).ewm(span=length, adjust=False).mean()
+        )
+    return out
+
+
+def rma(values: np.ndarray, lengths: Sequence[int], out: np.ndarray) -> np.ndarray:
+    """Compute Wilder's moving average of `values` for every length.
+
+    As in pandas-ta, this is `ewm(alpha=1 / length, min_periods=length)`. Leading
+    NaNs (e.g. of a difference) are skipped.
+
+    Args:
+        values (np.ndarray): 1-D input array.
+        lengths (Sequence[int]): Window lengths, one per column of `out`.
+        out (np.ndarray): Output matrix of shape (len(values), len(lengths)).
+
+    Returns:
+        np.ndarray: `out`, filled.
+
+    """
+    series = pd.Series(values, copy=False)
+    for column, length in enumerate(lengths):
+        out[:, column] = series.ewm(alpha=1 / length, min_periods=length).mean()
+    return out
+
+
+def rolling_std(
+    values: np.ndarray, lengths: Sequence[int], out: np.ndarray
+) -> np.ndarray:
+    """Compute the rolling sample standard deviation of `values` for every length.
+
+    Uses pandas' numerically stable rolling variance, rather than sums of squares.
+
+    Args:
+        values (np.ndarray): 1-D input array.
+        lengths (Sequence[int]): Window lengths, one per column of `out`.
+        out (np.ndarray): Output matrix of shape (len(values), len(lengths)).
+
+    Returns:
+        np.ndarray: `out`, filled.
+
+    """
+    series = pd.Series(values, copy=False)
+    for column, length in enumerate(lengths):
+        out[:, column] = series.rolling(length).std()
+    return out
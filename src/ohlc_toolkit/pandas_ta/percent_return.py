@@ -1,6 +1,6 @@
 """Percent Return from pandas-ta."""
 
-from numpy import nan, roll
+from numpy import divide, float64, floating, full, issubdtype, nan
 from pandas import Series
 
 from ohlc_toolkit.pandas_ta.utils import v_bool, v_offset, v_pos_default, v_series
@@ -50,8 +50,12 @@ def percent_return(
     if cumulative:
         pr = (np_close / np_close[0]) - 1
     else:
-        pr = (np_close / roll(np_close, length)) - 1
-        pr[:length] = nan
+        # Divide shifted views in place, rather than a rolled copy of the series
+        # Keep the precision of float input, as a plain division would
+        dtype = np_close.dtype if issubdtype(np_close.dtype, floating) else float64
+        pr = full(np_close.shape, nan, dtype=dtype)
+        divide(np_close[length:], np_close[:-length], out=pr[length:])
+        pr[length:] -= 1
     pct_return = Series(pr, index=close.index)
 
     # Offset
@@ -0,0 +1,151 @@
+"""Opt-in timing of pipeline stages.
+
+Pass a `PipelineStats` to `read_ohlc_csv` or `transform_ohlc` to record the wall
+time, rows in and out, and output size of each stage of the call. Each stage is
+also logged with its fields in the log record body, and passed to an optional
+callback. With `track_memory`, the bytes allocated by each stage are traced with
+`tracemalloc`, which slows the stages down noticeably, so it is off by default.
+
+When no stats are given, the stages run in `NULL_STATS`, whose stages are no-op
+context managers, so the instrumentation costs close to nothing. Both are a
+`StageRecorder`.
+"""
+
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from typing import Any, Protocol
+
+import pandas as pd
+from loguru._logger import Logger
+
+
+@dataclass
+class StageStats:
+    """Measurements of one stage of a pipeline call."""
+
+    name: str
+    rows_in: int
+    rows_out: int = 0
+    seconds: float = 0.0
+    bytes_out: int = 0
+    bytes_allocated: int | None = None
+
+    def set_output(self, df: pd.DataFrame):
+        """Record the rows and size of the data after the stage."""
+        self.rows_out = len(df)
+        self.bytes_out = int(df.memory_usage(index=True, deep=False).sum())
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the measurements as a JSON-serializable dict."""
+        return asdict(self)
+
+
+class PipelineStats:
+    """Collects the `StageStats` of the stages of pipeline calls, in order."""
+
+    def __init__(
+        self,
+        callback: Callable[[StageStats], None] | None = None,
+        *,
+        track_memory: bool = False,
+    ):
+        """Initialize the stats.
+
+        Args:
+            callback (Callable[[StageStats], None] | None): Called with the stats of
+                each stage when it completes.
+            track_memory (bool): Whether to trace the bytes allocated by each stage.
+                Tracing memory slows down the stages.
+
+        """
+        self.callback = callback
+        self.track_memory = track_memory
+        self.stages: list[StageStats] = []
+
+    @property
+    def total_seconds(self) -> float:
+        """Get the total wall time of the recorded stages."""
+        return sum(stage.seconds for stage in self.stages)
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int, logger: Logger) -> Iterator[StageStats]:
+        """Time a stage, then record, log, and report its stats.
+
+        Args:
+            name (str): Name of the stage.
+            rows_in (int): Number of rows the stage takes.
+            logger (Logger): Logger to emit the stats with.
+
+        Yields:
+            StageStats: The stats of the stage, whose output should be set with
+                `set_output`.
+
+        """
+        stage = StageStats(name, rows_in=rows_in, rows_out=rows_in)
+        started_tracing = self.track_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            traced_before = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.seconds = time.perf_counter() - start
+            if self.track_memory:
+                stage.bytes_allocated = (
+                    tracemalloc.get_traced_memory()[1] - traced_before
+                )
+            if started_tracing:
+                tracemalloc.stop()
+
+        self.stages.append(stage)
+        logger.bind(body=stage.to_dict()).info(
+            "Stage {} took {:.6f} seconds", name, stage.seconds
+        )
+        if self.callback is not None:
+            self.callback(stage)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the stats as a JSON-serializable dict."""
+        return {
+            "total_seconds": self.total_seconds,
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+
+class _NullStage:
+    """Stand-in for `StageStats` that discards what is recorded."""
+
+    def set_output(self, df: pd.DataFrame):
+        """Discard the output."""
+
+
+class StageRecorder(Protocol):
+    """Anything that times pipeline stages: `PipelineStats` or `NULL_STATS`."""
+
+    def stage(
+        self, name: str, rows_in: int, logger: Logger
+    ) -> AbstractContextManager[StageStats | _NullStage]:
+        """Get a context manager that times a stage."""
+        ...
+
+
+class _NullStats:
+    """Stand-in for `PipelineStats` when stats are disabled."""
+
+    _stage = nullcontext(_NullStage())
+
+    def stage(
+        self, name: str, rows_in: int, logger: Logger
+    ) -> AbstractContextManager[StageStats | _NullStage]:
+        """Return a no-op context manager."""
+        return self._stage
+
+
+NULL_STATS = _NullStats()
@@ -0,0 +1,213 @@
+"""Incremental aggregation of live OHLC bars."""
+
+from collections import deque
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import pandas as pd
+
+from ohlc_toolkit.config import DEFAULT_COLUMNS
+from ohlc_toolkit.config.logging import get_logger
+from ohlc_toolkit.timeframes import parse_timeframe
+
+LOGGER = get_logger(__name__)
+
+STATE_VERSION = 1
+
+
+class StreamingOHLCAggregator:
+    """Stateful OHLC aggregator that consumes bars one at a time.
+
+    Produces the same candles as `transform_ohlc` with the same timeframe and step
+    size: windows of `timeframe` bars starting every `step_size_minutes` bars from the
+    first bar, each emitted as soon as its last bar arrives.
+
+    High and low are tracked with monotonic deques, and volume with a two-stack
+    sliding sum, so each bar costs amortized O(1). The state only covers the current
+    window, and can be saved with `get_state` and restored with `from_state`.
+    """
+
+    def __init__(self, timeframe: int | str, step_size_minutes: int = 1):
+        """Initialize the aggregator.
+
+        Args:
+            timeframe (int | str): Candle timeframe, either an integer (in minutes)
+                or a string (e.g., '1h', '4h30m') of a whole number of minutes.
+            step_size_minutes (int): Step size in minutes between emitted candles.
+
+        """
+        if isinstance(timeframe, str):
+            timeframe_seconds = parse_timeframe(timeframe, to_minutes=False)
+            if timeframe_seconds % 60 != 0:
+                raise ValueError(
+                    f"Timeframe must be a whole number of minutes, got {timeframe}."
+                )
+            timeframe = timeframe_seconds // 60
+        if not isinstance(timeframe, int) or timeframe < 1:
+            raise ValueError(f"Invalid timeframe: {timeframe}")
+        if step_size_minutes < 1:
+            raise ValueError(f"Invalid step size: {step_size_minutes}")
+
+        self.timeframe_minutes = timeframe
+        self.step_size_minutes = step_size_minutes
+
+        self._bars_seen = 0
+        self._last_timestamp: int | None = None
+        self._last_close = 0.0
+        self._opens: deque[tuple[int, float]] = deque()  # (bar number, open)
+        self._highs: deque[tuple[int, float]] = deque()  # decreasing highs
+        self._lows: deque[tuple[int, float]] = deque()  # increasing lows
+        # Two-stack sliding sum: suffix sums of the oldest bars, plus newer volumes
+        self._volume_front: list[float] = []
+        self._volume_back: list[float] = []
+        self._volume_back_sum = 0.0
+
+    def update(self, bar: Mapping[str, Any]) -> dict[str, float] | None:
+        """Add one bar, and return the candle it completes, if any.
+
+        Bars with a timestamp at or before the last accepted bar are ignored, so that
+        a feed can safely replay recent bars after a restart.
+
+        Args:
+            bar (Mapping[str, Any]): Bar with timestamp, open, high, low, close and
+                volume fields.
+
+        Returns:
+            dict[str, float] | None: The completed candle, or None.
+
+        """
+        timestamp = int(bar["timestamp"])
+        if self._last_timestamp is not None and timestamp <= self._last_timestamp:
+            LOGGER.debug("Ignoring bar at {}, already aggregated", timestamp)
+            return None
+
+        index = self._bars_seen
+        window_start = index - self.timeframe_minutes + 1
+        self._bars_seen += 1
+        self._last_timestamp = timestamp
+        self._last_close = float(bar["close"])
+
+        if index % self.step_size_minutes == 0:
+            self._opens.append((index, float(bar["open"])))
+        self._push_extreme(self._highs, index, float(bar["high"]), window_start, max)
+        self._push_extreme(self._lows, index, float(bar["low"]), window_start, min)
+        self._push_volume(float(bar["volume"]))
+
+        if window_start < 0 or window_start % self.step_size_minutes != 0:
+            return None
+
+        while self._opens[0][0] < window_start:
+            self._opens.popleft()
+        return {
+            "timestamp": timestamp,
+            "open": self._opens[0][1],
+            "high": self._highs[0][1],
+            "low": self._lows[0][1],
+            "close": self._last_close,
+            "volume": self._volume_sum(),
+        }
+
+    def update_many(
+        self, bars: pd.DataFrame | Iterable[Mapping[str, Any]]
+    ) -> pd.DataFrame:
+        """Add a batch of bars, and return the candles they complete.
+
+        Args:
+            bars (pd.DataFrame | Iterable[Mapping[str, Any]]): The bars, in order.
+
+        Returns:
+            pd.DataFrame: The completed candles, with a datetime index. If `bars` is a
+                DataFrame, the candle columns keep its data types.
+
+        """
+        records = (
+            bars.to_dict("records", into=dict)
+            if isinstance(bars, pd.DataFrame)
+            else bars
+        )
+        candles = [candle for bar in records if (candle := self.update(bar))]
+
+        df_candles = pd.DataFrame(candles, columns=DEFAULT_COLUMNS)
+        if isinstance(bars, pd.DataFrame):
+            df_candles = df_candles.astype(bars.dtypes[DEFAULT_COLUMNS].to_dict())
+        df_candles.index = pd.to_datetime(df_candles["timestamp"], unit="s")
+        df_candles.index.name = "datetime"
+        return df_candles
+
+    def get_state(self) -> dict[str, Any]:
+        """Get the aggregator state as a JSON-serializable dict."""
+        return {
+            "version": STATE_VERSION,
+            "timeframe_minutes": self.timeframe_minutes,
+            "step_size_minutes": self.step_size_minutes,
+            "bars_seen": self._bars_seen,
+            "last_timestamp": self._last_timestamp,
+            "last_close": self._last_close,
+            "opens": [list(item) for item in self._opens],
+            "highs": [list(item) for item in self._highs],
+            "lows": [list(item) for item in self._lows],
+            "volume_front": list(self._volume_front),
+            "volume_back": list(self._volume_back),
+            "volume_back_sum": self._volume_back_sum,
+        }
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> "StreamingOHLCAggregator":
+        """Restore an aggregator from a state returned by `get_state`."""
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(
+                f"Unsupported aggregator state version: {state.get('version')}"
+            )
+
+        aggregator = cls(state["timeframe_minutes"], state["step_size_minutes"])
+        aggregator._bars_seen = state["bars_seen"]
+        aggregator._last_timestamp = state["last_timestamp"]
+        aggregator._last_close = state["last_close"]
+        aggregator._opens = deque((int(i), float(v)) for i, v in state["opens"])
+        aggregator._highs = deque((int(i), float(v)) for i, v in state["highs"])
+        aggregator._lows = deque((int(i), float(v)) for i, v in state["lows"])
+        aggregator._volume_front = list(state["volume_front"])
+        aggregator._volume_back = list(state["volume_back"])
+        aggregator._volume_back_sum = state["volume_back_sum"]
+        return aggregator
+
+    @staticmethod
+    def _push_extreme(
+        extremes: deque[tuple[int, float]],
+        index: int,
+        value: float,
+        window_start: int,
+        better: Any,
+    ):
+        """Push a value onto a monotonic deque, and evict values outside the window.
+
+        Values that can no longer be the window's extreme (`better` is `max` or `min`)
+        are popped from the back, so the front always holds the current extreme.
+        """
+        while extremes and better(extremes[-1][1], value) == value:
+            extremes.pop()
+        extremes.append((index, value))
+        while extremes[0][0] < window_start:
+            extremes.popleft()
+
+    def _push_volume(self, volume: float):
+        """Push a volume onto the two-stack sliding sum, evicting the oldest if full."""
+        self._volume_back.append(volume)
+        self._volume_back_sum += volume
+        if len(self._volume_front) + len(self._volume_back) <= self.timeframe_minutes:
+            return
+
+        if not self._volume_front:
+            # Move the back stack to the front as suffix sums, oldest bar last
+            suffix_sum = 0.0
+            for back_volume in reversed(self._volume_back):
+                suffix_sum += back_volume
+                self._volume_front.append(suffix_sum)
+            self._volume_back.clear()
+            self._volume_back_sum = 0.0
+        self._volume_front.pop()
+
+    def _volume_sum(self) -> float:
+        """Get the volume sum of the current window."""
+        front_sum = self._volume_front[-1] if self._volume_front else 0.0
+        return front_sum + self._volume_back_sum
@@ -150,6 +150,37 @@ def validate_timeframe(time_step: int, user_timeframe: int, logger: Logger):
         )
 
 
+def parse_timeframe_to_seconds(timeframe: int | str, logger: Logger) -> int:
+    """Parse a timeframe, given in minutes or as a string, to seconds."""
+    if isinstance(timeframe, str):
+        return parse_timeframe(timeframe, to_minutes=False)
+    elif isinstance(timeframe, int):
+        return timeframe * MINUTE_SECONDS
+    else:
+        logger.error("Invalid timeframe provided: {}", timeframe)
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+
+
+def rows_per_interval(seconds: int, time_step_seconds: int, name: str) -> int:
+    """Get the number of data rows in an interval, which must be a whole number.
+
+    Arguments:
+        seconds (int): Length of the interval, in seconds.
+        time_step_seconds (int): Time step of the data, in seconds.
+        name (str): Name of the interval, for the error message (e.g. "Timeframe").
+
+    Returns:
+        int: The number of rows.
+
+    """
+    if seconds < time_step_seconds or seconds % time_step_seconds != 0:
+        raise ValueError(
+            f"{name} ({seconds}s) must be a multiple of the time step of the data "
+            f"({time_step_seconds}s)."
+        )
+    return seconds // time_step_seconds
+
+
 def _parse_time_input(time_input: int | str, time_type: str) -> int | str:
     """Parse seconds or minutes inputs to int, or return string if already formatted."""
     if isinstance(time_input, str):
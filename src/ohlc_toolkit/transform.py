@@ -1,17 +1,53 @@
 """Transform OHLC data."""
 
+import math
 import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
 from loguru._logger import Logger
 
+from ohlc_toolkit.aggregation import (
+    aggregate_ohlc_columns,
+    combine_max,
+    combine_min,
+    combine_sum,
+    group_first,
+    group_last,
+    group_max,
+    group_min,
+    group_starts,
+    group_sum,
+    num_strided_windows,
+)
+from ohlc_toolkit.config import DEFAULT_COLUMNS
 from ohlc_toolkit.config.logging import get_logger
-from ohlc_toolkit.exceptions import DatasetEmptyError
-from ohlc_toolkit.timeframes import parse_timeframe, validate_timeframe
+from ohlc_toolkit.gaps import fill_gaps
+from ohlc_toolkit.profiling import NULL_STATS, PipelineStats, StageRecorder
+from ohlc_toolkit.timeframes import (
+    parse_timeframe_to_seconds,
+    rows_per_interval,
+    validate_timeframe,
+)
 from ohlc_toolkit.utils import check_data_integrity
 
 LOGGER = get_logger(__name__)
 
+# Largest number of smaller windows combined to derive a larger timeframe in
+# `transform_ohlc_many`. Beyond this, aggregating from the input directly is cheaper.
+MAX_DERIVATION_FACTOR = 8
+
+WEEK_SECONDS = 7 * 24 * 60 * 60
+# 1970-01-05 00:00 UTC, the first Monday after the UNIX epoch (a Thursday)
+MONDAY_ANCHOR = 4 * 24 * 60 * 60
+PARTIAL_BAR_POLICIES = ("keep", "drop")
+VALIDATION_LEVELS = ("full", "cheap", "none")
+
+# Smallest number of windows per segment worth handing to a worker thread
+PARALLEL_MIN_SEGMENT_WINDOWS = 100_000
+
 
 def _first(row: pd.Series) -> float:
     """Get the first value of a row, for rolling_ohlc aggregation."""
@@ -23,12 +59,19 @@ def _last(row: pd.Series) -> float:
     return row.iloc[-1]
 
 
-def rolling_ohlc(df_input: pd.DataFrame, timeframe_minutes: int) -> pd.DataFrame:
+def rolling_ohlc(
+    df_input: pd.DataFrame, timeframe_minutes: int, engine: str = "numpy"
+) -> pd.DataFrame:
     """Apply rolling OHLC aggregation.
 
     Args:
         df_input (pd.DataFrame): The input DataFrame with OHLC data.
         timeframe_minutes (int): The timeframe in minutes for the rolling window.
+        engine (str): The aggregation engine. "numpy" (default) uses the vectorized
+            sliding window kernels; "pandas" uses `DataFrame.rolling().agg()` with
+            per-window Python callables, and is kept for comparison. The engines
+            agree exactly except for the volume sums, which can differ in the last
+            bits of float64 because they are added in another order.
 
     Returns:
         pd.DataFrame: The aggregated OHLC data, with same schema as the input DataFrame.
@@ -39,16 +82,28 @@ def rolling_ohlc(df_input: pd.DataFrame, timeframe_minutes: int) -> pd.DataFrame
         timeframe_minutes,
         len(df_input),
     )
-    return df_input.rolling(timeframe_minutes).agg(
-        {
-            "timestamp": _last,
-            "open": _first,
-            "high": "max",
-            "low": "min",
-            "close": _last,
-            "volume": "sum",
-        }
-    )
+    if engine == "numpy":
+        # One row per input row, NaN until the first complete window
+        columns = {column: np.full(len(df_input), np.nan) for column in DEFAULT_COLUMNS}
+        aggregate_ohlc_columns(
+            [df_input[column].to_numpy() for column in DEFAULT_COLUMNS],
+            timeframe_minutes,
+            out=[values[timeframe_minutes - 1 :] for values in columns.values()],
+        )
+        return pd.DataFrame(columns, index=df_input.index, copy=False)
+    elif engine == "pandas":
+        return df_input.rolling(timeframe_minutes).agg(
+            {
+                "timestamp": _last,
+                "open": _first,
+                "high": "max",
+                "low": "min",
+                "close": _last,
+                "volume": "sum",
+            }
+        )
+    else:
+        raise ValueError(f"Invalid rolling engine: {engine}")
 
 
 def _cast_to_original_dtypes(
@@ -66,188 +121,607 @@ def _cast_to_original_dtypes(
     """
     LOGGER.debug("Casting transformed DataFrame to original dtypes")
     for column in transformed_df.columns:
-        if column in original_df.columns:
+        if (
+            column in original_df.columns
+            and transformed_df[column].dtype != original_df[column].dtype
+        ):
             transformed_df[column] = transformed_df[column].astype(
                 original_df[column].dtype
             )
     return transformed_df
 
 
-def _drop_expected_nans(df: pd.DataFrame, logger: Logger) -> pd.DataFrame:
-    """Drop the expected NaNs from the DataFrame.
-
-    We expect the first `timeframe_minutes - 1` rows to be NaNs from the aggregation.
-    However, we don't want to drop all NaNs in case there are unexpected ones.
-    Therefore, we drop the expected NaNs and proceed with data integrity checks.
-
-    Args:
-        df (pd.DataFrame): The DataFrame to drop NaNs from.
-        logger (Logger): The logger to use.
-
-    Returns:
-        pd.DataFrame: The DataFrame with expected NaNs dropped.
-
-    """
-    logger.debug("Dropping expected NaN values from the aggregated DataFrame")
-    n = df.first_valid_index()  # Get the index of the first valid row
-    if n is None:
-        logger.error("No valid rows after aggregation.")
-        raise DatasetEmptyError("No valid rows after aggregation.")
-
-    n_pos = df.index.get_loc(n)
-
-    result = pd.concat([df.iloc[:n_pos].dropna(), df.iloc[n_pos:]])
-    return result
-
-
-def transform_ohlc(
-    df_input: pd.DataFrame, timeframe: int | str, step_size_minutes: int = 1
+def transform_ohlc(  # noqa: PLR0913
+    df_input: pd.DataFrame,
+    timeframe: int | str,
+    step_size_minutes: int = 1,
+    gap_policy: str | None = None,
+    num_workers: int | None = 1,
+    *,
+    step_size_seconds: int | None = None,
+    time_step_seconds: int = 60,
+    validation: str = "full",
+    stats: PipelineStats | None = None,
 ) -> pd.DataFrame:
     """Transform OHLC data to a different timeframe resolution.
 
+    Windows are counted in rows of the input time step: by default the input holds
+    1-minute bars, but e.g. 1-second bars (`time_step_seconds=1`) can be
+    transformed into any timeframe and step size that is a whole number of seconds.
+
+    An input with a datetime index in order is used as is, without copying it, and
+    one out of order is sorted by its index.
+    Otherwise it is sorted by timestamp (unless it already is), and indexed by it.
+
     Args:
         df_input (pd.DataFrame): Input DataFrame with OHLC data.
         timeframe (Union[int, str]): Desired timeframe resolution, which can be
             an integer (in minutes) or a string (e.g., '1h', '4h30m').
         step_size_minutes (int): Step size in minutes for the rolling window.
+            Windows start at the first row and every step after it, for inputs of
+            any length (up to 0.4.0, long inputs kept the windows ending there).
+        gap_policy (str | None): How to handle missing minutes. By default, windows
+            are built by row count, so a window across a gap spans more time than
+            the timeframe. Otherwise the data is first reindexed onto the full
+            minute grid (see `fill_gaps`), and missing minutes are either filled
+            with flat zero-volume bars at the previous close ("ffill"), left as
+            NaN so that windows across a gap are NaN ("nan"), or left out so that
+            windows across a gap are dropped ("drop").
+        num_workers (int | None): Number of threads to aggregate with. None uses
+            all CPU cores. With several workers, long inputs are split into
+            overlapping segments that are aggregated in parallel; the result is
+            identical to aggregating on one thread.
+        step_size_seconds (int | None): Step size in seconds, for sub-minute steps.
+            Overrides `step_size_minutes` if given.
+        time_step_seconds (int): Time step of the input data, in seconds. The
+            timeframe and step size must be multiples of it.
+        validation (str): Checks of the output: "full" (default) runs
+            `check_data_integrity`, "cheap" only checks that the timestamps are
+            strictly increasing, and "none" skips checks, for inputs that are
+            already validated (e.g. by `read_ohlc_csv`).
+        stats (PipelineStats | None): If given, the wall time, rows and size of each
+            stage are recorded into it, see `profiling`.
 
     Returns:
         pd.DataFrame: Transformed OHLC data.
 
     """
-    df = df_input.copy()
+    if validation not in VALIDATION_LEVELS:
+        raise ValueError(
+            f"Invalid validation level: {validation}. "
+            f"Must be one of {', '.join(VALIDATION_LEVELS)}."
+        )
+    recorder: StageRecorder = NULL_STATS if stats is None else stats
+    if step_size_seconds is None:
+        step_size_seconds = step_size_minutes * 60
     bound_logger = LOGGER.bind(
-        body={"timeframe": timeframe, "step_size": step_size_minutes}
+        body={"timeframe": timeframe, "step_size": step_size_seconds / 60}
     )
     bound_logger.debug("Starting transformation of OHLC data")
 
-    timeframe_minutes = _parse_timeframe_to_minutes(timeframe, bound_logger)
-    time_step_seconds = step_size_minutes * 60
-
+    timeframe_seconds = parse_timeframe_to_seconds(timeframe, bound_logger)
     validate_timeframe(
-        time_step=time_step_seconds,
-        user_timeframe=timeframe_minutes * 60,
+        time_step=step_size_seconds,
+        user_timeframe=timeframe_seconds,
         logger=bound_logger,
     )
+    window_rows = rows_per_interval(timeframe_seconds, time_step_seconds, "Timeframe")
+    step_rows = rows_per_interval(step_size_seconds, time_step_seconds, "Step size")
 
-    # Apply rolling or chunk-based aggregation to transform the data
-    df_agg = _aggregate_ohlc_data(
-        df, timeframe_minutes, step_size_minutes, bound_logger
-    )
+    with recorder.stage("ensure_datetime_index", len(df_input), bound_logger) as stage:
+        df = _ensure_datetime_index(df_input, bound_logger)
+        stage.set_output(df)
+
+    if gap_policy is not None:
+        with recorder.stage("fill_gaps", len(df), bound_logger) as stage:
+            df = fill_gaps(
+                df, gap_policy, time_step_seconds=time_step_seconds, logger=bound_logger
+            )
+            stage.set_output(df)
 
-    try:
-        df_agg = _drop_expected_nans(df_agg, bound_logger)
-    except DatasetEmptyError as e:
+    if step_rows == 1 and len(df) < window_rows:
+        bound_logger.error("No valid rows after aggregation.")
         raise ValueError(
-            f"{e!s} Please ensure your dataset is big enough "
-            f"for this timeframe: {timeframe} ({timeframe_minutes} minutes)."
-        ) from e
+            "No valid rows after aggregation. Please ensure your dataset is big "
+            "enough for this timeframe: "
+            f"{timeframe} ({_describe_seconds(timeframe_seconds)})."
+        )
 
-    df_agg = _cast_to_original_dtypes(df_input, df_agg)
+    # Aggregate the windows, keeping the input data types
+    with recorder.stage("aggregate", len(df), bound_logger) as stage:
+        df_agg = _aggregate_ohlc_data(
+            df, window_rows, step_rows, bound_logger, num_workers
+        )
+        stage.set_output(df_agg)
 
-    _ensure_datetime_index(df_input, df, bound_logger)
+    if gap_policy == "drop":
+        with recorder.stage("drop_gap_windows", len(df_agg), bound_logger) as stage:
+            df_agg = _drop_gap_windows(df_agg, timeframe_seconds, bound_logger)
+            stage.set_output(df_agg)
 
-    check_data_integrity(
-        df_agg, logger=bound_logger, time_step_seconds=time_step_seconds
-    )
+    if validation == "full":
+        with recorder.stage("check_data_integrity", len(df_agg), bound_logger) as stage:
+            check_data_integrity(
+                df_agg, logger=bound_logger, time_step_seconds=step_size_seconds
+            )
+            stage.set_output(df_agg)
+    elif validation == "cheap":
+        with recorder.stage("check_timestamps", len(df_agg), bound_logger) as stage:
+            _check_timestamps_increasing(df_agg, bound_logger)
+            stage.set_output(df_agg)
 
     return df_agg
 
 
-def _parse_timeframe_to_minutes(timeframe: int | str, logger: Logger) -> int:
-    """Parse the timeframe to minutes."""
-    if isinstance(timeframe, str):
-        timeframe_seconds = parse_timeframe(timeframe, to_minutes=False)
-        logger.debug("Parsed timeframe string to seconds: {}", timeframe_seconds)
-        if timeframe_seconds % 60 != 0:
-            logger.error("Second-level timeframes are not yet supported.")
-            raise NotImplementedError("Second-level timeframes are not yet supported.")
-        return timeframe_seconds // 60
-    elif isinstance(timeframe, int):
-        return timeframe
-    else:
-        logger.error("Invalid timeframe provided: {}", timeframe)
-        raise ValueError(f"Invalid timeframe: {timeframe}")
+def _check_timestamps_increasing(df: pd.DataFrame, logger: Logger):
+    """Warn if the timestamps are not strictly increasing, in a single pass."""
+    if (np.diff(df["timestamp"].to_numpy()) <= 0).any():
+        logger.warning("Timestamps are not strictly increasing.")
+
+
+def _describe_seconds(seconds: int) -> str:
+    """Describe a duration in minutes, or in seconds if it is not whole minutes."""
+    if seconds % 60 == 0:
+        return f"{seconds // 60} minutes"
+    return f"{seconds} seconds"
+
+
+def _drop_gap_windows(
+    df_agg: pd.DataFrame, timeframe_seconds: int, logger: Logger
+) -> pd.DataFrame:
+    """Drop the windows that cover missing minutes, which aggregate to NaN."""
+    value_columns = [column for column in df_agg.columns if column != "timestamp"]
+    df_agg = df_agg.dropna(subset=value_columns)
+    if df_agg.empty:
+        logger.error("Every window covers missing minutes.")
+        raise ValueError(
+            "Every window covers missing minutes. Please ensure your dataset has "
+            f"gap-free spans of at least {_describe_seconds(timeframe_seconds)}, "
+            "or use another gap policy."
+        )
+    return df_agg
 
 
 def _aggregate_ohlc_data(
-    df: pd.DataFrame, timeframe_minutes: int, step_size_minutes: int, logger: Logger
+    df: pd.DataFrame,
+    timeframe_minutes: int,
+    step_size_minutes: int,
+    logger: Logger,
+    num_workers: int | None = 1,
 ) -> pd.DataFrame:
-    """Aggregate OHLC data using either rolling or chunk-based aggregation."""
-    chunk_cut_off = int(os.getenv("CHUNK_CUT_OFF", "18000"))
+    """Aggregate the windows that start every `step_size_minutes` rows.
+
+    Windows are aligned to the first row of the DataFrame, and each aggregated row is
+    indexed by the last row of its window. The results are written straight into
+    arrays of the input data types, so no casting pass is needed afterwards.
+    """
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    if num_workers < 1:
+        raise ValueError(f"Invalid number of workers: {num_workers}")
+
     num_rows = len(df)
-    num_chunks = num_rows // step_size_minutes
+    num_windows = num_strided_windows(num_rows, timeframe_minutes, step_size_minutes)
+    if num_windows == 0:
+        logger.error(
+            "Selected timeframe is too large. {} rows are not enough for "
+            "this timeframe: {} ({} minutes).",
+            num_rows,
+            timeframe_minutes,
+            timeframe_minutes,
+        )
+        raise ValueError(
+            "Timeframe too large. Please ensure your dataset is big enough "
+            f"for this timeframe: {timeframe_minutes} minutes."
+        )
 
-    if step_size_minutes == 1 or num_chunks > chunk_cut_off:
-        # Use rolling aggregation for small step sizes or large datasets
-        logger.debug(
-            "Using rolling aggregation for step size: {}. "
-            "The number of rows would yield {} chunks",
-            step_size_minutes,
-            num_chunks,
+    columns = [df[column].to_numpy() for column in DEFAULT_COLUMNS]
+    out = [np.empty(num_windows, dtype=values.dtype) for values in columns]
+    num_segments = min(num_workers, num_windows // PARALLEL_MIN_SEGMENT_WINDOWS)
+    if num_segments > 1:
+        _parallel_aggregation(
+            columns, out, timeframe_minutes, step_size_minutes, num_segments, logger
         )
-        df_agg = rolling_ohlc(df, timeframe_minutes)
-        df_agg = df_agg.iloc[::step_size_minutes]
     else:
-        # Use chunk-based aggregation when data step is large relative to num rows
         logger.info(
-            "Performing chunk-based aggregation over {} rows "
-            "with a step size of {} minutes ({} chunks).",
-            num_rows,
+            "Aggregating {} windows of {} rows with a step size of {} minutes.",
+            num_windows,
+            timeframe_minutes,
+            step_size_minutes,
+        )
+        aggregate_ohlc_columns(columns, timeframe_minutes, step_size_minutes, out=out)
+
+    window_ends = np.arange(num_windows) * step_size_minutes + timeframe_minutes - 1
+    return pd.DataFrame(
+        dict(zip(DEFAULT_COLUMNS, out, strict=True)),
+        index=df.index[window_ends],
+        copy=False,
+    )
+
+
+def _parallel_aggregation(  # noqa: PLR0913
+    columns: list[np.ndarray],
+    out: list[np.ndarray],
+    timeframe_minutes: int,
+    step_size_minutes: int,
+    num_segments: int,
+    logger: Logger,
+):
+    """Aggregate segments of the windows in parallel threads, into `out`.
+
+    Each segment covers a range of windows, and reads the input rows of those
+    windows: its own rows plus a halo of up to `timeframe_minutes - 1` rows shared
+    with the next segment. The NumPy kernels release the GIL, and each thread works
+    on views of the input columns and writes into its own slice of the output
+    arrays, so the threads neither copy nor pickle any data.
+
+    Segments start at a multiple of `timeframe_minutes` rows, so that the blocks of
+    the window kernels line up with those of a serial run, and every window is
+    reduced in the same order (keeping even floating-point sums bit-identical).
+    """
+    num_windows = len(out[0])
+    # Windows per alignment unit: segments start at window j with j * step % tf == 0
+    unit = timeframe_minutes // math.gcd(timeframe_minutes, step_size_minutes)
+    bounds = np.linspace(0, num_windows, num_segments + 1).astype(np.int64)
+    bounds = np.unique(np.append(bounds[:-1] // unit * unit, num_windows))
+    logger.info(
+        "Aggregating {} windows in {} parallel segments.", num_windows, len(bounds) - 1
+    )
+
+    def aggregate_segment(first_window: int, end_window: int):
+        rows = slice(
+            first_window * step_size_minutes,
+            (end_window - 1) * step_size_minutes + timeframe_minutes,
+        )
+        aggregate_ohlc_columns(
+            [values[rows] for values in columns],
+            timeframe_minutes,
             step_size_minutes,
-            num_chunks,
+            out=[values[first_window:end_window] for values in out],
         )
-        df_agg = _chunk_based_aggregation(
-            df, timeframe_minutes, step_size_minutes, logger
+
+    with ThreadPoolExecutor(max_workers=len(bounds) - 1) as executor:
+        # Consume the results to re-raise any exception from the workers
+        list(executor.map(aggregate_segment, bounds[:-1], bounds[1:]))
+
+
+def _strided_columns(
+    df: pd.DataFrame, window_rows: int, step_rows: int
+) -> dict[str, np.ndarray]:
+    """Aggregate each OHLC column over the windows that start every step."""
+    return dict(
+        zip(
+            DEFAULT_COLUMNS,
+            aggregate_ohlc_columns(
+                [df[column].to_numpy() for column in DEFAULT_COLUMNS],
+                window_rows,
+                step_rows,
+            ),
+            strict=True,
         )
+    )
 
-    return df_agg
 
+def _derive_columns(
+    base: dict[str, np.ndarray], count: int, spacing: int, num_windows: int
+) -> dict[str, np.ndarray]:
+    """Derive the OHLC columns of larger windows from `count` smaller windows."""
+    last = (count - 1) * spacing
+    args = (count, spacing, num_windows)
+    return {
+        "timestamp": base["timestamp"][last : last + num_windows],
+        "open": base["open"][:num_windows],
+        "high": combine_max(base["high"], *args),
+        "low": combine_min(base["low"], *args),
+        "close": base["close"][last : last + num_windows],
+        "volume": combine_sum(base["volume"], *args),
+    }
+
+
+def transform_ohlc_many(
+    df_input: pd.DataFrame,
+    timeframes: list[int | str],
+    step_size_minutes: int = 1,
+    *,
+    step_size_seconds: int | None = None,
+    time_step_seconds: int = 60,
+) -> dict[int | str, pd.DataFrame]:
+    """Transform OHLC data to several timeframe resolutions at once.
+
+    The input is validated and converted once, and larger timeframes are derived from
+    already computed smaller ones where the timeframes divide evenly (e.g. 1h from
+    15m windows). Windows start every step from the first row, so the windows are
+    the same as those of `transform_ohlc` with the same step size.
+
+    Args:
+        df_input (pd.DataFrame): Input DataFrame with OHLC data.
+        timeframes (list[int | str]): Desired timeframe resolutions, each either an
+            integer (in minutes) or a string (e.g., '1h', '4h30m', '90s').
+        step_size_minutes (int): Step size in minutes between consecutive windows.
+        step_size_seconds (int | None): Step size in seconds, for sub-minute steps.
+            Overrides `step_size_minutes` if given.
+        time_step_seconds (int): Time step of the input data, in seconds. The
+            timeframes and step size must be multiples of it.
+
+    Returns:
+        dict[int | str, pd.DataFrame]: Transformed OHLC data for each timeframe,
+            keyed by the timeframe as given.
+
+    """
+    if step_size_seconds is None:
+        step_size_seconds = step_size_minutes * 60
+    bound_logger = LOGGER.bind(
+        body={"timeframes": timeframes, "step_size": step_size_seconds / 60}
+    )
+    bound_logger.debug("Starting batch transformation of OHLC data")
+
+    step_rows = rows_per_interval(step_size_seconds, time_step_seconds, "Step size")
+    timeframe_rows = {}
+    for timeframe in timeframes:
+        timeframe_seconds = parse_timeframe_to_seconds(timeframe, bound_logger)
+        validate_timeframe(
+            time_step=step_size_seconds,
+            user_timeframe=timeframe_seconds,
+            logger=bound_logger,
+        )
+        timeframe_rows[timeframe] = rows_per_interval(
+            timeframe_seconds, time_step_seconds, "Timeframe"
+        )
+
+    df = _ensure_datetime_index(df_input, bound_logger)
+
+    check_data_integrity(df, logger=bound_logger, time_step_seconds=time_step_seconds)
 
-def _chunk_based_aggregation(
-    df: pd.DataFrame, timeframe_minutes: int, step_size_minutes: int, logger: Logger
-) -> pd.DataFrame:
-    """Perform chunk-based aggregation on the DataFrame."""
-    aggregated_data: list[dict[str, float]] = []
     num_rows = len(df)
+    computed: dict[int, dict[str, np.ndarray]] = {}
+    for window_rows in sorted(set(timeframe_rows.values())):
+        num_windows = num_strided_windows(num_rows, window_rows, step_rows)
+        if num_windows == 0:
+            raise ValueError(
+                "Timeframe too large. Please ensure your dataset is big enough "
+                "for this timeframe: "
+                f"{_describe_seconds(window_rows * time_step_seconds)}."
+            )
+
+        base_rows = _find_derivation_base(window_rows, step_rows, computed)
+        if base_rows is None:
+            computed[window_rows] = _strided_columns(df, window_rows, step_rows)
+        else:
+            bound_logger.debug(
+                "Deriving {}-row windows from {}-row windows", window_rows, base_rows
+            )
+            computed[window_rows] = _derive_columns(
+                computed[base_rows],
+                count=window_rows // base_rows,
+                spacing=base_rows // step_rows,
+                num_windows=num_windows,
+            )
+
+    results = {}
+    for timeframe, window_rows in timeframe_rows.items():
+        columns = computed[window_rows]
+        window_ends = np.arange(len(columns["timestamp"])) * step_rows + window_rows - 1
+        df_agg = pd.DataFrame(columns, index=df.index[window_ends])
+        results[timeframe] = _cast_to_original_dtypes(df_input, df_agg)
 
-    for start in range(0, num_rows, step_size_minutes):
-        end = start + timeframe_minutes
-        if end > num_rows:
-            if not aggregated_data:
-                logger.error(
-                    "Selected timeframe is too large. {} rows are not enough for "
-                    "this timeframe: {} ({} minutes).",
-                    num_rows,
-                    timeframe_minutes,
-                    timeframe_minutes,
-                )
-                raise ValueError(
-                    "Timeframe too large. Please ensure your dataset is big enough "
-                    f"for this timeframe: {timeframe_minutes} minutes."
-                )
-            break
-
-        window_df = df.iloc[start:end]
-        aggregated_row = {
-            "timestamp": window_df["timestamp"].iloc[-1],
-            "open": window_df["open"].iloc[0],
-            "high": window_df["high"].max(),
-            "low": window_df["low"].min(),
-            "close": window_df["close"].iloc[-1],
-            "volume": window_df["volume"].sum(),
+    return results
+
+
+def transform_ohlc_chunks(
+    chunks: Iterable[pd.DataFrame],
+    timeframe: int | str,
+    step_size_minutes: int = 1,
+    *,
+    step_size_seconds: int | None = None,
+    time_step_seconds: int = 60,
+) -> Iterator[pd.DataFrame]:
+    """Transform chunked OHLC data, e.g. from `iter_ohlc_csv`, with bounded memory.
+
+    Yields the same windows as `transform_ohlc` over the concatenated chunks. Only
+    the rows of incomplete windows are carried over between chunks, so memory use is
+    bounded by the chunk size plus one window.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Consecutive chunks of OHLC data, in order.
+        timeframe (Union[int, str]): Desired timeframe resolution, which can be
+            an integer (in minutes) or a string (e.g., '1h', '4h30m', '90s').
+        step_size_minutes (int): Step size in minutes for the rolling window.
+        step_size_seconds (int | None): Step size in seconds, for sub-minute steps.
+            Overrides `step_size_minutes` if given.
+        time_step_seconds (int): Time step of the input data, in seconds. The
+            timeframe and step size must be multiples of it.
+
+    Yields:
+        pd.DataFrame: Transformed OHLC data for the windows completed by each chunk.
+
+    """
+    if step_size_seconds is None:
+        step_size_seconds = step_size_minutes * 60
+    bound_logger = LOGGER.bind(
+        body={"timeframe": timeframe, "step_size": step_size_seconds / 60}
+    )
+    timeframe_seconds = parse_timeframe_to_seconds(timeframe, bound_logger)
+    validate_timeframe(
+        time_step=step_size_seconds,
+        user_timeframe=timeframe_seconds,
+        logger=bound_logger,
+    )
+    window_rows = rows_per_interval(timeframe_seconds, time_step_seconds, "Timeframe")
+    step_rows = rows_per_interval(step_size_seconds, time_step_seconds, "Step size")
+
+    carry = None
+    num_windows_total = 0
+    for chunk in chunks:
+        df = chunk if carry is None else pd.concat([carry, chunk])
+        num_windows = num_strided_windows(len(df), window_rows, step_rows)
+        # Rows from the next window start onwards are still needed by later windows
+        carry = df.iloc[num_windows * step_rows :]
+        if num_windows == 0:
+            continue
+
+        num_windows_total += num_windows
+        yield _aggregate_ohlc_data(df, window_rows, step_rows, bound_logger)
+
+    if num_windows_total == 0:
+        raise ValueError(
+            "Timeframe too large. Please ensure your dataset is big enough "
+            f"for this timeframe: {timeframe} ({_describe_seconds(timeframe_seconds)})."
+        )
+
+
+def resample_ohlc(  # noqa: PLR0913
+    df_input: pd.DataFrame,
+    timeframe: int | str,
+    *,
+    offset: int | str = 0,
+    anchor: int | None = None,
+    partial: str = "keep",
+    time_step_seconds: int = 60,
+) -> pd.DataFrame:
+    """Resample OHLC data into calendar-aligned bars, like exchange candles.
+
+    Unlike `transform_ohlc`, whose trailing windows are counted in rows, each bar
+    covers a fixed time bucket `[start, start + timeframe)`, with bucket boundaries
+    at `anchor + offset + k * timeframe`. By default, bars are aligned to the UNIX
+    epoch, so hourly bars start on the hour and daily bars at UTC midnight, and bars
+    that are a whole number of weeks start on Monday 00:00 UTC. Each input row is
+    touched once, by a single group reduction over the buckets.
+
+    Buckets without any rows yield no bar. The first and last bars are partial if
+    the data starts after the first bucket opens or ends before the last bucket
+    closes.
+
+    Args:
+        df_input (pd.DataFrame): Input DataFrame with OHLC data.
+        timeframe (int | str): Bar size, either an integer (in minutes) or a string
+            (e.g., '1h', '1d', '1w').
+        offset (int | str): Shift of the bar boundaries from the anchor, either an
+            integer (in minutes) or a string (e.g., '30m').
+        anchor (int | None): UNIX timestamp of a bar boundary. Defaults to the epoch,
+            or to Monday 1970-01-05 for bars that are a whole number of weeks.
+        partial (str): Whether to "keep" (default) or "drop" partial first and last
+            bars.
+        time_step_seconds (int): Time step of the input data, in seconds, used to
+            tell whether the last bar is complete.
+
+    Returns:
+        pd.DataFrame: The bars, with the same schema as the input DataFrame. The
+            timestamp column and the datetime index hold the start of each bar.
+
+    """
+    bound_logger = LOGGER.bind(
+        body={"timeframe": timeframe, "offset": offset, "partial": partial}
+    )
+    bound_logger.debug("Starting calendar-aligned resampling of OHLC data")
+    if partial not in PARTIAL_BAR_POLICIES:
+        raise ValueError(
+            f"Invalid partial bar policy: {partial}. "
+            f"Must be one of {', '.join(PARTIAL_BAR_POLICIES)}."
+        )
+
+    bar_seconds = parse_timeframe_to_seconds(timeframe, bound_logger)
+    offset_seconds = parse_timeframe_to_seconds(offset, bound_logger) if offset else 0
+    validate_timeframe(
+        time_step=time_step_seconds, user_timeframe=bar_seconds, logger=bound_logger
+    )
+    if anchor is None:
+        anchor = MONDAY_ANCHOR if bar_seconds % WEEK_SECONDS == 0 else 0
+
+    df = df_input
+    timestamps = df["timestamp"].to_numpy(dtype=np.int64)
+    if (np.diff(timestamps) < 0).any():
+        bound_logger.debug("Sorting data by timestamp before resampling")
+        df = df.sort_values("timestamp", kind="stable")
+        timestamps = df["timestamp"].to_numpy(dtype=np.int64)
+    if len(timestamps) == 0:
+        raise ValueError("Cannot resample an empty dataset.")
+
+    origin = anchor + offset_seconds
+    buckets = (timestamps - origin) // bar_seconds
+    starts = group_starts(buckets)
+    df_bars = pd.DataFrame(
+        {
+            "timestamp": buckets[starts] * bar_seconds + origin,
+            "open": group_first(df["open"].to_numpy(), starts),
+            "high": group_max(df["high"].to_numpy(), starts),
+            "low": group_min(df["low"].to_numpy(), starts),
+            "close": group_last(df["close"].to_numpy(), starts),
+            "volume": group_sum(df["volume"].to_numpy(), starts),
         }
-        aggregated_data.append(aggregated_row)
+    )
+
+    first_partial = timestamps[0] > df_bars["timestamp"].iloc[0]
+    last_partial = (
+        timestamps[-1] < df_bars["timestamp"].iloc[-1] + bar_seconds - time_step_seconds
+    )
+    if first_partial or last_partial:
+        bound_logger.info(
+            "Partial bars: first={}, last={}. Policy: {}.",
+            first_partial,
+            last_partial,
+            partial,
+        )
+    if partial == "drop":
+        df_bars = df_bars.iloc[int(first_partial) : len(df_bars) - int(last_partial)]
+        if df_bars.empty:
+            raise ValueError(
+                "No complete bars. Please ensure your dataset covers at least one "
+                f"full bar of {bar_seconds} seconds."
+            )
+
+    bound_logger.info(
+        "Resampled {} rows into {} bars of {} seconds.",
+        len(timestamps),
+        len(df_bars),
+        bar_seconds,
+    )
+    df_bars.index = pd.to_datetime(df_bars["timestamp"], unit="s")
+    df_bars.index.name = "datetime"
+    return _cast_to_original_dtypes(df_input, df_bars)
 
-    df_agg = pd.DataFrame(aggregated_data)
-    return df_agg.sort_values("timestamp")
 
+def _find_derivation_base(
+    window_rows: int,
+    step_rows: int,
+    computed: dict[int, dict[str, np.ndarray]],
+) -> int | None:
+    """Find the largest computed timeframe that a timeframe can be derived from.
 
-def _ensure_datetime_index(df_input: pd.DataFrame, df: pd.DataFrame, logger: Logger):
-    """Ensure the DataFrame index is a datetime index."""
-    if not pd.api.types.is_datetime64_any_dtype(df_input.index):
+    A base timeframe qualifies when it divides the timeframe evenly, is itself a
+    multiple of the step size (so that its windows line up with the larger windows),
+    and needs no more than `MAX_DERIVATION_FACTOR` windows per larger window.
+    """
+    candidates = [
+        base
+        for base in computed
+        if base < window_rows
+        and window_rows % base == 0
+        and base % step_rows == 0
+        and window_rows // base <= MAX_DERIVATION_FACTOR
+    ]
+    return max(candidates, default=None)
+
+
+def _ensure_datetime_index(df_input: pd.DataFrame, logger: Logger) -> pd.DataFrame:
+    """Get the DataFrame with a datetime index, sorted by timestamp.
+
+    A DataFrame that already has a datetime index is returned as is if the index is
+    in order, and sorted by it otherwise. Otherwise, it is only sorted by timestamp
+    if its timestamps are not already in order.
+    """
+    if pd.api.types.is_datetime64_any_dtype(df_input.index):
+        if df_input.index.is_monotonic_increasing:
+            return df_input
+        logger.debug("Datetime index is not in order, sorting by it")
+        return df_input.sort_index(kind="stable")
+
+    if (np.diff(df_input["timestamp"].to_numpy()) < 0).any():
         logger.debug("DataFrame index is not a datetime index, sorting by timestamp")
-        df.sort_values("timestamp", inplace=True)
-        df.index = pd.to_datetime(df["timestamp"], unit="s")
-        df.index.name = "datetime"
-        logger.debug("Converted timestamp column to datetime index")
+        df = df_input.sort_values("timestamp", kind="stable")
+    else:
+        df = df_input.copy(deep=False)
+    # Converting through NumPy datetimes is much faster than `pd.to_datetime`
+    seconds = df["timestamp"].to_numpy(dtype=np.int64).astype("datetime64[s]")
+    df.index = pd.DatetimeIndex(seconds.astype("datetime64[ns]"), name="datetime")
+    logger.debug("Converted timestamp column to datetime index")
+    return df
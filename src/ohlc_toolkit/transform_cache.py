@@ -0,0 +1,317 @@
+"""Memoization of `transform_ohlc` results.
+
+`TransformCache` keeps recent results in memory, in a least-recently-used cache
+bounded by size in bytes, and optionally on disk. Results are keyed by the
+transform parameters and a cheap fingerprint of the input: its shape, column
+names and types, first and last timestamps, and a hash of a fixed number of
+evenly spaced sample rows. Hashing samples instead of every row keeps lookups fast
+on long histories. The trade-off is that an in-place edit of rows that are not
+sampled is not detected, so inputs should be treated as immutable (or the cache
+cleared) once they have been transformed through the cache.
+
+When the input is a cached input with new rows appended (its first rows have the
+fingerprint of a cached input), only the windows that were not complete before
+are computed, and appended to the cached result.
+
+Results stored on disk are pickled, and loading a pickle can execute arbitrary
+code, so the cache directory must only be writable by trusted users.
+"""
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from ohlc_toolkit.aggregation import num_strided_windows
+from ohlc_toolkit.config.logging import get_logger
+from ohlc_toolkit.profiling import PipelineStats
+from ohlc_toolkit.timeframes import parse_timeframe_to_seconds
+from ohlc_toolkit.transform import transform_ohlc
+
+LOGGER = get_logger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MiB
+FINGERPRINT_SAMPLES = 1024
+
+
+def fingerprint(df: pd.DataFrame, num_samples: int = FINGERPRINT_SAMPLES) -> str:
+    """Compute a cheap fingerprint of a DataFrame, from its shape and sample rows.
+
+    Args:
+        df (pd.DataFrame): The DataFrame.
+        num_samples (int): Number of evenly spaced rows to hash, always including
+            the first and last rows.
+
+    Returns:
+        str: The fingerprint, as a hex digest.
+
+    """
+    num_rows = len(df)
+    rows = np.unique(
+        np.linspace(0, num_rows - 1, min(num_samples, num_rows), dtype=int)
+    )
+    timestamps = df["timestamp"].to_numpy()
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(
+        orjson.dumps(
+            [
+                df.shape,
+                [str(column) for column in df.columns],
+                [str(dtype) for dtype in df.dtypes],
+                [int(timestamps[0]), int(timestamps[-1])] if num_rows else [],
+            ]
+        )
+    )
+    digest.update(pd.util.hash_pandas_object(df.iloc[rows]).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class _Entry:
+    """A cached result, with what is needed to extend it when rows are appended."""
+
+    result: pd.DataFrame
+    parameters: tuple
+    num_rows: int
+    first_timestamp: int | None
+    input_fingerprint: str
+    num_bytes: int
+
+
+class TransformCache:
+    """Cache of `transform_ohlc` results, in memory and optionally on disk."""
+
+    def __init__(
+        self, max_bytes: int = DEFAULT_MAX_BYTES, cache_dir: str | None = None
+    ):
+        """Initialize the transform cache.
+
+        Args:
+            max_bytes: Maximum total size of the results kept in memory. The least
+                recently used results are evicted first.
+            cache_dir: Directory to also store results in, so that they outlive the
+                process. By default, results are only kept in memory. Results are
+                stored as pickles, so the directory must be trusted: anyone who can
+                write to it can run code in processes that read the cache.
+
+        """
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir.rstrip("/") if cache_dir else None
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.num_bytes = 0
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Get the number of results kept in memory."""
+        return len(self._entries)
+
+    def transform_ohlc(  # noqa: PLR0913
+        self,
+        df_input: pd.DataFrame,
+        timeframe: int | str,
+        step_size_minutes: int = 1,
+        gap_policy: str | None = None,
+        num_workers: int | None = 1,
+        *,
+        step_size_seconds: int | None = None,
+        time_step_seconds: int = 60,
+        validation: str = "full",
+        stats: PipelineStats | None = None,
+    ) -> pd.DataFrame:
+        """Transform OHLC data like `transform_ohlc`, reusing cached results.
+
+        Args:
+            df_input (pd.DataFrame): Input DataFrame with OHLC data.
+            timeframe (Union[int, str]): Desired timeframe resolution, which can be
+                an integer (in minutes) or a string (e.g., '1h', '4h30m').
+            step_size_minutes (int): Step size in minutes for the rolling window.
+            gap_policy (str | None): How to handle missing minutes, see
+                `transform_ohlc`.
+            num_workers (int | None): Number of threads to aggregate with.
+            step_size_seconds (int | None): Step size in seconds, for sub-minute
+                steps. Overrides `step_size_minutes` if given.
+            time_step_seconds (int): Time step of the input data, in seconds.
+            validation (str): Checks of the computed output, see `transform_ohlc`.
+                Cached results were checked when they were computed.
+            stats (PipelineStats | None): If given, the stages of the computed
+                windows are recorded into it, see `profiling`.
+
+        Returns:
+            pd.DataFrame: Transformed OHLC data. It is a copy, so it can be modified
+                without affecting the cache.
+
+        """
+        if step_size_seconds is None:
+            step_size_seconds = step_size_minutes * 60
+        bound_logger = LOGGER.bind(
+            body={"timeframe": timeframe, "step_size": step_size_seconds / 60}
+        )
+        timeframe_seconds = parse_timeframe_to_seconds(timeframe, bound_logger)
+        parameters = (
+            timeframe_seconds,
+            step_size_seconds,
+            time_step_seconds,
+            gap_policy,
+        )
+        input_fingerprint = fingerprint(df_input)
+        key = self._key(input_fingerprint, parameters)
+
+        entry = self._get(key)
+        if entry is not None:
+            self.hits += 1
+            bound_logger.debug("Transform cache hit")
+            return entry.result.copy()
+
+        result = None
+        if gap_policy is None:
+            result = self._extend(
+                df_input, parameters, num_workers, validation=validation, stats=stats
+            )
+        if result is not None:
+            self.partial_hits += 1
+        else:
+            self.misses += 1
+            bound_logger.debug("Transform cache miss")
+            result = transform_ohlc(
+                df_input,
+                timeframe,
+                gap_policy=gap_policy,
+                num_workers=num_workers,
+                step_size_seconds=step_size_seconds,
+                time_step_seconds=time_step_seconds,
+                validation=validation,
+                stats=stats,
+            )
+
+        timestamps = df_input["timestamp"]
+        self._put(
+            key,
+            _Entry(
+                result=result,
+                parameters=parameters,
+                num_rows=len(df_input),
+                first_timestamp=int(timestamps.iloc[0]) if len(timestamps) else None,
+                input_fingerprint=input_fingerprint,
+                num_bytes=int(result.memory_usage(index=True, deep=True).sum()),
+            ),
+        )
+        return result.copy()
+
+    def _extend(
+        self,
+        df_input: pd.DataFrame,
+        parameters: tuple,
+        num_workers: int | None,
+        *,
+        validation: str = "full",
+        stats: PipelineStats | None = None,
+    ) -> pd.DataFrame | None:
+        """Extend the cached result of a prefix of the input, if any.
+
+        Windows start every `step` rows from the first row, so the windows of the
+        prefix are unchanged, and only the windows from the first one that was not
+        complete in the prefix need computing.
+        """
+        timeframe_seconds, step_size_seconds, time_step_seconds, _ = parameters
+        window_rows = timeframe_seconds // time_step_seconds
+        step_rows = step_size_seconds // time_step_seconds
+        num_rows = len(df_input)
+        first_timestamp = int(df_input["timestamp"].iloc[0]) if num_rows else None
+
+        for entry in reversed(self._entries.values()):
+            if (
+                entry.parameters != parameters
+                or entry.first_timestamp != first_timestamp
+                or entry.num_rows >= num_rows
+                or fingerprint(df_input.iloc[: entry.num_rows])
+                != entry.input_fingerprint
+            ):
+                continue
+
+            num_cached_windows = num_strided_windows(
+                entry.num_rows, window_rows, step_rows
+            )
+            num_new_windows = (
+                num_strided_windows(num_rows, window_rows, step_rows)
+                - num_cached_windows
+            )
+            LOGGER.debug(
+                "Extending cached result of {} rows with {} windows",
+                entry.num_rows,
+                num_new_windows,
+            )
+            if num_new_windows == 0:
+                return entry.result
+
+            tail = transform_ohlc(
+                df_input.iloc[num_cached_windows * step_rows :],
+                f"{timeframe_seconds}s",
+                num_workers=num_workers,
+                step_size_seconds=step_size_seconds,
+                time_step_seconds=time_step_seconds,
+                validation=validation,
+                stats=stats,
+            )
+            return pd.concat([entry.result, tail])
+        return None
+
+    @staticmethod
+    def _key(input_fingerprint: str, parameters: tuple) -> str:
+        """Build the cache key of an input and transform parameters."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(orjson.dumps([input_fingerprint, list(parameters)]))
+        return digest.hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return f"{self.cache_dir}/{key}.pkl"
+
+    def _get(self, key: str) -> _Entry | None:
+        """Get an entry from memory, or from disk, marking it most recently used."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+
+        if self.cache_dir is None or not os.path.exists(self._disk_path(key)):
+            return None
+        LOGGER.debug("Loading cached transform result from `{}`", self._disk_path(key))
+        with open(self._disk_path(key), "rb") as file:
+            entry = pickle.load(file)
+        self._put(key, entry, store=False)
+        return entry
+
+    def _put(self, key: str, entry: _Entry, *, store: bool = True):
+        """Put an entry in memory, evicting old entries, and store it on disk."""
+        if store and self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self._disk_path(key)}.tmp"
+            with open(temp_path, "wb") as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._disk_path(key))
+
+        if entry.num_bytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self.num_bytes -= self._entries.pop(key).num_bytes
+        self._entries[key] = entry
+        self.num_bytes += entry.num_bytes
+        while self.num_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.num_bytes -= evicted.num_bytes
+
+    def clear(self):
+        """Remove all cached results, from memory and from disk."""
+        self._entries.clear()
+        self.num_bytes = 0
+        if self.cache_dir is not None and os.path.isdir(self.cache_dir):
+            for file_name in os.listdir(self.cache_dir):
+                if file_name.endswith(".pkl"):
+                    os.remove(f"{self.cache_dir}/{file_name}")
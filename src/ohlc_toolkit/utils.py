@@ -1,5 +1,7 @@
 """Utility functions for the OHLC toolkit."""
 
+from dataclasses import dataclass, field
+
 import numpy as np
 import pandas as pd
 from loguru._logger import Logger
@@ -25,26 +27,100 @@ def infer_time_step(df: pd.DataFrame, logger: Logger) -> int:
     return time_step
 
 
+@dataclass
+class IntegrityReport:
+    """Result of the data integrity checks on an OHLC dataset.
+
+    Attributes:
+        num_rows: Number of rows checked.
+        null_counts: Number of null values per column.
+        duplicate_count: Number of rows whose timestamp repeats the previous one.
+        out_of_order: Whether the timestamps are not sorted in ascending order.
+        missing_count: Number of timestamps missing from the expected time grid.
+        gaps: Array of shape (num_gaps, 2) with the first and last missing timestamp
+            of each gap. Empty if no time step was given.
+
+    """
+
+    num_rows: int
+    null_counts: dict[str, int]
+    duplicate_count: int
+    out_of_order: bool
+    missing_count: int = 0
+    gaps: np.ndarray = field(default_factory=lambda: np.empty((0, 2), np.int64))
+
+    @property
+    def has_nulls(self) -> bool:
+        """Whether any column contains null values."""
+        return any(self.null_counts.values())
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the dataset passed all integrity checks."""
+        return not (
+            self.has_nulls
+            or self.duplicate_count
+            or self.out_of_order
+            or self.missing_count
+        )
+
+
 def check_data_integrity(
     df: pd.DataFrame, logger: Logger, time_step_seconds: int | None = None
-):
-    """Perform basic data integrity checks on the OHLC dataset."""
-    if df.isnull().values.any():
+) -> IntegrityReport:
+    """Perform basic data integrity checks on the OHLC dataset.
+
+    Gaps and duplicates are found from the differences between consecutive sorted
+    timestamps, so the checks run in O(n) time without building sets of timestamps.
+    Problems are logged as warnings, and also returned as a structured report.
+
+    Args:
+        df (pd.DataFrame): The OHLC dataset, with a timestamp column.
+        logger (Logger): The logger to use.
+        time_step_seconds (int | None): The expected time step between rows. If
+            given, gaps in the time grid are reported.
+
+    Returns:
+        IntegrityReport: The results of the checks.
+
+    """
+    null_counts = {str(column): int(df[column].isna().sum()) for column in df.columns}
+    if any(null_counts.values()):
         logger.warning("Data contains null values.")
 
-    if df["timestamp"].duplicated().any():
+    timestamps = df["timestamp"].to_numpy()
+    time_diffs = np.diff(timestamps)
+    out_of_order = bool((time_diffs < 0).any())
+    if out_of_order:
+        logger.warning("Timestamps are not sorted in ascending order.")
+        timestamps = np.sort(timestamps)
+        time_diffs = np.diff(timestamps)
+
+    duplicate_count = int(np.count_nonzero(time_diffs == 0))
+    if duplicate_count:
         logger.warning("Duplicate timestamps found in the dataset.")
 
+    report = IntegrityReport(
+        num_rows=len(df),
+        null_counts=null_counts,
+        duplicate_count=duplicate_count,
+        out_of_order=out_of_order,
+    )
+
     if time_step_seconds:
-        expected_timestamps = set(
-            range(
-                df["timestamp"].min(),
-                df["timestamp"].max() + time_step_seconds,
-                time_step_seconds,
+        gap_indices = np.flatnonzero(time_diffs > time_step_seconds)
+        if len(gap_indices):
+            gap_diffs = time_diffs[gap_indices].astype(np.int64)
+            gap_starts = timestamps[gap_indices].astype(np.int64)
+            # Number of grid points strictly between the two timestamps of each gap
+            missing_per_gap = (gap_diffs - 1) // time_step_seconds
+            report.missing_count = int(missing_per_gap.sum())
+            report.gaps = np.column_stack(
+                [
+                    gap_starts + time_step_seconds,
+                    gap_starts + missing_per_gap * time_step_seconds,
+                ]
             )
-        )
-        actual_timestamps = set(df["timestamp"])
-        missing_timestamps = expected_timestamps - actual_timestamps
+            logger.warning(f"Missing {report.missing_count} timestamps in dataset.")
 
-        if missing_timestamps:
-            logger.warning(f"Missing {len(missing_timestamps)} timestamps in dataset.")
+    return report
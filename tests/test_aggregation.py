@@ -0,0 +1,278 @@
+"""Tests for the vectorized window kernels."""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.aggregation import (
+    aggregate_ohlc_arrays,
+    aggregate_ohlc_columns,
+    combine_max,
+    combine_sum,
+    group_first,
+    group_last,
+    group_max,
+    group_min,
+    group_starts,
+    group_sum,
+    num_strided_windows,
+    sliding_max,
+    sliding_min,
+    sliding_sum,
+    strided_first,
+    strided_last,
+    strided_max,
+    strided_min,
+    strided_sum,
+    window_first,
+    window_last,
+)
+
+
+class TestSlidingKernels(unittest.TestCase):
+    """Test cases for the sliding window kernels."""
+
+    def setUp(self):
+        """Set up test data."""
+        rng = np.random.default_rng(42)
+        self.values = rng.random(257).astype("float32")
+        self.series = pd.Series(self.values)
+
+    def test_matches_pandas_rolling(self):
+        """Test the kernels against pandas' rolling reductions."""
+        for window in [1, 2, 3, 7, 16, 100, 257]:
+            with self.subTest(window=window):
+                rolling = self.series.rolling(window)
+                np.testing.assert_array_equal(
+                    sliding_max(self.values, window), rolling.max().to_numpy()
+                )
+                np.testing.assert_array_equal(
+                    sliding_min(self.values, window), rolling.min().to_numpy()
+                )
+                np.testing.assert_allclose(
+                    sliding_sum(self.values, window),
+                    rolling.sum().to_numpy(),
+                    rtol=1e-12,
+                )
+
+    def test_window_first_and_last(self):
+        """Test getting the first and last value of each window."""
+        values = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+        np.testing.assert_array_equal(
+            window_first(values, 3), [np.nan, np.nan, 1.0, 2.0, 3.0]
+        )
+        np.testing.assert_array_equal(
+            window_last(values, 3), [np.nan, np.nan, 3.0, 4.0, 5.0]
+        )
+
+    def test_nan_propagates_to_windows(self):
+        """Test that windows containing a NaN yield NaN, like pandas rolling."""
+        values = np.array([1.0, np.nan, 3.0, 4.0, 5.0, 6.0])
+        expected = [np.nan, np.nan, np.nan, np.nan, 3.0, 4.0]
+        np.testing.assert_array_equal(window_first(values, 3), expected)
+        np.testing.assert_array_equal(
+            sliding_max(values, 3), [np.nan, np.nan, np.nan, np.nan, 5.0, 6.0]
+        )
+
+    def test_window_larger_than_data(self):
+        """Test that a window larger than the data yields only NaNs."""
+        self.assertTrue(np.isnan(sliding_sum(self.values, 1000)).all())
+        self.assertTrue(np.isnan(window_last(self.values, 1000)).all())
+
+    def test_invalid_window(self):
+        """Test that a non-positive window raises a ValueError."""
+        with self.assertRaises(ValueError):
+            sliding_max(self.values, 0)
+        with self.assertRaises(ValueError):
+            window_first(self.values, -1)
+
+
+class TestStridedKernels(unittest.TestCase):
+    """Test cases for the strided window kernels."""
+
+    def setUp(self):
+        """Set up test data."""
+        rng = np.random.default_rng(7)
+        self.values = rng.random(500)
+
+    def test_matches_per_window_reductions(self):
+        """Test the kernels against reducing each kept window separately."""
+        for window, step in [(3, 3), (2, 5), (6, 3), (60, 15), (7, 4), (500, 1)]:
+            with self.subTest(window=window, step=step):
+                starts = range(0, len(self.values) - window + 1, step)
+                windows = [self.values[s : s + window] for s in starts]
+                np.testing.assert_array_equal(
+                    strided_max(self.values, window, step), [w.max() for w in windows]
+                )
+                np.testing.assert_array_equal(
+                    strided_min(self.values, window, step), [w.min() for w in windows]
+                )
+                np.testing.assert_allclose(
+                    strided_sum(self.values, window, step),
+                    [w.sum() for w in windows],
+                    rtol=1e-12,
+                )
+                np.testing.assert_array_equal(
+                    strided_first(self.values, window, step), [w[0] for w in windows]
+                )
+                np.testing.assert_array_equal(
+                    strided_last(self.values, window, step), [w[-1] for w in windows]
+                )
+
+    def test_num_strided_windows(self):
+        """Test counting the kept windows."""
+        self.assertEqual(num_strided_windows(10, 3, 3), 3)
+        self.assertEqual(num_strided_windows(10, 6, 2), 3)
+        self.assertEqual(num_strided_windows(10, 11, 2), 0)
+        with self.assertRaises(ValueError):
+            num_strided_windows(10, 3, 0)
+
+    def test_window_larger_than_data(self):
+        """Test that a window larger than the data yields no windows."""
+        self.assertEqual(len(strided_sum(self.values, 501, 2)), 0)
+        self.assertEqual(len(strided_first(self.values, 501, 2)), 0)
+
+    def test_nan_propagates_to_windows(self):
+        """Test that windows containing a NaN yield NaN."""
+        values = np.array([1.0, 2.0, np.nan, 4.0, 5.0, 6.0])
+        np.testing.assert_array_equal(strided_first(values, 2, 2), [1.0, np.nan, 5.0])
+        np.testing.assert_array_equal(strided_sum(values, 2, 2), [3.0, np.nan, 11.0])
+
+    def test_combine_windows(self):
+        """Test deriving larger windows by combining smaller strided windows."""
+        # 60-row windows every 15 rows, from 15-row windows every 15 rows
+        small_max = strided_max(self.values, 15, 15)
+        small_sum = strided_sum(self.values, 15, 15)
+        num_windows = num_strided_windows(len(self.values), 60, 15)
+        np.testing.assert_array_equal(
+            combine_max(small_max, 4, 1, num_windows),
+            strided_max(self.values, 60, 15),
+        )
+        np.testing.assert_allclose(
+            combine_sum(small_sum, 4, 1, num_windows),
+            strided_sum(self.values, 60, 15),
+            rtol=1e-12,
+        )
+
+
+class TestGroupKernels(unittest.TestCase):
+    """Test cases for the group kernels."""
+
+    def test_matches_groupby(self):
+        """Test the kernels against pandas' groupby reductions."""
+        rng = np.random.default_rng(3)
+        values = rng.random(300)
+        keys = np.sort(rng.integers(0, 40, 300))
+        starts = group_starts(keys)
+        grouped = pd.Series(values).groupby(keys)
+
+        np.testing.assert_array_equal(group_max(values, starts), grouped.max())
+        np.testing.assert_array_equal(group_min(values, starts), grouped.min())
+        np.testing.assert_allclose(group_sum(values, starts), grouped.sum())
+        np.testing.assert_array_equal(group_first(values, starts), grouped.first())
+        np.testing.assert_array_equal(group_last(values, starts), grouped.last())
+
+    def test_nan_propagates_to_groups(self):
+        """Test that groups containing a NaN yield NaN."""
+        values = np.array([1.0, np.nan, 3.0, 4.0])
+        starts = group_starts(np.array([0, 0, 1, 1]))
+        np.testing.assert_array_equal(group_last(values, starts), [np.nan, 4.0])
+        np.testing.assert_array_equal(group_sum(values, starts), [np.nan, 7.0])
+
+    def test_empty(self):
+        """Test that empty input yields no groups."""
+        empty = np.empty(0)
+        starts = group_starts(empty)
+        self.assertEqual(len(starts), 0)
+        self.assertEqual(len(group_max(empty, starts)), 0)
+        self.assertEqual(len(group_last(empty, starts)), 0)
+
+
+class TestAggregateOHLCArrays(unittest.TestCase):
+    """Test cases for the aggregate_ohlc_arrays function."""
+
+    def setUp(self):
+        """Set up test data."""
+        rng = np.random.default_rng(11)
+        self.timestamps = np.arange(300, dtype=np.int64) * 60
+        self.columns = [rng.random(300).astype("float32") for _ in range(5)]
+
+    def _aggregate(self, window, step=1, out=None):
+        """Aggregate the test arrays, passing each column by name."""
+        opens, highs, lows, closes, volumes = self.columns
+        return aggregate_ohlc_arrays(
+            timestamps=self.timestamps,
+            opens=opens,
+            highs=highs,
+            lows=lows,
+            closes=closes,
+            volumes=volumes,
+            window=window,
+            step=step,
+            out=out,
+        )
+
+    def test_matches_kernels(self):
+        """Test that each output column matches its window kernel."""
+        for window, step in [(1, 1), (7, 1), (7, 3), (10, 10), (4, 9)]:
+            with self.subTest(window=window, step=step):
+                timestamps, opens, highs, lows, closes, volumes = self._aggregate(
+                    window, step
+                )
+                num_windows = num_strided_windows(300, window, step)
+                self.assertEqual(timestamps.dtype, np.int64)
+                np.testing.assert_array_equal(
+                    timestamps, self.timestamps[window - 1 :: step][:num_windows]
+                )
+                np.testing.assert_array_equal(
+                    opens, strided_first(self.columns[0], window, step)
+                )
+                np.testing.assert_array_equal(
+                    highs, strided_max(self.columns[1], window, step)
+                )
+                np.testing.assert_array_equal(
+                    lows, strided_min(self.columns[2], window, step)
+                )
+                np.testing.assert_array_equal(
+                    closes, strided_last(self.columns[3], window, step)
+                )
+                np.testing.assert_allclose(
+                    volumes, strided_sum(self.columns[4], window, step), rtol=1e-12
+                )
+
+    def test_writes_into_out(self):
+        """Test that results are cast into caller-provided buffers."""
+        num_windows = num_strided_windows(300, 15, 5)
+        out = [np.zeros(num_windows, dtype=np.int64)] + [
+            np.zeros(num_windows, dtype=np.float32) for _ in range(5)
+        ]
+
+        result = self._aggregate(15, 5, out=out)
+
+        for target, values in zip(out, result, strict=True):
+            self.assertIs(values, target)
+        self.assertEqual(out[2].dtype, np.float32)
+        np.testing.assert_array_equal(out[2], strided_max(self.columns[1], 15, 5))
+
+    def test_invalid_out(self):
+        """Test that output buffers of the wrong shape raise a ValueError."""
+        with self.assertRaises(ValueError):
+            self._aggregate(15, 5, out=[np.empty(3)] * 6)
+        with self.assertRaises(ValueError):
+            self._aggregate(15, 5, out=[])
+
+    def test_window_larger_than_data(self):
+        """Test that a window larger than the data gives empty outputs."""
+        result = self._aggregate(301)
+        self.assertEqual([len(values) for values in result], [0] * 6)
+
+    def test_aggregate_columns(self):
+        """Test aggregating the columns given as one sequence."""
+        result = aggregate_ohlc_columns([self.timestamps, *self.columns], 7, 3)
+        for values, expected in zip(result, self._aggregate(7, 3), strict=True):
+            np.testing.assert_array_equal(values, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
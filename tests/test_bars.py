@@ -0,0 +1,146 @@
+"""Tests for building OHLCV bars from trades."""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.bars import TradeBarBuilder, trades_to_bars
+from ohlc_toolkit.transform import transform_ohlc
+
+
+class TestTradeBars(unittest.TestCase):
+    """Test cases for the trade bar builder."""
+
+    def setUp(self):
+        """Set up random trades over one hour."""
+        rng = np.random.default_rng(0)
+        num_trades = 20_000
+        self.trades = pd.DataFrame(
+            {
+                "timestamp": np.sort(
+                    rng.integers(1_700_000_000, 1_700_003_600, num_trades)
+                ),
+                "price": 100 + rng.standard_normal(num_trades).cumsum() / 10,
+                "size": rng.random(num_trades) * 2,
+            }
+        )
+
+    def test_time_bars(self):
+        """Test that time bars match a groupby over the time buckets."""
+        bars = trades_to_bars(self.trades, "time", "5s")
+
+        grouped = self.trades.groupby(self.trades["timestamp"] // 5 * 5)
+        np.testing.assert_array_equal(bars["timestamp"], grouped.size().index)
+        np.testing.assert_array_equal(bars["open"], grouped["price"].first())
+        np.testing.assert_array_equal(bars["high"], grouped["price"].max())
+        np.testing.assert_array_equal(bars["low"], grouped["price"].min())
+        np.testing.assert_array_equal(bars["close"], grouped["price"].last())
+        np.testing.assert_allclose(bars["volume"], grouped["size"].sum())
+        self.assertEqual(
+            bars.index[0], pd.Timestamp(bars["timestamp"].iloc[0], unit="s")
+        )
+
+    def test_threshold_bars(self):
+        """Test that tick, volume and dollar bars close at multiples of the size."""
+        ticks = trades_to_bars(self.trades, "tick", 100)
+        self.assertEqual(len(ticks), 200)
+        np.testing.assert_array_equal(
+            ticks["timestamp"], self.trades["timestamp"].iloc[99::100]
+        )
+
+        for bar_type, measure in [
+            ("volume", self.trades["size"]),
+            ("dollar", self.trades["price"] * self.trades["size"]),
+        ]:
+            with self.subTest(bar_type=bar_type):
+                threshold = measure.sum() / 50.5
+                bars = trades_to_bars(self.trades, bar_type, threshold)
+                self.assertEqual(len(bars), 51)  # 50 complete bars and a partial one
+
+                closing = np.searchsorted(
+                    measure.cumsum(), np.arange(1, 51) * threshold
+                )
+                np.testing.assert_array_equal(
+                    bars["timestamp"].iloc[:50],
+                    self.trades["timestamp"].iloc[closing],
+                )
+                self.assertAlmostEqual(bars["volume"].sum(), self.trades["size"].sum())
+
+    def test_large_trades_carry_over(self):
+        """Test that the excess of a trade worth several thresholds is carried over."""
+        trades = {
+            "timestamp": np.arange(5),
+            "price": np.full(5, 100.0),
+            "size": np.array([25.0, 1, 1, 1, 3]),
+        }
+        bars = trades_to_bars(trades, "volume", 10)
+        np.testing.assert_array_equal(bars["volume"], [25, 1, 5])
+        np.testing.assert_array_equal(bars["timestamp"], [0, 1, 4])
+
+        builder = TradeBarBuilder("volume", 10)
+        batches = [
+            builder.update(
+                {column: values[i : i + 1] for column, values in trades.items()}
+            )
+            for i in range(5)
+        ]
+        pd.testing.assert_frame_equal(pd.concat(batches), bars)
+
+    def test_batches_match_single_pass(self):
+        """Test that feeding trades in batches gives the same bars as one pass."""
+        cases: list[tuple[str, int | float | str]] = [
+            ("time", "1s"),
+            ("time", 1),
+            ("tick", 7),
+            ("volume", 3.3),
+        ]
+        for bar_type, size in cases:
+            with self.subTest(bar_type=bar_type, size=size):
+                builder = TradeBarBuilder(bar_type, size)
+                batches = [
+                    builder.update(self.trades.iloc[start : start + 777])
+                    for start in range(0, len(self.trades), 777)
+                ]
+                batches.append(builder.flush())
+                pd.testing.assert_frame_equal(
+                    pd.concat(batches), trades_to_bars(self.trades, bar_type, size)
+                )
+                self.assertTrue(builder.flush().empty)
+
+    def test_second_bars_to_transform(self):
+        """Test the whole stack at 1-second resolution."""
+        bars = trades_to_bars(self.trades, "time", "1s")
+        result = transform_ohlc(
+            bars,
+            "1m",
+            gap_policy="ffill",
+            step_size_seconds=15,
+            time_step_seconds=1,
+        )
+        self.assertEqual(result["timestamp"].diff().iloc[1:].unique().tolist(), [15])
+
+        window = self.trades[
+            (self.trades["timestamp"] > result["timestamp"].iloc[0] - 60)
+            & (self.trades["timestamp"] <= result["timestamp"].iloc[0])
+        ]
+        self.assertAlmostEqual(result["high"].iloc[0], window["price"].max())
+        self.assertAlmostEqual(result["volume"].iloc[0], window["size"].sum())
+
+    def test_invalid_input(self):
+        """Test invalid bar types, sizes and unsorted trades."""
+        with self.assertRaises(ValueError):
+            TradeBarBuilder("range", 10)
+        with self.assertRaises(ValueError):
+            TradeBarBuilder("tick", 2.5)
+        with self.assertRaises(ValueError):
+            TradeBarBuilder("volume", 0)
+
+        builder = TradeBarBuilder("tick", 10)
+        builder.update(self.trades.iloc[100:200])
+        with self.assertRaises(ValueError):
+            builder.update(self.trades.iloc[:100])
+
+
+if __name__ == "__main__":
+    unittest.main()
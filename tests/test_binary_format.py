@@ -0,0 +1,101 @@
+"""Tests for the memory-mapped binary OHLC format."""
+
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.binary_format import open_ohlc_binary, write_ohlc_binary
+from ohlc_toolkit.config import DEFAULT_DTYPE
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+from ohlc_toolkit.transform import transform_ohlc
+
+
+class TestBinaryFormat(unittest.TestCase):
+    """Test cases for writing and opening binary OHLC files."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.df = read_ohlc_csv("tests/test_data/real_world_data.csv", timeframe="1m")
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = f"{self.temp_dir}/btcusd.ohlc"
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip(self):
+        """Test that the data read back matches the data written."""
+        write_ohlc_binary(self.df.iloc[::-1], self.path)  # Unsorted input
+
+        binary = open_ohlc_binary(self.path)
+
+        self.assertEqual(len(binary), len(self.df))
+        self.assertIsInstance(binary.columns["close"], np.memmap)
+        pd.testing.assert_frame_equal(binary.read(), self.df.astype(DEFAULT_DTYPE))
+
+    def test_columns_are_not_copied(self):
+        """Test that the DataFrame columns are views of the memory-mapped arrays."""
+        write_ohlc_binary(self.df, self.path)
+        binary = open_ohlc_binary(self.path)
+
+        df = binary.read(datetime_index=False)
+
+        for column, values in binary.columns.items():
+            self.assertTrue(np.shares_memory(df[column].to_numpy(), values))
+        self.assertIsInstance(df.index, pd.RangeIndex)
+
+    def test_time_range_query(self):
+        """Test reading a timestamp range, with and without the index block."""
+        timestamps = self.df["timestamp"]
+        start, end = int(timestamps.iloc[100]) - 30, int(timestamps.iloc[999])
+        for index_stride in [0, 1, 7, 4096]:
+            with self.subTest(index_stride=index_stride):
+                write_ohlc_binary(self.df, self.path, index_stride=index_stride)
+                binary = open_ohlc_binary(self.path)
+
+                self.assertEqual(binary.row_range(start, end), slice(100, 1000))
+                self.assertEqual(binary.row_range(end=0), slice(0, 0))
+                self.assertEqual(
+                    binary.row_range(start=2**31), slice(len(self.df), len(self.df))
+                )
+                pd.testing.assert_frame_equal(
+                    binary.read(start, end),
+                    self.df.iloc[100:1000].astype(DEFAULT_DTYPE),
+                )
+
+    def test_transform_from_binary(self):
+        """Test that memory-mapped data plugs into transform_ohlc."""
+        write_ohlc_binary(self.df, self.path)
+        binary = open_ohlc_binary(self.path)
+
+        pd.testing.assert_frame_equal(
+            transform_ohlc(binary.read(), "1h", step_size_minutes=15),
+            transform_ohlc(self.df.astype(DEFAULT_DTYPE), "1h", step_size_minutes=15),
+        )
+
+    def test_empty(self):
+        """Test writing and opening an empty dataset."""
+        write_ohlc_binary(self.df.iloc[:0], self.path)
+        binary = open_ohlc_binary(self.path)
+
+        self.assertEqual(len(binary), 0)
+        self.assertTrue(binary.read().empty)
+
+    def test_invalid_file(self):
+        """Test that a file of another format raises a ValueError."""
+        with self.assertRaises(ValueError):
+            open_ohlc_binary("tests/test_data/real_world_data.csv")
+
+        write_ohlc_binary(self.df, self.path)
+        with open(self.path, "r+b") as file:
+            file.seek(8)
+            file.write((99).to_bytes(4, "little"))
+        with self.assertRaises(ValueError):
+            open_ohlc_binary(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
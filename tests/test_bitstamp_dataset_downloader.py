@@ -1,83 +1,86 @@
 """Tests for the DatasetDownloader class."""
 
+import gzip
+import os
+import shutil
+import tempfile
+import threading
 import unittest
-from unittest.mock import MagicMock, mock_open, patch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
 
 import pandas as pd
 
 from ohlc_toolkit.bitstamp_dataset_downloader import DatasetDownloader
 
+with open("tests/test_data/real_world_data.csv", "rb") as csv_file:
+    CSV_CONTENT = csv_file.read()
 
-class TestDatasetDownloader(unittest.TestCase):
-    """Tests for the DatasetDownloader class."""
 
-    def setUp(self):
-        """Set up the test case."""
-        self.downloader = DatasetDownloader(data_dir="test_data")
+class _FileServer:
+    """Local HTTP server stand-in that serves files with ETag and Range support."""
 
-    @patch("ohlc_toolkit.bitstamp_dataset_downloader.requests.get")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("os.path.exists")
-    def test_download_recent_data(self, mock_exists, mock_open, mock_get):
-        """Test downloading recent data."""
-        # Mock the response from requests.get
-        mock_response = MagicMock()
-        mock_response.iter_content = lambda chunk_size: [b"data"]
-        mock_response.headers = {"content-length": "4"}
-        mock_get.return_value = mock_response
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.bytes_sent = 0
+        server = self
 
-        # Mock os.path.exists to simulate file not existing
-        mock_exists.return_value = False
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                server.requests.append((self.path, dict(self.headers)))
+                content = server.files.get(self.path)
+                if content is None:
+                    self.send_error(404)
+                    return
 
-        # Call the method
-        with patch("pandas.read_csv", return_value=pd.DataFrame()):
-            df = self.downloader.download_bitstamp_btcusd_minute_data(
-                recent=True, bulk=False
-            )
+                etag = f'"{hash(content)}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
 
-        # Assertions
-        mock_get.assert_called_once_with(
-            "https://raw.githubusercontent.com/ff137/bitstamp-btcusd-minute-data/"
-            "main/data/updates/btcusd_bitstamp_1min_latest.csv",
-            stream=True,
-            allow_redirects=True,
-        )
-        mock_open.assert_called_once_with(
-            "test_data/btcusd_bitstamp_1min_latest.csv", "wb"
-        )
-        self.assertIsInstance(df, pd.DataFrame)
+                start = 0
+                range_header = self.headers.get("Range")
+                if range_header and self.headers.get("If-Range", etag) == etag:
+                    start = int(range_header.removeprefix("bytes=").rstrip("-"))
+                    if start >= len(content):
+                        self.send_error(416)
+                        return
+                    self.send_response(206)
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{len(content) - 1}/*"
+                    )
+                else:
+                    self.send_response(200)
 
-    @patch("ohlc_toolkit.bitstamp_dataset_downloader.requests.get")
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("os.path.exists")
-    def test_download_bulk_data(self, mock_exists, mock_open, mock_get):
-        """Test downloading bulk data."""
-        # Mock the response from requests.get
-        mock_response = MagicMock()
-        mock_response.iter_content = lambda chunk_size: [b"data"]
-        mock_response.headers = {"content-length": "4"}
-        mock_get.return_value = mock_response
+                body = content[start:]
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", "Tue, 07 Jan 2025 00:00:00 GMT")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                server.bytes_sent += len(body)
 
-        # Mock os.path.exists to simulate file not existing
-        mock_exists.return_value = False
+            def log_message(self, *args):
+                pass
 
-        # Call the method
-        with patch("pandas.read_csv", return_value=pd.DataFrame()):
-            df = self.downloader.download_bitstamp_btcusd_minute_data(
-                bulk=True, recent=False
-            )
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
 
-        # Assertions
-        mock_get.assert_called_once_with(
-            "https://raw.githubusercontent.com/ff137/bitstamp-btcusd-minute-data/"
-            "main/data/historical/btcusd_bitstamp_1min_2012-2025.csv.gz",
-            stream=True,
-            allow_redirects=True,
-        )
-        mock_open.assert_called_once_with(
-            "test_data/btcusd_bitstamp_1min_2012-2025.csv.gz", "wb"
-        )
-        self.assertIsInstance(df, pd.DataFrame)
+
+class TestDatasetDownloader(unittest.TestCase):
+    """Tests for the DatasetDownloader class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.downloader = DatasetDownloader(data_dir="test_data")
 
     @patch("os.path.exists", return_value=True)
     @patch("pandas.read_csv", return_value=pd.DataFrame())
@@ -111,6 +114,14 @@ class TestDatasetDownloader(unittest.TestCase):
         mock_read_csv.assert_any_call("test_data/btcusd_bitstamp_1min_latest.csv")
         self.assertIsInstance(df, pd.DataFrame)
 
+    @patch("os.path.exists", return_value=True)
+    def test_skip_read_returns_none(self, mock_exists):
+        """Test that nothing is returned when reading is skipped."""
+        df = self.downloader.download_bitstamp_btcusd_minute_data(
+            overwrite_recent=False, skip_read=True
+        )
+        self.assertIsNone(df)
+
     def test_bad_download_request(self):
         """Test exception raised on neither bulk nor recent requested."""
         with self.assertRaises(ValueError):
@@ -119,5 +130,128 @@ class TestDatasetDownloader(unittest.TestCase):
             )
 
 
+class TestIncrementalDownloads(unittest.TestCase):
+    """Tests for resumable and conditional downloads against a local server."""
+
+    def setUp(self):
+        """Start a local file server and create a temporary data directory."""
+        self.server = _FileServer()
+        self.server.files["/latest.csv"] = CSV_CONTENT
+        self.url = f"{self.server.url}/latest.csv"
+        self.data_dir = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.data_dir, "latest.csv")
+        self.downloader = DatasetDownloader(data_dir=self.data_dir)
+
+    def tearDown(self):
+        """Stop the server and remove the temporary data directory."""
+        self.server.close()
+        self.downloader.session.close()
+        shutil.rmtree(self.data_dir)
+
+    def _read_output(self) -> bytes:
+        with open(self.output_path, "rb") as file:
+            return file.read()
+
+    def test_full_download(self):
+        """Test downloading a file that doesn't exist locally yet."""
+        self.assertTrue(self.downloader._download_file(self.url, self.output_path))
+
+        self.assertEqual(self._read_output(), CSV_CONTENT)
+        self.assertFalse(os.path.exists(f"{self.output_path}.part"))
+        self.assertTrue(os.path.exists(f"{self.output_path}.meta.json"))
+
+    def test_unchanged_file_is_not_transferred(self):
+        """Test that re-downloading an unchanged file is a conditional no-op."""
+        self.downloader._download_file(self.url, self.output_path)
+        bytes_sent = self.server.bytes_sent
+
+        self.assertFalse(self.downloader._download_file(self.url, self.output_path))
+
+        self.assertEqual(self.server.bytes_sent, bytes_sent)
+        self.assertIn("If-None-Match", self.server.requests[-1][1])
+        self.assertIn("If-Modified-Since", self.server.requests[-1][1])
+        self.assertEqual(self._read_output(), CSV_CONTENT)
+
+    def test_changed_file_is_downloaded_again(self):
+        """Test that a changed remote file replaces the local copy."""
+        self.downloader._download_file(self.url, self.output_path)
+        self.server.files["/latest.csv"] = CSV_CONTENT + b"1736294400,1,1,1,1,1\n"
+
+        self.assertTrue(self.downloader._download_file(self.url, self.output_path))
+
+        self.assertEqual(self._read_output(), self.server.files["/latest.csv"])
+
+    def test_resume_partial_download(self):
+        """Test that an interrupted download resumes with a Range request."""
+        self.downloader._download_file(self.url, self.output_path)
+        # Simulate an interrupted download of the same file
+        os.rename(self.output_path, f"{self.output_path}.part")
+        os.rename(f"{self.output_path}.meta.json", f"{self.output_path}.part.meta.json")
+        with open(f"{self.output_path}.part", "r+b") as file:
+            file.truncate(1000)
+        bytes_sent = self.server.bytes_sent
+
+        self.assertTrue(self.downloader._download_file(self.url, self.output_path))
+
+        self.assertEqual(self.server.requests[-1][1]["Range"], "bytes=1000-")
+        self.assertEqual(self.server.bytes_sent - bytes_sent, len(CSV_CONTENT) - 1000)
+        self.assertEqual(self._read_output(), CSV_CONTENT)
+        self.assertFalse(os.path.exists(f"{self.output_path}.part.meta.json"))
+
+    def test_partial_download_of_changed_file_restarts(self):
+        """Test that a partial download of a since-changed file starts over."""
+        with open(f"{self.output_path}.part", "wb") as file:
+            file.write(b"stale partial content")
+        with open(f"{self.output_path}.part.meta.json", "w") as file:
+            file.write('{"etag": "\\"stale\\"", "last_modified": null}')
+
+        self.assertTrue(self.downloader._download_file(self.url, self.output_path))
+
+        self.assertEqual(self._read_output(), CSV_CONTENT)
+
+    def test_complete_partial_download_restarts(self):
+        """Test that an unsatisfiable Range request restarts the download."""
+        self.downloader._download_file(self.url, self.output_path)
+        os.rename(self.output_path, f"{self.output_path}.part")
+        os.rename(f"{self.output_path}.meta.json", f"{self.output_path}.part.meta.json")
+
+        self.assertTrue(self.downloader._download_file(self.url, self.output_path))
+
+        self.assertEqual(self._read_output(), CSV_CONTENT)
+
+    def test_download_error(self):
+        """Test that HTTP errors are raised."""
+        with self.assertRaises(Exception):  # noqa: B017
+            self.downloader._download_file(
+                f"{self.server.url}/missing.csv", self.output_path
+            )
+        self.assertFalse(os.path.exists(self.output_path))
+
+    def test_download_recent_data(self):
+        """Test downloading recent data."""
+        self.downloader.BITSTAMP_RECENT_DATA_URL = self.url
+
+        df = self.downloader.download_bitstamp_btcusd_minute_data(
+            recent=True, bulk=False
+        )
+
+        self.assertEqual(self.server.requests[0][0], "/latest.csv")
+        assert df is not None
+        self.assertEqual(len(df), 1440)
+
+    def test_download_bulk_data(self):
+        """Test downloading bulk data."""
+        self.server.files["/bulk.csv.gz"] = gzip.compress(CSV_CONTENT)
+        self.downloader.BITSTAMP_BULK_DATA_URL = f"{self.server.url}/bulk.csv.gz"
+
+        df = self.downloader.download_bitstamp_btcusd_minute_data(
+            bulk=True, recent=False
+        )
+
+        self.assertTrue(os.path.exists(os.path.join(self.data_dir, "bulk.csv.gz")))
+        assert df is not None
+        self.assertEqual(len(df), 1440)
+
+
 if __name__ == "__main__":
     unittest.main()
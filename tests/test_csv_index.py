@@ -0,0 +1,179 @@
+"""Tests for the sparse timestamp index of CSV files."""
+
+import gzip
+import itertools
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from ohlc_toolkit.csv_index import build_csv_index, load_csv_index, recompress_gzip
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+
+
+class TestCSVIndex(unittest.TestCase):
+    """Test cases for time-range reads of indexed CSV files."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.csv_path = "tests/test_data/real_world_data.csv"
+        self.df = read_ohlc_csv(self.csv_path)
+        timestamps = self.df["timestamp"]
+        self.start, self.end = int(timestamps.iloc[100]) - 30, int(timestamps.iloc[999])
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def _copy(self, file_name: str) -> str:
+        path = os.path.join(self.temp_dir, file_name)
+        shutil.copy(self.csv_path, path)
+        return path
+
+    def _write_gzip_members(self, path: str, split_lines: list[float]) -> None:
+        """Write the CSV data as one gzip member per range of lines.
+
+        A fractional line number splits that line in the middle.
+        """
+        with open(self.csv_path, "rb") as file:
+            data = file.read()
+        line_starts = [0] + [i + 1 for i, byte in enumerate(data) if byte == ord("\n")]
+        split_points = [
+            line_starts[int(line)] + (3 if line % 1 else 0) for line in split_lines
+        ]
+        bounds = [0, *split_points, len(data)]
+        with open(path, "wb") as file:
+            for begin, stop in itertools.pairwise(bounds):
+                file.write(gzip.compress(data[begin:stop]))
+
+    def test_range_read_matches_full_read(self):
+        """Test that a range read matches filtering the full data."""
+        path = self._copy("data.csv")
+        with patch("ohlc_toolkit.csv_index.DEFAULT_INDEX_BLOCK_ROWS", 64):
+            df_range = read_ohlc_csv(path, start=self.start, end=self.end)
+
+        pd.testing.assert_frame_equal(df_range, self.df.iloc[100:1000])
+        self.assertTrue(os.path.exists(f"{path}.index.json"))
+
+    def test_only_overlapping_blocks_are_read(self):
+        """Test that the index selects the blocks overlapping the range."""
+        path = self._copy("data.csv")
+        index = build_csv_index(path, header=True, block_rows=100)
+
+        self.assertEqual(len(index["blocks"]), -(-len(self.df) // 100))
+        self.assertEqual(
+            index["blocks"][0][2], len("timestamp,open,high,low,close,volume\n")
+        )
+        with patch("ohlc_toolkit.csv_index.pd.read_csv", wraps=pd.read_csv) as mock:
+            read_ohlc_csv(path, start=self.start, end=self.end)
+        # Blocks 1 to 9 are adjacent, so they are parsed in a single read
+        mock.assert_called_once()
+
+    def test_open_ended_ranges(self):
+        """Test ranges bounded on one side only, or outside the data."""
+        path = self._copy("data.csv")
+
+        df_tail = read_ohlc_csv(path, start=self.end)
+        self.assertEqual(len(df_tail), len(self.df) - 999)
+        df_head = read_ohlc_csv(path, end=self.start)
+        self.assertEqual(len(df_head), 100)
+        with self.assertRaises(ValueError):
+            read_ohlc_csv(path, start=2**40)  # No rows to infer the time step from
+
+    def test_stale_index_is_rebuilt(self):
+        """Test that the index is rebuilt when the file changes."""
+        path = self._copy("data.csv")
+        read_ohlc_csv(path, start=self.start, end=self.end)
+        self.assertIsNotNone(load_csv_index(path))
+
+        self.df.iloc[:500].to_csv(path, index=False)
+        os.utime(path, ns=(0, 0))
+        self.assertIsNone(load_csv_index(path))
+
+        df_range = read_ohlc_csv(path, start=self.start, end=self.end)
+        self.assertEqual(len(df_range), 400)
+        self.assertIsNotNone(load_csv_index(path))
+
+    def test_no_header(self):
+        """Test a range read of a file without a header row."""
+        path = os.path.join(self.temp_dir, "data.csv")
+        self.df.to_csv(path, index=False, header=False)
+
+        df_range = read_ohlc_csv(path, start=self.start, end=self.end)
+        self.assertEqual(
+            df_range["timestamp"].tolist(), self.df["timestamp"].iloc[100:1000].tolist()
+        )
+
+    def test_gzip_members(self):
+        """Test that each gzip member is a block, merging members that split a line."""
+        path = os.path.join(self.temp_dir, "data.csv.gz")
+        self._write_gzip_members(path, [200, 500, 700.5])
+
+        index = build_csv_index(path, header=True)
+        self.assertEqual(len(index["blocks"]), 3)  # The last two members are merged
+        # Streaming the file in small chunks finds the same member boundaries
+        with patch("ohlc_toolkit.csv_index.GZIP_READ_SIZE", 100):
+            self.assertEqual(build_csv_index(path, header=True), index)
+
+        df_range = read_ohlc_csv(path, start=self.start, end=self.end)
+        pd.testing.assert_frame_equal(df_range, self.df.iloc[100:1000])
+
+    def test_single_member_gzip(self):
+        """Test that a single-member gzip file is read as one block."""
+        path = os.path.join(self.temp_dir, "data.csv.gz")
+        self._write_gzip_members(path, [])
+
+        self.assertEqual(len(build_csv_index(path, header=True)["blocks"]), 1)
+        df_range = read_ohlc_csv(path, start=self.start, end=self.end)
+        pd.testing.assert_frame_equal(df_range, self.df.iloc[100:1000])
+
+    def test_truncated_gzip(self):
+        """Test that indexing a truncated gzip file raises a ValueError."""
+        path = os.path.join(self.temp_dir, "data.csv.gz")
+        self._write_gzip_members(path, [200])
+        with open(path, "rb+") as file:
+            file.truncate(os.path.getsize(path) - 100)
+
+        with self.assertRaises(ValueError):
+            build_csv_index(path, header=True)
+
+    def test_parallel_read(self):
+        """Test that a parallel read matches the serial read."""
+        path = self._copy("data.csv")
+        with patch("ohlc_toolkit.csv_index.DEFAULT_INDEX_BLOCK_ROWS", 64):
+            df_parallel = read_ohlc_csv(path, num_workers=4)
+
+        pd.testing.assert_frame_equal(df_parallel, self.df)
+        with self.assertRaises(ValueError):
+            read_ohlc_csv(path, num_workers=0)
+
+    def test_recompress_gzip(self):
+        """Test rewriting a single-member gzip file as indexed members."""
+        path = os.path.join(self.temp_dir, "data.csv.gz")
+        self._write_gzip_members(path, [])
+        output_path = os.path.join(self.temp_dir, "blocked.csv.gz")
+
+        recompress_gzip(path, output_path, block_bytes=4096, num_workers=2)
+
+        index = load_csv_index(output_path)
+        assert index is not None
+        self.assertEqual(index, build_csv_index(output_path, header=True))
+        self.assertGreater(len(index["blocks"]), 10)
+        with gzip.open(path) as source, gzip.open(output_path) as output:
+            self.assertEqual(source.read(), output.read())
+
+        pd.testing.assert_frame_equal(
+            read_ohlc_csv(output_path, num_workers=3), self.df
+        )
+        pd.testing.assert_frame_equal(
+            read_ohlc_csv(output_path, start=self.start, end=self.end),
+            self.df.iloc[100:1000],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,21 @@
 """Tests for the ohlc_toolkit.csv_reader module."""
 
+import gzip
+import os
+import shutil
+import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pandas as pd
 
 from ohlc_toolkit.config import DEFAULT_COLUMNS, DEFAULT_DTYPE
-from ohlc_toolkit.csv_reader import read_ohlc_csv
+from ohlc_toolkit.csv_reader import (
+    _check_chunk_boundary,
+    _sniff_header,
+    iter_ohlc_csv,
+    read_ohlc_csv,
+)
 
 
 class TestCsvReader(unittest.TestCase):
@@ -112,6 +121,81 @@ class TestCsvReader(unittest.TestCase):
             )
         assert mock_infer_time_step.call_count == 1
 
+    @patch("ohlc_toolkit.csv_reader.pd.read_csv", wraps=pd.read_csv)
+    def test_read_ohlc_csv_parses_once(self, mock_read_csv):
+        """Test that a file with an unspecified header row is only parsed once."""
+        read_ohlc_csv(self.csv_data_w_header_path)
+        mock_read_csv.assert_called_once()
+        self.assertEqual(mock_read_csv.call_args.kwargs["header"], 0)
+
+    def test_sniff_header(self):
+        """Test detecting whether the first line is a header."""
+        self.assertTrue(_sniff_header(self.csv_data_w_header_path))
+        self.assertFalse(_sniff_header(self.csv_data_no_header_path))
+        self.assertFalse(_sniff_header("tests/test_data/bad_path.csv"))
+
+        with tempfile.NamedTemporaryFile(suffix=".csv") as empty_file:
+            self.assertFalse(_sniff_header(empty_file.name))
+
+
+class TestIterOhlcCsv(unittest.TestCase):
+    """Test cases for reading OHLC CSV files in chunks."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.csv_path = "tests/test_data/real_world_data.csv"
+        self.df_expected = read_ohlc_csv(self.csv_path)
+
+    def test_chunks_match_full_read(self):
+        """Test that the concatenated chunks match reading the whole file."""
+        chunks = list(iter_ohlc_csv(self.csv_path, chunksize=500, timeframe="1h"))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [500, 500, 440])
+        pd.testing.assert_frame_equal(pd.concat(chunks), self.df_expected)
+
+    def test_gzip_chunks(self):
+        """Test reading a gzip-compressed file in chunks."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            gzip_path = os.path.join(temp_dir, "real_world_data.csv.gz")
+            with open(self.csv_path, "rb") as source, gzip.open(gzip_path, "wb") as f:
+                shutil.copyfileobj(source, f)
+
+            chunks = list(iter_ohlc_csv(gzip_path, chunksize=1000))
+
+        pd.testing.assert_frame_equal(pd.concat(chunks), self.df_expected)
+
+    def test_fails_on_bad_path(self):
+        """Test fail on reading a file that doesn't exist."""
+        with self.assertRaises(FileNotFoundError):
+            next(iter_ohlc_csv("tests/test_data/bad_path.csv"))
+
+    def test_fails_on_bad_timeframe(self):
+        """Test fail on a timeframe smaller than the time step."""
+        with self.assertRaises(ValueError):
+            next(iter_ohlc_csv(self.csv_path, timeframe="30s"))
+
+    def test_check_chunk_boundary(self):
+        """Test the integrity warnings across chunk boundaries."""
+        logger = MagicMock()
+
+        _check_chunk_boundary(60, 120, 60, logger)
+        logger.warning.assert_not_called()
+
+        _check_chunk_boundary(60, 240, 60, logger)
+        logger.warning.assert_called_with(
+            "Missing 2 timestamps across a chunk boundary."
+        )
+
+        _check_chunk_boundary(60, 60, 60, logger)
+        logger.warning.assert_called_with(
+            "Duplicate timestamps found across a chunk boundary."
+        )
+
+        _check_chunk_boundary(120, 60, 60, logger)
+        logger.warning.assert_called_with(
+            "Timestamps are out of order across a chunk boundary."
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,153 @@
+"""Tests for the ParsedDatasetCache class."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from ohlc_toolkit.bitstamp_dataset_downloader import DatasetDownloader
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+from ohlc_toolkit.dataset_cache import ParsedDatasetCache, file_checksum
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+class TestParsedDatasetCache(unittest.TestCase):
+    """Test cases for the ParsedDatasetCache class."""
+
+    def setUp(self):
+        """Set up a temporary copy of the test dataset."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.temp_dir, "real_world_data.csv")
+        shutil.copy("tests/test_data/real_world_data.csv", self.source_path)
+        self.cache_dir = os.path.join(self.temp_dir, ".cache")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_read_csv_caches_parsed_data(self):
+        """Test that the second read is served from the cache."""
+        for file_format in ["feather", "parquet"]:
+            with self.subTest(file_format=file_format):
+                cache = ParsedDatasetCache(self.cache_dir, file_format=file_format)
+                df = cache.read_csv(self.source_path, reader=read_ohlc_csv)
+
+                with patch("pandas.read_csv") as mock_read_csv:
+                    df_cached = cache.read_csv(self.source_path, reader=read_ohlc_csv)
+                mock_read_csv.assert_not_called()
+
+                pd.testing.assert_frame_equal(df_cached, df)
+                self.assertIsInstance(df_cached.index, pd.DatetimeIndex)
+
+    def test_invalidated_when_source_changes(self):
+        """Test that modifying the source file invalidates the cache entry."""
+        cache = ParsedDatasetCache(self.cache_dir)
+        cache.read_csv(self.source_path)
+        self.assertTrue(cache.is_valid(self.source_path))
+
+        with open(self.source_path, "a") as file:
+            file.write("\n1736294400,1,1,1,1,1\n")
+        self.assertFalse(cache.is_valid(self.source_path))
+        self.assertIsNone(cache.load(self.source_path))
+
+        df = cache.read_csv(self.source_path)
+        self.assertEqual(df["timestamp"].iloc[-1], 1736294400)
+
+    def test_rewritten_source_is_hashed(self):
+        """Test that a source with a new mtime is only valid if its contents match."""
+        cache = ParsedDatasetCache(self.cache_dir)
+        cache.read_csv(self.source_path)
+        stat = os.stat(self.source_path)
+
+        # Same contents, new mtime: still valid, and not hashed again
+        os.utime(self.source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertTrue(cache.is_valid(self.source_path))
+        with patch("ohlc_toolkit.dataset_cache.file_checksum") as mock_checksum:
+            self.assertTrue(cache.is_valid(self.source_path))
+        mock_checksum.assert_not_called()
+
+        # Same size, new contents and mtime: invalid
+        with open(self.source_path, "r+b") as file:
+            file.seek(-3, os.SEEK_END)
+            file.write(b"9\n")
+        os.utime(self.source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+        self.assertFalse(cache.is_valid(self.source_path))
+
+    def test_reader_arguments_are_part_of_the_key(self):
+        """Test that reading with other reader arguments misses the cache."""
+        cache = ParsedDatasetCache(self.cache_dir)
+        df = cache.read_csv(self.source_path)
+        df_float = cache.read_csv(self.source_path, dtype={"timestamp": "float64"})
+        self.assertEqual(df_float["timestamp"].dtype, "float64")
+        self.assertEqual(df["timestamp"].dtype, "int64")
+
+        self.assertFalse(cache.is_valid(self.source_path))  # Replaced by the new read
+        with patch("pandas.read_csv") as mock_read_csv:
+            cache.read_csv(self.source_path, dtype={"timestamp": "float64"})
+        mock_read_csv.assert_not_called()
+
+    def test_clear(self):
+        """Test removing a cache entry."""
+        cache = ParsedDatasetCache(self.cache_dir)
+        cache.read_csv(self.source_path)
+        cache.clear(self.source_path)
+        self.assertFalse(cache.is_valid(self.source_path))
+
+    def test_downloader_reads_through_cache(self):
+        """Test that the downloader reads existing files through the cache."""
+        downloader = DatasetDownloader(data_dir=self.temp_dir, cache=True)
+        shutil.copy(
+            self.source_path,
+            os.path.join(self.temp_dir, "btcusd_bitstamp_1min_latest.csv"),
+        )
+
+        df = downloader.download_bitstamp_btcusd_minute_data(overwrite_recent=False)
+        with patch("pandas.read_csv") as mock_read_csv:
+            df_cached = downloader.download_bitstamp_btcusd_minute_data(
+                overwrite_recent=False
+            )
+        mock_read_csv.assert_not_called()
+        assert df is not None and df_cached is not None
+        pd.testing.assert_frame_equal(df_cached, df)
+
+
+class TestDatasetCacheHelpers(unittest.TestCase):
+    """Test cases for the dataset cache helpers."""
+
+    def test_file_checksum(self):
+        """Test that the checksum is stable and content-dependent."""
+        checksum = file_checksum("tests/test_data/test_csv_w_header.csv")
+        self.assertEqual(
+            checksum, file_checksum("tests/test_data/test_csv_w_header.csv")
+        )
+        self.assertNotEqual(
+            checksum, file_checksum("tests/test_data/test_csv_no_header.csv")
+        )
+
+    def test_missing_pyarrow(self):
+        """Test that a helpful ImportError is raised without pyarrow."""
+        cache = ParsedDatasetCache()
+        with patch.dict(sys.modules, {"pyarrow": None}):
+            with self.assertRaises(ImportError) as context:
+                cache.store("tests/test_data/test_csv_w_header.csv", pd.DataFrame())
+        self.assertIn("requires `pyarrow`", str(context.exception))
+
+    def test_invalid_file_format(self):
+        """Test that an unknown file format raises a ValueError."""
+        with self.assertRaises(ValueError):
+            ParsedDatasetCache(file_format="csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,13 @@
 
 import unittest
 
+import numpy as np
 import pandas as pd
 
-from ohlc_toolkit.future_returns.percentage_return import calculate_percentage_return
+from ohlc_toolkit.future_returns.percentage_return import (
+    calculate_percentage_return,
+    calculate_return_matrix,
+)
 
 
 class TestPercentageReturn(unittest.TestCase):
@@ -72,6 +76,97 @@ class TestPercentageReturn(unittest.TestCase):
 
         pd.testing.assert_series_equal(pct_return, expected_returns, check_names=False)
 
+    def test_keeps_float_precision(self):
+        """Test that float32 prices give float32 returns, and integers float64."""
+        for dtype, expected_dtype in [
+            (np.float32, np.float32),
+            (np.float64, np.float64),
+            (np.int64, np.float64),
+        ]:
+            with self.subTest(dtype=dtype):
+                pct_return = calculate_percentage_return(
+                    close=self.df["close"].astype(dtype),
+                    timestep_size=1,
+                    future_return_length=2,
+                )
+                self.assertEqual(pct_return.dtype, expected_dtype)
+
+
+class TestReturnMatrix(unittest.TestCase):
+    """Test cases for the multi-horizon return matrix."""
+
+    def setUp(self):
+        """Set up a random walk of close prices."""
+        rng = np.random.default_rng(0)
+        self.close = pd.Series(
+            30000 + np.cumsum(rng.normal(0, 5, 500)),
+            index=pd.date_range("2025-01-01", periods=500, freq="min"),
+        )
+        self.lengths = [1, 5, 60, 499, 600]
+
+    def test_matches_single_horizon(self):
+        """Test that each column matches calculate_percentage_return."""
+        matrix = calculate_return_matrix(
+            self.close, timestep_size=1, future_return_lengths=self.lengths[:4]
+        )
+        assert isinstance(matrix, pd.DataFrame)
+
+        self.assertEqual(matrix.dtypes.unique().tolist(), [np.float32])
+        for length in self.lengths[:4]:
+            pd.testing.assert_series_equal(
+                matrix[f"PCTRET_{length}"],
+                calculate_percentage_return(
+                    self.close, timestep_size=1, future_return_length=length
+                ).astype(np.float32),
+                check_names=False,
+            )
+
+    def test_forward_and_log_returns(self):
+        """Test forward-looking and log returns."""
+        forward = calculate_return_matrix(
+            self.close,
+            timestep_size=5,
+            future_return_lengths=[5, 300],
+            direction="forward",
+            log=True,
+            dtype=np.float64,
+        )
+        assert isinstance(forward, pd.DataFrame)
+
+        self.assertEqual(forward.columns.tolist(), ["FWD_LOGRET_5", "FWD_LOGRET_300"])
+        expected = np.log(self.close.shift(-60) / self.close)
+        pd.testing.assert_series_equal(
+            forward["FWD_LOGRET_300"], expected, check_names=False
+        )
+        self.assertTrue(forward["FWD_LOGRET_5"].iloc[-1:].isna().all())
+
+    def test_array_output(self):
+        """Test the 2-D array output, including a horizon longer than the data."""
+        returns = calculate_return_matrix(
+            self.close.to_numpy(),
+            timestep_size=1,
+            future_return_lengths=self.lengths,
+            as_frame=False,
+        )
+
+        self.assertEqual(returns.shape, (500, len(self.lengths)))
+        self.assertTrue(returns.flags.f_contiguous)
+        self.assertEqual(np.isnan(returns).sum(axis=0).tolist(), [1, 5, 60, 499, 500])
+
+    def test_invalid_arguments(self):
+        """Test that invalid lengths and directions raise a ValueError."""
+        with self.assertRaises(ValueError):
+            calculate_return_matrix(
+                self.close, timestep_size=5, future_return_lengths=[1]
+            )
+        with self.assertRaises(ValueError):
+            calculate_return_matrix(
+                self.close,
+                timestep_size=1,
+                future_return_lengths=[1],
+                direction="sideways",
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
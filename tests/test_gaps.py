@@ -0,0 +1,91 @@
+"""Tests for the fill_gaps function."""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.gaps import fill_gaps
+
+
+class TestFillGaps(unittest.TestCase):
+    """Test cases for the fill_gaps function."""
+
+    def setUp(self):
+        """Set up the test case, with minutes 2 and 3 missing."""
+        self.df = pd.DataFrame(
+            {
+                "timestamp": np.array([0, 60, 240, 300], dtype=np.int32),
+                "open": np.array([1.0, 2.0, 5.0, 6.0], dtype=np.float32),
+                "high": np.array([1.5, 2.5, 5.5, 6.5], dtype=np.float32),
+                "low": np.array([0.5, 1.5, 4.5, 5.5], dtype=np.float32),
+                "close": np.array([1.2, 2.2, 5.2, 6.2], dtype=np.float32),
+                "volume": np.array([10, 20, 50, 60], dtype=np.float32),
+            }
+        )
+
+    def test_ffill(self):
+        """Test that missing bars are flat at the previous close, with zero volume."""
+        df_filled = fill_gaps(self.df, "ffill")
+
+        self.assertEqual(df_filled["timestamp"].tolist(), [0, 60, 120, 180, 240, 300])
+        for column in ["open", "high", "low", "close"]:
+            self.assertEqual(df_filled[column].iloc[2], np.float32(2.2))
+            self.assertEqual(df_filled[column].iloc[3], np.float32(2.2))
+        self.assertEqual(df_filled["volume"].tolist(), [10, 20, 0, 0, 50, 60])
+        pd.testing.assert_series_equal(df_filled.dtypes, self.df.dtypes)
+        self.assertEqual(df_filled.index[2], pd.Timestamp(120, unit="s"))
+
+    def test_ffill_extra_columns(self):
+        """Test that columns other than OHLCV are forward-filled."""
+        df_filled = fill_gaps(self.df.assign(trades=[1, 2, 5, 6]), "ffill")
+
+        self.assertEqual(df_filled["trades"].tolist(), [1, 2, 2, 2, 5, 6])
+
+    def test_nan(self):
+        """Test that missing bars are NaN except for their timestamp."""
+        df_filled = fill_gaps(self.df, "nan")
+
+        self.assertEqual(df_filled["timestamp"].tolist(), [0, 60, 120, 180, 240, 300])
+        self.assertTrue(
+            df_filled.iloc[2:4].drop(columns="timestamp").isna().all().all()
+        )
+        self.assertFalse(df_filled.drop(index=df_filled.index[2:4]).isna().any().any())
+
+    def test_unsorted_with_duplicates(self):
+        """Test that the input is sorted and de-duplicated, keeping the last row."""
+        df_messy = pd.concat(
+            [self.df.iloc[[2, 0, 1]], self.df.iloc[[0]].assign(open=9)]
+        )
+
+        df_filled = fill_gaps(df_messy, "ffill")
+
+        self.assertEqual(df_filled["timestamp"].tolist(), [0, 60, 120, 180, 240])
+        self.assertEqual(df_filled["open"].iloc[0], 9)
+
+    def test_no_gaps(self):
+        """Test that gap-free data is returned unchanged, with a datetime index."""
+        df_filled = fill_gaps(self.df.iloc[:2], "ffill")
+
+        pd.testing.assert_frame_equal(
+            df_filled.reset_index(drop=True), self.df.iloc[:2]
+        )
+        self.assertEqual(df_filled.index.name, "datetime")
+
+    def test_empty(self):
+        """Test filling an empty DataFrame."""
+        self.assertTrue(fill_gaps(self.df.iloc[:0]).empty)
+
+    def test_misaligned_timestamps(self):
+        """Test that timestamps off the time grid raise a ValueError."""
+        with self.assertRaises(ValueError):
+            fill_gaps(self.df.assign(timestamp=[0, 60, 250, 300]))
+
+    def test_invalid_policy(self):
+        """Test that an unknown policy raises a ValueError."""
+        with self.assertRaises(ValueError):
+            fill_gaps(self.df, "invalid")
+
+
+if __name__ == "__main__":
+    unittest.main()
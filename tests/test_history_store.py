@@ -0,0 +1,175 @@
+"""Tests for the HistoryStore class."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.bitstamp_dataset_downloader import DatasetDownloader
+from ohlc_toolkit.config import DEFAULT_DTYPE
+from ohlc_toolkit.history_store import METADATA_FILE_NAME, HistoryStore
+
+JAN_31_2025_23H = 1738364400  # 2025-01-31 23:00:00 UTC
+
+
+def _minute_data(start: int, num_rows: int) -> pd.DataFrame:
+    """Create minute data starting at a timestamp, with the default dtypes."""
+    values = np.arange(num_rows, dtype="float32") + start % 1000
+    return pd.DataFrame(
+        {
+            "timestamp": start + 60 * np.arange(num_rows),
+            "open": values,
+            "high": values + 1,
+            "low": values - 1,
+            "close": values + 0.5,
+            "volume": np.ones(num_rows),
+        }
+    ).astype(DEFAULT_DTYPE)
+
+
+class TestHistoryStore(unittest.TestCase):
+    """Test cases for the HistoryStore class."""
+
+    def setUp(self):
+        """Create a temporary store directory."""
+        self.root_dir = tempfile.mkdtemp()
+        self.store = HistoryStore(self.root_dir)
+
+    def tearDown(self):
+        """Remove the temporary store directory."""
+        shutil.rmtree(self.root_dir)
+
+    def test_merge_partitions_by_month(self):
+        """Test that merged rows are appended to monthly partitions."""
+        df = _minute_data(JAN_31_2025_23H, 120)  # 60 rows in Jan, 60 in Feb
+
+        self.assertEqual(self.store.merge(df), 120)
+
+        self.assertEqual(
+            self.store.partitions(),
+            [
+                f"{self.root_dir}/2025/2025-01.csv",
+                f"{self.root_dir}/2025/2025-02.csv",
+            ],
+        )
+        self.assertEqual(self.store.high_water_mark, JAN_31_2025_23H + 119 * 60)
+        pd.testing.assert_frame_equal(
+            self.store.read().reset_index(drop=True), df, check_index_type=False
+        )
+
+    def test_merge_only_appends_new_rows(self):
+        """Test that overlapping and duplicate rows are not stored twice."""
+        self.store.merge(_minute_data(JAN_31_2025_23H, 90))
+        update = _minute_data(JAN_31_2025_23H + 30 * 60, 90)
+        update = pd.concat([update, update.iloc[-1:]])  # Duplicate timestamp
+
+        self.assertEqual(self.store.merge(update), 30)
+        self.assertEqual(self.store.merge(update), 0)
+
+        df = self.store.read()
+        self.assertEqual(len(df), 120)
+        self.assertTrue(df["timestamp"].is_unique)
+        self.assertTrue(df["timestamp"].is_monotonic_increasing)
+
+    def test_high_water_mark_persists(self):
+        """Test that a reopened store keeps its high-water mark."""
+        self.store.merge(_minute_data(JAN_31_2025_23H, 10))
+
+        reopened = HistoryStore(self.root_dir)
+
+        self.assertEqual(reopened.high_water_mark, self.store.high_water_mark)
+
+    def test_recovers_from_interrupted_merge(self):
+        """Test recovering the high-water mark when the metadata is stale."""
+        self.store.merge(_minute_data(JAN_31_2025_23H, 10))
+        os.remove(os.path.join(self.root_dir, METADATA_FILE_NAME))
+        # Simulate rows appended before the metadata was updated
+        _minute_data(JAN_31_2025_23H + 600, 5).to_csv(
+            f"{self.root_dir}/2025/2025-01.csv", mode="a", header=False, index=False
+        )
+
+        reopened = HistoryStore(self.root_dir)
+
+        self.assertEqual(reopened.high_water_mark, JAN_31_2025_23H + 14 * 60)
+        self.assertEqual(reopened.merge(_minute_data(JAN_31_2025_23H, 20)), 5)
+
+    def test_repairs_partially_written_row(self):
+        """Test that a row cut off by an interrupted append is removed on open."""
+        self.store.merge(_minute_data(JAN_31_2025_23H, 10))
+        os.remove(os.path.join(self.root_dir, METADATA_FILE_NAME))
+        with open(f"{self.root_dir}/2025/2025-01.csv", "a") as file:
+            file.write(f"{JAN_31_2025_23H + 600},12")
+
+        reopened = HistoryStore(self.root_dir)
+
+        self.assertEqual(reopened.high_water_mark, JAN_31_2025_23H + 9 * 60)
+        self.assertEqual(reopened.merge(_minute_data(JAN_31_2025_23H, 20)), 10)
+        pd.testing.assert_frame_equal(
+            reopened.read().reset_index(drop=True), _minute_data(JAN_31_2025_23H, 20)
+        )
+
+    def test_read_range(self):
+        """Test reading only the rows within a timestamp range."""
+        self.store.merge(_minute_data(JAN_31_2025_23H, 120))
+
+        df = self.store.read(start=JAN_31_2025_23H + 3600, end=JAN_31_2025_23H + 3660)
+
+        self.assertEqual(df["timestamp"].tolist(), [1738368000, 1738368060])
+        self.assertIsInstance(df.index, pd.DatetimeIndex)
+
+    def test_read_empty_store(self):
+        """Test reading a store without any rows."""
+        df = self.store.read()
+        self.assertTrue(df.empty)
+        self.assertEqual(df["timestamp"].dtype, DEFAULT_DTYPE["timestamp"])
+
+    def test_merge_csv(self):
+        """Test merging a CSV update file."""
+        self.assertEqual(
+            self.store.merge_csv("tests/test_data/real_world_data.csv"), 1440
+        )
+
+
+class TestDownloaderHistoryStore(unittest.TestCase):
+    """Test cases for updating a history store from the downloader."""
+
+    def setUp(self):
+        """Create a temporary data directory with a recent dataset."""
+        self.data_dir = tempfile.mkdtemp()
+        shutil.copy(
+            "tests/test_data/real_world_data.csv",
+            os.path.join(self.data_dir, "btcusd_bitstamp_1min_latest.csv"),
+        )
+        self.store = HistoryStore(os.path.join(self.data_dir, "history"))
+        self.downloader = DatasetDownloader(data_dir=self.data_dir)
+
+    def tearDown(self):
+        """Remove the temporary data directory."""
+        shutil.rmtree(self.data_dir)
+
+    def test_update_history_store(self):
+        """Test merging the recent dataset, and skipping it when unchanged."""
+        with patch.object(self.downloader, "_download_file", return_value=True):
+            self.assertEqual(self.downloader.update_history_store(self.store), 1440)
+        with patch.object(self.downloader, "_download_file", return_value=False):
+            self.assertEqual(self.downloader.update_history_store(self.store), 0)
+
+    def test_download_deduplicates_overlap(self):
+        """Test that merged bulk and recent datasets have one row per timestamp."""
+        df_recent = pd.read_csv("tests/test_data/real_world_data.csv")
+        with (
+            patch("os.path.exists", return_value=True),
+            patch("pandas.read_csv", return_value=df_recent),
+        ):
+            df = self.downloader.download_all_bitstamp_btcusd_minute_data(
+                overwrite_bulk=False, overwrite_recent=False
+            )
+        self.assertEqual(len(df), len(df_recent))
+
+
+if __name__ == "__main__":
+    unittest.main()
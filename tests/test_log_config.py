@@ -1,10 +1,15 @@
 """Test cases for the log configuration module."""
 
 import importlib
+import io
 import os
+import threading
+import time
 import unittest
 from unittest.mock import patch
 
+import orjson
+
 from ohlc_toolkit.config import logging
 from ohlc_toolkit.config.logging import _get_log_file_path, get_logger
 
@@ -111,6 +116,108 @@ class TestLogConfig(unittest.TestCase):
                 "ohlc_toolkit",
             )
 
+    def test_performance_mode(self):
+        """Test that performance mode writes all records from a background thread."""
+        env = {"ENABLE_SERIALIZE_LOGS": "TRUE", "ENABLE_PERFORMANCE_LOGGING": "TRUE"}
+        stream = io.StringIO()
+        with patch.dict(os.environ, env), patch("sys.stdout", stream):
+            importlib.reload(logging)  # Reload the module to apply the env vars
+            test_logger = logging.get_logger("ohlc_toolkit.test_module3")
+            for i in range(100):
+                test_logger.bind(body=i).info("Message {}", i)
+            test_logger.debug("Dropped below the level")
+
+            # Removing the sink stops the writer, which writes the queued records
+            logging.loggers["ohlc_toolkit"].remove()
+
+        records = [orjson.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(
+            [record["message"] for record in records],
+            [f"Message {i} | {i}" for i in range(100)],
+        )
+        self.assertEqual(records[0]["name"], __name__)
+        importlib.reload(logging)  # Restore the default configuration
+
+
+class _BlockingStream(io.StringIO):
+    """Stream whose writes wait until `release` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.writing.set()
+        self.release.wait()
+        return super().write(text)
+
+
+class _FailingStream(io.StringIO):
+    """Stream whose first write fails."""
+
+    def __init__(self):
+        super().__init__()
+        self.failed = False
+
+    def write(self, text: str) -> int:
+        if not self.failed:
+            self.failed = True
+            raise OSError("Disk full")
+        return super().write(text)
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    """Test cases for the background writer of performance mode."""
+
+    def test_full_queue_drops_messages(self):
+        """Test that messages are dropped and counted when the queue is full."""
+        stream = _BlockingStream()
+        writer = logging._BackgroundWriter(stream, max_queued=2)
+        writer.write("first\n")
+        stream.writing.wait()  # The thread holds the first message
+        for i in range(5):
+            writer.write(f"message {i}\n")
+        stream.release.set()
+        writer.stop()
+
+        self.assertEqual(writer.dropped, 3)
+        self.assertEqual(
+            stream.getvalue().splitlines(),
+            [
+                "first",
+                "message 0",
+                "message 1",
+                "Dropped 3 log messages, the log queue was full",
+            ],
+        )
+
+    def test_block_policy_keeps_all_messages(self):
+        """Test that blocking writes wait for room instead of dropping messages."""
+        stream = io.StringIO()
+        writer = logging._BackgroundWriter(stream, max_queued=1, block=True)
+        for i in range(1000):
+            writer.write(f"{i}\n")
+        writer.stop()
+
+        self.assertEqual(writer.dropped, 0)
+        self.assertEqual(stream.getvalue().split(), [str(i) for i in range(1000)])
+
+    def test_write_error_does_not_stop_the_thread(self):
+        """Test that a failed write is reported, and later messages are written."""
+        stream = _FailingStream()
+        stderr = io.StringIO()
+        with patch("sys.stderr", stderr):
+            writer = logging._BackgroundWriter(stream)
+            writer.write("lost\n")
+            while not stream.failed:
+                time.sleep(0.01)
+            writer.write("kept\n")
+            writer.stop()
+
+        self.assertEqual(stream.getvalue(), "kept\n")
+        self.assertIn("Disk full", stderr.getvalue())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for the multi-symbol batch processing functions."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+from ohlc_toolkit.multi_symbol import read_ohlc_csv_dir, transform_ohlc_symbols
+from ohlc_toolkit.transform import transform_ohlc
+
+
+class TestMultiSymbol(unittest.TestCase):
+    """Test cases for the multi-symbol batch processing functions."""
+
+    def setUp(self):
+        """Set up a long-format frame of three symbols of different lengths."""
+        self.df = read_ohlc_csv("tests/test_data/real_world_data.csv", timeframe="1m")
+        self.frames = {
+            "BTCUSD": self.df,
+            "ETHUSD": self.df.iloc[:700].assign(open=self.df["open"].iloc[:700] / 30),
+            "SOLUSD": self.df.iloc[:40],
+        }
+        self.df_long = pd.concat(
+            frame.assign(symbol=symbol) for symbol, frame in self.frames.items()
+        ).sample(frac=1, random_state=0)  # Unsorted input
+
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_transform_ohlc_per_symbol(self):
+        """Test that each symbol matches transform_ohlc on its own data."""
+        cases: list[tuple[int | str, int]] = [("15m", 1), ("1h", 15), (7, 3)]
+        for timeframe, step_size_minutes in cases:
+            with self.subTest(timeframe=timeframe, step=step_size_minutes):
+                df_agg = transform_ohlc_symbols(
+                    self.df_long, timeframe, step_size_minutes
+                )
+                for symbol in ["BTCUSD", "ETHUSD"]:
+                    pd.testing.assert_frame_equal(
+                        df_agg[df_agg["symbol"] == symbol].drop(columns="symbol"),
+                        transform_ohlc(
+                            self.frames[symbol], timeframe, step_size_minutes
+                        ),
+                        check_freq=False,
+                    )
+
+    def test_short_symbols_are_reported(self):
+        """Test that a symbol with too little data is skipped and reported."""
+        df_agg = transform_ohlc_symbols(self.df_long, "1h")
+
+        self.assertEqual(set(df_agg["symbol"]), {"BTCUSD", "ETHUSD"})
+        self.assertEqual(list(df_agg.attrs["errors"]), ["SOLUSD"])
+
+    def test_missing_columns(self):
+        """Test that a frame without a symbol column raises a KeyError."""
+        with self.assertRaises(KeyError):
+            transform_ohlc_symbols(self.df, "1h")
+
+    def test_invalid_timeframe(self):
+        """Test that an invalid timeframe raises a ValueError."""
+        with self.assertRaises(ValueError):
+            transform_ohlc_symbols(self.df_long, 0)
+
+    def test_directory_of_csv_files(self):
+        """Test reading and transforming a directory of CSV files."""
+        for symbol, frame in self.frames.items():
+            frame.to_csv(f"{self.temp_dir}/{symbol}.csv", index=False)
+        frame.to_csv(f"{self.temp_dir}/XRPUSD.csv.gz", index=False)
+        with open(f"{self.temp_dir}/BADUSD.csv", "w") as file:
+            file.write("timestamp,open\nnot,a number\n")
+        with open(f"{self.temp_dir}/notes.txt", "w") as file:
+            file.write("Not a dataset")
+
+        df_read = read_ohlc_csv_dir(self.temp_dir, num_workers=2, show_progress=False)
+        self.assertEqual(
+            sorted(set(df_read["symbol"])), ["BTCUSD", "ETHUSD", "SOLUSD", "XRPUSD"]
+        )
+        self.assertEqual(list(df_read.attrs["errors"]), ["BADUSD"])
+
+        df_agg = transform_ohlc_symbols(
+            self.temp_dir, "1h", num_workers=2, show_progress=False
+        )
+        self.assertEqual(set(df_agg["symbol"]), {"BTCUSD", "ETHUSD"})
+        self.assertEqual(sorted(df_agg.attrs["errors"]), ["BADUSD", "SOLUSD", "XRPUSD"])
+
+    def test_empty_directory(self):
+        """Test that an empty directory gives an empty result."""
+        os.makedirs(f"{self.temp_dir}/empty")
+        df_agg = transform_ohlc_symbols(f"{self.temp_dir}/empty", 5)
+        self.assertTrue(df_agg.empty)
+        self.assertEqual(df_agg.attrs["errors"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""Tests for the pandas_ta.indicators module."""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+from ohlc_toolkit.pandas_ta.indicators import (
+    atr,
+    compute_indicators,
+    ema,
+    rsi,
+    sma,
+    volatility,
+    vwap,
+    zscore,
+)
+
+
+def _rma(series: pd.Series, length: int) -> pd.Series:
+    """Wilder's moving average, as pandas-ta defines it."""
+    return series.ewm(alpha=1 / length, min_periods=length).mean()
+
+
+class TestIndicators(unittest.TestCase):
+    """Test the indicators against their pandas-ta definitions in plain pandas."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.df = read_ohlc_csv("tests/test_data/real_world_data.csv", timeframe="1m")
+        self.close = self.df["close"].astype(np.float64)
+
+    def test_sma(self):
+        """Test the simple moving average."""
+        result = sma(self.close, length=20)
+        pd.testing.assert_series_equal(
+            result, self.close.rolling(20).mean(), check_names=False
+        )
+        self.assertEqual(result.name, "SMA_20")
+        self.assertEqual(result.category, "overlap")
+
+    def test_sma_with_nans(self):
+        """Test that only the windows containing a NaN are NaN."""
+        close = pd.Series(np.arange(1.0, 21.0))
+        close.iloc[3] = np.nan
+
+        result = sma(close, length=3)
+
+        pd.testing.assert_series_equal(
+            result, close.rolling(3).mean(), check_names=False
+        )
+        self.assertEqual(result.iloc[6], 6.0)
+        pd.testing.assert_series_equal(
+            zscore(close, length=3),
+            (close - close.rolling(3).mean()) / close.rolling(3).std(),
+            check_names=False,
+        )
+
+    def test_ema(self):
+        """Test the exponential moving average, seeded with the SMA."""
+        seeded = self.close.copy()
+        seeded.iloc[:9] = np.nan
+        seeded.iloc[9] = self.close.iloc[:10].mean()
+
+        pd.testing.assert_series_equal(
+            ema(self.close),
+            seeded.ewm(span=10, adjust=False).mean(),
+            check_names=False,
+        )
+
+    def test_rsi(self):
+        """Test the relative strength index."""
+        change = self.close.diff()
+        gains = _rma(change.clip(lower=0), 14)
+        losses = _rma(-change.clip(upper=0), 14)
+
+        result = rsi(self.close)
+        pd.testing.assert_series_equal(
+            result, 100 * gains / (gains + losses), check_names=False
+        )
+        self.assertTrue(result.iloc[:14].isna().all())
+        self.assertEqual(result.name, "RSI_14")
+
+    def test_atr(self):
+        """Test the average true range."""
+        previous_close = self.close.shift(1)
+        true_range = pd.concat(
+            [
+                self.df["high"] - self.df["low"],
+                (self.df["high"] - previous_close).abs(),
+                (previous_close - self.df["low"]).abs(),
+            ],
+            axis=1,
+        ).max(axis=1)
+        true_range.iloc[0] = np.nan
+
+        pd.testing.assert_series_equal(
+            atr(self.df["high"], self.df["low"], self.close, length=7),
+            _rma(true_range.astype(np.float64), 7),
+            check_names=False,
+        )
+
+    def test_volatility_and_zscore(self):
+        """Test the rolling volatility and the z score."""
+        log_returns = pd.Series(np.log(self.close / self.close.shift(1)))
+        pd.testing.assert_series_equal(
+            volatility(self.close, length=30),
+            log_returns.rolling(30).std(),
+            check_names=False,
+        )
+
+        rolling = self.close.rolling(30)
+        pd.testing.assert_series_equal(
+            zscore(self.close, length=30),
+            (self.close - rolling.mean()) / rolling.std(),
+            check_names=False,
+        )
+
+    def test_vwap(self):
+        """Test the anchored volume weighted average price."""
+        typical_price = (self.df["high"] + self.df["low"] + self.df["close"]) / 3
+        periods = pd.DatetimeIndex(self.df.index).to_period("h")
+        weighted = (typical_price * self.df["volume"]).astype(np.float64)
+        expected = (
+            weighted.groupby(periods).cumsum()
+            / self.df["volume"].astype(np.float64).groupby(periods).cumsum()
+        )
+
+        result = vwap(
+            self.df["high"], self.df["low"], self.close, self.df["volume"], anchor="h"
+        )
+        pd.testing.assert_series_equal(result, expected, check_names=False)
+        self.assertEqual(result.name, "VWAP_h")
+
+    def test_offset_and_fillna(self):
+        """Test offsetting and filling the result."""
+        result = sma(self.close, length=3, offset=1, fillna=0)
+        self.assertEqual(result.iloc[:3].tolist(), [0, 0, 0])
+        self.assertAlmostEqual(result.iloc[3], self.close.iloc[:3].mean())
+
+    def test_short_series(self):
+        """Test that a series shorter than the length raises a ValueError."""
+        with self.assertRaises(ValueError):
+            rsi(self.close.iloc[:10], length=14)
+
+
+class TestComputeIndicators(unittest.TestCase):
+    """Test computing many indicators in one pass."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.df = read_ohlc_csv("tests/test_data/real_world_data.csv", timeframe="1m")
+
+    def test_sweep_matches_single_indicators(self):
+        """Test that every column of a sweep matches the single indicator."""
+        result = compute_indicators(
+            self.df,
+            {
+                "ema": range(5, 50, 5),
+                "sma": [2, 2000],
+                "rsi": [14],
+                "zscore": [30, 60],
+                "vwap": ["D"],
+            },
+        )
+
+        self.assertEqual(result.shape, (len(self.df), 15))
+        self.assertEqual(result.columns[0], "EMA_5")
+        self.assertTrue(result["SMA_2000"].isna().all())
+        close = self.df["close"].astype(np.float64)
+        for length in range(5, 50, 5):
+            pd.testing.assert_series_equal(
+                result[f"EMA_{length}"], ema(close, length), check_names=False
+            )
+        pd.testing.assert_series_equal(
+            result["ZS_60"], zscore(close, 60), check_names=False
+        )
+
+    def test_float32_output(self):
+        """Test writing the matrix as float32."""
+        result = compute_indicators(
+            self.df, {"sma": [10], "atr": [14]}, dtype=np.float32
+        )
+        self.assertEqual(result.dtypes.unique().tolist(), [np.float32])
+        np.testing.assert_allclose(
+            result["SMA_10"], self.df["close"].rolling(10).mean(), rtol=1e-6
+        )
+
+    def test_invalid_indicators(self):
+        """Test that unknown indicators and invalid lengths raise a ValueError."""
+        with self.assertRaises(ValueError):
+            compute_indicators(self.df, {"macd": [12]})
+        with self.assertRaises(ValueError):
+            compute_indicators(self.df, {"sma": [0]})
+        with self.assertRaises(TypeError):
+            compute_indicators(self.df.reset_index(drop=True), {"vwap": ["D"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Tests for the pipeline stage timing."""
+
+import unittest
+
+import orjson
+import pandas as pd
+
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+from ohlc_toolkit.profiling import PipelineStats, StageStats
+from ohlc_toolkit.transform import transform_ohlc
+
+
+class TestPipelineStats(unittest.TestCase):
+    """Test cases for recording the stats of pipeline stages."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.filepath = "tests/test_data/real_world_data.csv"
+
+    def test_read_stages(self):
+        """Test the stages recorded by `read_ohlc_csv`."""
+        stats = PipelineStats()
+        df = read_ohlc_csv(self.filepath, stats=stats)
+
+        self.assertEqual(
+            [stage.name for stage in stats.stages],
+            [
+                "parse",
+                "infer_time_step",
+                "sort",
+                "check_data_integrity",
+                "datetime_index",
+            ],
+        )
+        parse = stats.stages[0]
+        self.assertEqual(parse.rows_out, len(df))
+        self.assertGreater(parse.bytes_out, 0)
+        self.assertIsNone(parse.bytes_allocated)
+        self.assertAlmostEqual(
+            stats.total_seconds, sum(stage.seconds for stage in stats.stages)
+        )
+
+    def test_transform_stages_and_callback(self):
+        """Test the stages of `transform_ohlc`, reported to a callback."""
+        df = read_ohlc_csv(self.filepath)
+        received: list[StageStats] = []
+        stats = PipelineStats(received.append)
+        result = transform_ohlc(df, "1h", 15, gap_policy="drop", stats=stats)
+
+        self.assertEqual(
+            [stage.name for stage in received],
+            [
+                "ensure_datetime_index",
+                "fill_gaps",
+                "aggregate",
+                "drop_gap_windows",
+                "check_data_integrity",
+            ],
+        )
+        self.assertEqual(received, stats.stages)
+        aggregate = stats.stages[2]
+        self.assertEqual(aggregate.rows_in, len(df))
+        self.assertEqual(stats.stages[3].rows_out, len(result))
+
+        # The stats serialize, for log pipelines
+        payload = orjson.loads(orjson.dumps(stats.to_dict()))
+        self.assertEqual(len(payload["stages"]), 5)
+
+        # Without stats, the result is the same
+        pd.testing.assert_frame_equal(
+            result, transform_ohlc(df, "1h", 15, gap_policy="drop")
+        )
+
+    def test_track_memory(self):
+        """Test tracing the bytes allocated by each stage."""
+        df = read_ohlc_csv(self.filepath)
+        stats = PipelineStats(track_memory=True)
+        transform_ohlc(df, "1h", stats=stats)
+
+        aggregate = next(stage for stage in stats.stages if stage.name == "aggregate")
+        assert aggregate.bytes_allocated is not None
+        self.assertGreaterEqual(aggregate.bytes_allocated, aggregate.bytes_out // 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
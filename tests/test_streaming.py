@@ -0,0 +1,89 @@
+"""Tests for the StreamingOHLCAggregator class."""
+
+import json
+import unittest
+
+import pandas as pd
+
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+from ohlc_toolkit.streaming import StreamingOHLCAggregator
+from ohlc_toolkit.transform import transform_ohlc
+
+
+class TestStreamingOHLCAggregator(unittest.TestCase):
+    """Test cases for the StreamingOHLCAggregator class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.df = read_ohlc_csv("tests/test_data/real_world_data.csv", timeframe="1m")
+
+    def test_matches_transform_ohlc(self):
+        """Test that streamed candles match transform_ohlc."""
+        cases: list[tuple[int | str, int]] = [("1h", 1), (5, 5), ("1h", 15), (7, 3)]
+        for timeframe, step_size_minutes in cases:
+            with self.subTest(timeframe=timeframe, step=step_size_minutes):
+                aggregator = StreamingOHLCAggregator(timeframe, step_size_minutes)
+                pd.testing.assert_frame_equal(
+                    aggregator.update_many(self.df),
+                    transform_ohlc(self.df, timeframe, step_size_minutes),
+                    check_freq=False,
+                )
+
+    def test_resume_from_serialized_state(self):
+        """Test that a restored aggregator continues where the original stopped."""
+        aggregator = StreamingOHLCAggregator("15m", step_size_minutes=5)
+        candles = [aggregator.update_many(self.df.iloc[:500])]
+
+        state = json.loads(json.dumps(aggregator.get_state()))
+        restored = StreamingOHLCAggregator.from_state(state)
+        candles.append(restored.update_many(self.df.iloc[500:]))
+
+        pd.testing.assert_frame_equal(
+            pd.concat(candles),
+            transform_ohlc(self.df, "15m", step_size_minutes=5),
+            check_freq=False,
+        )
+
+    def test_update_single_bars(self):
+        """Test emitting candles one bar at a time."""
+        aggregator = StreamingOHLCAggregator(3, step_size_minutes=2)
+        bars = self.df.iloc[:6].to_dict("records", into=dict)
+
+        candles = [aggregator.update(bar) for bar in bars]
+
+        self.assertEqual(candles[:2], [None, None])
+        self.assertIsNone(candles[3])
+        self.assertIsNone(candles[5])
+        first, second = candles[2], candles[4]
+        assert first is not None and second is not None
+        self.assertEqual(first["open"], bars[0]["open"])
+        self.assertEqual(second["open"], bars[2]["open"])
+        self.assertEqual(second["close"], bars[4]["close"])
+        self.assertEqual(second["high"], max(bar["high"] for bar in bars[2:5]))
+
+    def test_replayed_bars_are_ignored(self):
+        """Test that bars at or before the last accepted timestamp are skipped."""
+        aggregator = StreamingOHLCAggregator(2)
+        bars = self.df.iloc[:3].to_dict("records", into=dict)
+        aggregator.update(bars[0])
+        candle = aggregator.update(bars[1])
+
+        self.assertIsNone(aggregator.update(bars[1]))
+        self.assertEqual(aggregator.get_state()["bars_seen"], 2)
+        assert candle is not None
+        self.assertEqual(candle["timestamp"], bars[1]["timestamp"])
+
+    def test_invalid_arguments(self):
+        """Test that invalid timeframes, step sizes and states are rejected."""
+        with self.assertRaises(ValueError):
+            StreamingOHLCAggregator(0)
+        with self.assertRaises(ValueError):
+            StreamingOHLCAggregator("90s")
+        with self.assertRaises(ValueError):
+            StreamingOHLCAggregator("1h", step_size_minutes=0)
+        with self.assertRaises(ValueError):
+            StreamingOHLCAggregator.from_state({"version": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,8 @@ from ohlc_toolkit.timeframes import (
     COMMON_TIMEFRAMES,
     format_timeframe,
     parse_timeframe,
+    parse_timeframe_to_seconds,
+    rows_per_interval,
     validate_timeframe,
     validate_timeframe_format,
 )
@@ -168,6 +170,23 @@ class TestTimeframes(unittest.TestCase):
             time_step,
         )
 
+    def test_parse_timeframe_to_seconds(self):
+        """Test parsing timeframes given in minutes or as strings to seconds."""
+        logger = Mock()
+        self.assertEqual(parse_timeframe_to_seconds(15, logger), 900)
+        self.assertEqual(parse_timeframe_to_seconds("1h30s", logger), 3630)
+        with self.assertRaises(ValueError):
+            parse_timeframe_to_seconds(1.5, logger)  # type: ignore
+
+    def test_rows_per_interval(self):
+        """Test counting the data rows in an interval."""
+        self.assertEqual(rows_per_interval(3600, 60, "Timeframe"), 60)
+        self.assertEqual(rows_per_interval(15, 1, "Step size"), 15)
+        for seconds in [30, 90]:
+            with self.subTest(seconds=seconds):
+                with self.assertRaises(ValueError):
+                    rows_per_interval(seconds, 60, "Timeframe")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,11 +1,20 @@
 """Tests for the transform_ohlc function."""
 
 import unittest
+from unittest import mock
 
+import numpy as np
 import pandas as pd
 
-from ohlc_toolkit.csv_reader import read_ohlc_csv
-from ohlc_toolkit.transform import transform_ohlc
+from ohlc_toolkit.csv_reader import iter_ohlc_csv, read_ohlc_csv
+from ohlc_toolkit.transform import (
+    _check_timestamps_increasing,
+    resample_ohlc,
+    rolling_ohlc,
+    transform_ohlc,
+    transform_ohlc_chunks,
+    transform_ohlc_many,
+)
 
 
 class TestTransformOHLC(unittest.TestCase):
@@ -120,6 +129,39 @@ class TestTransformOHLC(unittest.TestCase):
         self.assertEqual(transformed_df.iloc[1]["close"], close_next_3_rows)
         self.assertEqual(transformed_df.iloc[1]["volume"], volume_next_3_rows)
 
+    def test_transform_ohlc_strided_index(self):
+        """Test that strided windows are indexed by the last row of each window."""
+        transformed_df = transform_ohlc(self.df, timeframe="1h", step_size_minutes=15)
+
+        self.assertEqual(transformed_df.shape[0], (self.df_rows - 60) // 15 + 1)
+        self.assertTrue(transformed_df.index.equals(self.df.index[59::15]))
+        self.assertEqual(transformed_df.iloc[2]["open"], self.df.iloc[30]["open"])
+        self.assertEqual(transformed_df.iloc[2]["close"], self.df.iloc[89]["close"])
+        self.assertEqual(
+            transformed_df.iloc[2]["high"], self.df.iloc[30:90]["high"].max()
+        )
+
+    def test_previous_long_input_alignment(self):
+        """Test the README recipe for the windows that long inputs used to keep."""
+        for timeframe, step in [(60, 15), (7, 3), (10, 4)]:
+            with self.subTest(timeframe=timeframe, step=step):
+                # Long inputs used to keep every step-th rolling window from row 0
+                previous = (
+                    rolling_ohlc(self.df, timeframe, engine="pandas")
+                    .iloc[::step]
+                    .dropna()
+                )
+                result = transform_ohlc(
+                    self.df.iloc[(1 - timeframe) % step :], timeframe, step
+                )
+                value_columns = ["open", "high", "low", "close", "volume"]
+                self.assertTrue(result.index.equals(previous.index))
+                np.testing.assert_allclose(
+                    result[value_columns].to_numpy(),
+                    previous[value_columns].to_numpy(),
+                    rtol=1e-6,  # The result keeps the float32 input data types
+                )
+
     def test_transform_with_non_datetime_index(self):
         """Test transforming a DataFrame with a non-datetime index."""
         # Reset the index to make it non-datetime
@@ -133,11 +175,58 @@ class TestTransformOHLC(unittest.TestCase):
         )
 
         # Check that the index of the transformed DataFrame is a DatetimeIndex
-        # self.assertTrue(isinstance(transformed_df.index, pd.DatetimeIndex))
+        self.assertTrue(isinstance(transformed_df.index, pd.DatetimeIndex))
 
         # Check that the DataFrame is sorted by the datetime index
         self.assertTrue(transformed_df.index.is_monotonic_increasing)
 
+        # Shuffled rows are sorted before aggregating
+        pd.testing.assert_frame_equal(
+            transform_ohlc(
+                df_non_datetime_index.sample(frac=1, random_state=0), "3m", 3
+            ),
+            transformed_df,
+        )
+
+    def test_datetime_index_fast_path(self):
+        """Test that an input with a datetime index is neither copied nor sorted."""
+        with (
+            mock.patch.object(pd.DataFrame, "sort_values", side_effect=AssertionError),
+            mock.patch.object(pd.DataFrame, "copy", side_effect=AssertionError),
+        ):
+            transform_ohlc(self.df, "15m", 5)
+
+    def test_shuffled_datetime_index(self):
+        """Test that an input with a datetime index out of order is sorted first."""
+        shuffled = self.df.sample(frac=1, random_state=0)
+        pd.testing.assert_frame_equal(
+            transform_ohlc(shuffled, "5m"), transform_ohlc(self.df, "5m")
+        )
+        pd.testing.assert_frame_equal(
+            transform_ohlc_many(shuffled, ["5m", "15m"])["15m"],
+            transform_ohlc(self.df, "15m"),
+            check_freq=False,
+        )
+
+    def test_validation_levels(self):
+        """Test the full, cheap and disabled output checks."""
+        expected = transform_ohlc(self.df, "1h", 15)
+        with mock.patch("ohlc_toolkit.transform.check_data_integrity") as mock_check:
+            for validation in ["cheap", "none"]:
+                pd.testing.assert_frame_equal(
+                    transform_ohlc(self.df, "1h", 15, validation=validation), expected
+                )
+        mock_check.assert_not_called()
+
+        logger = mock.Mock()
+        _check_timestamps_increasing(expected, logger)
+        logger.warning.assert_not_called()
+        _check_timestamps_increasing(pd.concat([expected, expected]), logger)
+        logger.warning.assert_called_once()
+
+        with self.assertRaises(ValueError):
+            transform_ohlc(self.df, "1h", validation="lazy")
+
     def test_transform_window_larger_than_data_with_step_size_1(self):
         """Test transforming a DataFrame with a window larger than the data (rolling case)."""
         # Transform the DataFrame
@@ -177,15 +266,345 @@ class TestTransformOHLC(unittest.TestCase):
         with self.assertRaises(ValueError):
             transform_ohlc(self.df, timeframe=3.5, step_size_minutes=1)  # type: ignore
 
+    def test_rolling_ohlc_engines_match(self):
+        """Test that the numpy engine matches the pandas engine, up to rounding."""
+        for timeframe_minutes in [1, 5, 60, 1439]:
+            with self.subTest(timeframe_minutes=timeframe_minutes):
+                result = rolling_ohlc(self.df, timeframe_minutes)
+                expected = rolling_ohlc(self.df, timeframe_minutes, engine="pandas")
+                # Sums are added in another order, so volumes may differ by ULPs
+                pd.testing.assert_frame_equal(
+                    result.drop(columns="volume"),
+                    expected.drop(columns="volume"),
+                    check_exact=True,
+                )
+                pd.testing.assert_series_equal(
+                    result["volume"], expected["volume"], check_exact=False, rtol=1e-12
+                )
+
+    def test_rolling_ohlc_invalid_engine(self):
+        """Test that an unknown rolling engine raises a ValueError."""
+        with self.assertRaises(ValueError):
+            rolling_ohlc(self.df, 5, engine="invalid")
+
     def test_invalid_timeframe(self):
         """Test with an invalid timeframe."""
         with self.assertRaises(ValueError):
             transform_ohlc(self.df, timeframe="invalid", step_size_minutes=5)
 
     def test_non_integer_timeframe(self):
-        """Test with a non-integer timeframe."""
-        with self.assertRaises(NotImplementedError):
+        """Test that a timeframe finer than the step or the data raises an error."""
+        with self.assertRaises(ValueError):
             transform_ohlc(self.df, timeframe="5s", step_size_minutes=5)
+        with self.assertRaises(ValueError):
+            transform_ohlc(self.df, timeframe="90s")
+        with self.assertRaises(ValueError):
+            transform_ohlc(self.df, timeframe="5m", step_size_seconds=30)
+
+    def test_second_level_data(self):
+        """Test transforming 1-second bars, with sub-minute steps."""
+        df_seconds = self.df.iloc[:600].copy()
+        df_seconds["timestamp"] = df_seconds["timestamp"].iloc[0] + np.arange(600)
+        df_seconds.index = pd.to_datetime(df_seconds["timestamp"], unit="s")
+        df_seconds.index.name = "datetime"
+
+        result = transform_ohlc(
+            df_seconds, "15s", step_size_seconds=5, time_step_seconds=1
+        )
+        self.assertEqual(len(result), (600 - 15) // 5 + 1)
+        self.assertEqual(result["timestamp"].diff().iloc[1:].unique().tolist(), [5])
+
+        # Relabelled as minutes, the same rows aggregate to the same values
+        expected = transform_ohlc(self.df.iloc[:600], 15, 5)
+        value_columns = ["open", "high", "low", "close", "volume"]
+        np.testing.assert_array_equal(
+            result[value_columns].to_numpy(), expected[value_columns].to_numpy()
+        )
+
+    def test_gap_policies(self):
+        """Test that windows across missing minutes follow the gap policy."""
+        df_gaps = self.df.drop(index=self.df.index[100:110])
+
+        df_ffill = transform_ohlc(df_gaps, "15m", gap_policy="ffill")
+        self.assertEqual(len(df_ffill), self.df_rows - 14)
+        self.assertEqual(df_ffill["timestamp"].diff().iloc[1:].unique().tolist(), [60])
+
+        df_nan = transform_ohlc(df_gaps, "15m", gap_policy="nan")
+        self.assertEqual(len(df_nan), self.df_rows - 14)
+        self.assertEqual(df_nan["open"].isna().sum(), 24)  # Windows ending at 100-123
+
+        df_drop = transform_ohlc(df_gaps, "15m", gap_policy="drop")
+        pd.testing.assert_frame_equal(df_drop, df_nan.dropna())
+
+        # Windows away from the gap match the gap-free result
+        df_full = transform_ohlc(self.df, "15m")
+        pd.testing.assert_frame_equal(
+            df_drop.iloc[:80], df_full.iloc[:80], check_freq=False
+        )
+
+    def test_parallel_matches_serial(self):
+        """Test that aggregating segments in parallel threads matches a serial run."""
+        with mock.patch("ohlc_toolkit.transform.PARALLEL_MIN_SEGMENT_WINDOWS", 50):
+            cases: list[tuple[int | str, int]] = [
+                ("1h", 1),
+                (7, 1),
+                ("1h", 15),
+                (7, 3),
+                (10, 10),
+            ]
+            for timeframe, step_size_minutes in cases:
+                with self.subTest(timeframe=timeframe, step=step_size_minutes):
+                    pd.testing.assert_frame_equal(
+                        transform_ohlc(
+                            self.df, timeframe, step_size_minutes, num_workers=4
+                        ),
+                        transform_ohlc(self.df, timeframe, step_size_minutes),
+                    )
+
+    def test_invalid_num_workers(self):
+        """Test that a non-positive number of workers raises a ValueError."""
+        with self.assertRaises(ValueError):
+            transform_ohlc(self.df, "1h", num_workers=0)
+        # None uses all CPU cores
+        self.assertEqual(
+            len(transform_ohlc(self.df, "1h", num_workers=None)), self.df_rows - 59
+        )
+
+    def test_gap_policy_drop_all_windows(self):
+        """Test that dropping every window raises a ValueError."""
+        df_gaps = self.df.iloc[::2]
+        with self.assertRaises(ValueError):
+            transform_ohlc(df_gaps, 5, gap_policy="drop")
+
+
+class TestTransformOHLCMany(unittest.TestCase):
+    """Test cases for the transform_ohlc_many function."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.df = read_ohlc_csv("tests/test_data/real_world_data.csv", timeframe="1m")
+
+    def test_matches_transform_ohlc(self):
+        """Test that each timeframe matches a separate transform_ohlc call."""
+        timeframes: list[int | str] = [5, "15m", "1h", "4h"]
+        for step_size_minutes in [1, 5]:
+            results = transform_ohlc_many(
+                self.df, timeframes, step_size_minutes=step_size_minutes
+            )
+            self.assertEqual(list(results), timeframes)
+            for timeframe in timeframes:
+                with self.subTest(timeframe=timeframe, step=step_size_minutes):
+                    pd.testing.assert_frame_equal(
+                        results[timeframe],
+                        transform_ohlc(
+                            self.df, timeframe, step_size_minutes=step_size_minutes
+                        ),
+                        check_freq=False,
+                    )
+
+    def test_non_datetime_index(self):
+        """Test that a non-datetime index is converted once for all timeframes."""
+        results = transform_ohlc_many(self.df.reset_index(drop=True), ["15m", "1h"])
+        self.assertIsInstance(results["1h"].index, pd.DatetimeIndex)
+        self.assertTrue(results["1h"].index.is_monotonic_increasing)
+
+    def test_timeframe_too_large(self):
+        """Test that a timeframe larger than the data raises a ValueError."""
+        with self.assertRaises(ValueError):
+            transform_ohlc_many(self.df, ["1h", "2d"])
+
+    def test_timeframe_smaller_than_step(self):
+        """Test that a timeframe smaller than the step size raises a ValueError."""
+        with self.assertRaises(ValueError):
+            transform_ohlc_many(self.df, ["5m", "1h"], step_size_minutes=15)
+
+    def test_second_level_data(self):
+        """Test second-level timeframes, which must be whole rows of the data."""
+        df_seconds = self.df.iloc[:600].copy()
+        df_seconds["timestamp"] = df_seconds["timestamp"].iloc[0] + np.arange(600)
+        df_seconds.index = pd.to_datetime(df_seconds["timestamp"], unit="s")
+        df_seconds.index.name = "datetime"
+
+        timeframes: list[int | str] = ["15s", "90s", 2]
+        results = transform_ohlc_many(
+            df_seconds, timeframes, step_size_seconds=5, time_step_seconds=1
+        )
+        for timeframe in timeframes:
+            with self.subTest(timeframe=timeframe):
+                pd.testing.assert_frame_equal(
+                    results[timeframe],
+                    transform_ohlc(
+                        df_seconds,
+                        timeframe,
+                        step_size_seconds=5,
+                        time_step_seconds=1,
+                    ),
+                    check_freq=False,
+                )
+
+        with self.assertRaises(ValueError):
+            transform_ohlc_many(self.df, ["1h", "90s"])
+
+
+class TestTransformOHLCChunks(unittest.TestCase):
+    """Test cases for the transform_ohlc_chunks function."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.csv_path = "tests/test_data/real_world_data.csv"
+        self.df = read_ohlc_csv(self.csv_path, timeframe="1m")
+
+    def test_matches_transform_ohlc(self):
+        """Test that transforming chunks matches transforming the whole frame."""
+        cases: list[tuple[int | str, int]] = [("1h", 1), ("1h", 15), (300, 200)]
+        for timeframe, step_size_minutes in cases:
+            with self.subTest(timeframe=timeframe, step=step_size_minutes):
+                chunks = iter_ohlc_csv(self.csv_path, chunksize=100)
+                pd.testing.assert_frame_equal(
+                    pd.concat(
+                        list(
+                            transform_ohlc_chunks(chunks, timeframe, step_size_minutes)
+                        )
+                    ),
+                    transform_ohlc(self.df, timeframe, step_size_minutes),
+                    check_freq=False,
+                )
+
+    def test_timeframe_too_large(self):
+        """Test that a timeframe larger than all chunks raises a ValueError."""
+        chunks = iter_ohlc_csv(self.csv_path, chunksize=500)
+        with self.assertRaises(ValueError):
+            list(transform_ohlc_chunks(chunks, "2d"))
+
+    def test_second_level_data(self):
+        """Test second-level timeframes and steps over chunks of 1-second bars."""
+        df_seconds = self.df.iloc[:600].copy()
+        df_seconds["timestamp"] = df_seconds["timestamp"].iloc[0] + np.arange(600)
+        df_seconds.index = pd.to_datetime(df_seconds["timestamp"], unit="s")
+        df_seconds.index.name = "datetime"
+
+        chunks = [df_seconds.iloc[start : start + 70] for start in range(0, 600, 70)]
+        pd.testing.assert_frame_equal(
+            pd.concat(
+                list(
+                    transform_ohlc_chunks(
+                        chunks, "90s", step_size_seconds=15, time_step_seconds=1
+                    )
+                )
+            ),
+            transform_ohlc(
+                df_seconds, "90s", step_size_seconds=15, time_step_seconds=1
+            ),
+            check_freq=False,
+        )
+
+        with self.assertRaises(ValueError):
+            list(transform_ohlc_chunks(iter_ohlc_csv(self.csv_path), "90s"))
+
+
+class TestResampleOHLC(unittest.TestCase):
+    """Test cases for the resample_ohlc function."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.df = read_ohlc_csv("tests/test_data/real_world_data.csv", timeframe="1m")
+
+    def _pandas_resample(self, rule: str, offset: str | None = None) -> pd.DataFrame:
+        return (
+            self.df.resample(rule, offset=offset)
+            .agg(
+                {
+                    "open": "first",
+                    "high": "max",
+                    "low": "min",
+                    "close": "last",
+                    "volume": "sum",
+                }
+            )
+            .dropna()
+        )
+
+    def test_matches_pandas_resample(self):
+        """Test that aligned bars match pandas' calendar resampling."""
+        cases: list[tuple[int | str, str, str | None]] = [
+            ("1h", "1h", None),
+            (15, "15min", None),
+            ("1h", "1h", "30min"),
+        ]
+        for timeframe, rule, offset in cases:
+            with self.subTest(timeframe=timeframe, offset=offset):
+                df_bars = resample_ohlc(
+                    self.df, timeframe, offset="30m" if offset else 0
+                )
+                expected = self._pandas_resample(rule, offset)
+                pd.testing.assert_frame_equal(
+                    df_bars.drop(columns="timestamp"),
+                    expected,
+                    check_freq=False,
+                    check_dtype=False,
+                )
+                self.assertTrue(
+                    (
+                        df_bars.index == pd.to_datetime(df_bars["timestamp"], unit="s")
+                    ).all()
+                )
+
+    def test_daily_bars_at_midnight(self):
+        """Test that daily bars start at UTC midnight, with partial edges."""
+        df_bars = resample_ohlc(self.df, "1d")
+
+        # The data covers 2025-01-07 00:01 to 2025-01-08 00:00
+        self.assertEqual(
+            df_bars.index.tolist(),
+            [pd.Timestamp("2025-01-07"), pd.Timestamp("2025-01-08")],
+        )
+        self.assertEqual(df_bars["open"].iloc[0], self.df["open"].iloc[0])
+        self.assertEqual(df_bars["close"].iloc[-1], self.df["close"].iloc[-1])
+
+        with self.assertRaises(ValueError):
+            resample_ohlc(self.df, "1d", partial="drop")
+
+    def test_drop_partial_bars(self):
+        """Test that partial first and last bars are dropped."""
+        df_bars = resample_ohlc(self.df, "1h", partial="drop")
+
+        # The first hour misses minute 0, and the last hour only has minute 0
+        self.assertEqual(len(df_bars), 23)
+        self.assertEqual(df_bars.index[0], pd.Timestamp("2025-01-07 01:00"))
+        self.assertEqual(df_bars.index[-1], pd.Timestamp("2025-01-07 23:00"))
+
+    def test_weekly_bars_on_monday(self):
+        """Test that weekly bars start on Monday 00:00 UTC."""
+        timestamps = np.arange(
+            pd.Timestamp("2025-01-01").timestamp(),
+            pd.Timestamp("2025-01-22").timestamp(),
+            3600,
+            dtype=np.int64,
+        )
+        df_hourly = pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "open": 1.0,
+                "high": 2.0,
+                "low": 0.5,
+                "close": 1.5,
+                "volume": 1.0,
+            }
+        )
+
+        df_bars = resample_ohlc(df_hourly, "1w", time_step_seconds=3600)
+
+        self.assertEqual(pd.DatetimeIndex(df_bars.index).weekday.tolist(), [0] * 4)
+        self.assertEqual(df_bars["volume"].tolist(), [5 * 24, 7 * 24, 7 * 24, 2 * 24])
+
+    def test_invalid_arguments(self):
+        """Test that invalid arguments raise a ValueError."""
+        with self.assertRaises(ValueError):
+            resample_ohlc(self.df, "1h", partial="invalid")
+        with self.assertRaises(ValueError):
+            resample_ohlc(self.df, 1.5)  # type: ignore
+        with self.assertRaises(ValueError):
+            resample_ohlc(self.df.iloc[:0], "1h")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""Tests for the transform result cache."""
+
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from ohlc_toolkit.csv_reader import read_ohlc_csv
+from ohlc_toolkit.profiling import PipelineStats
+from ohlc_toolkit.transform import transform_ohlc
+from ohlc_toolkit.transform_cache import TransformCache, fingerprint
+
+
+class TestTransformCache(unittest.TestCase):
+    """Test cases for the transform result cache."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.df = read_ohlc_csv("tests/test_data/real_world_data.csv", timeframe="1m")
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_hit_returns_same_result(self):
+        """Test that a repeated call is served from the cache."""
+        cache = TransformCache()
+        first = cache.transform_ohlc(self.df, "1h", 15)
+
+        with patch("ohlc_toolkit.transform_cache.transform_ohlc") as mock_transform:
+            second = cache.transform_ohlc(self.df.copy(), 60, 15)
+        mock_transform.assert_not_called()
+
+        pd.testing.assert_frame_equal(first, transform_ohlc(self.df, "1h", 15))
+        pd.testing.assert_frame_equal(second, first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        second["close"] = 0  # Results are copies, so the cache is unaffected
+        pd.testing.assert_frame_equal(cache.transform_ohlc(self.df, "1h", 15), first)
+
+    def test_parameters_and_data_are_part_of_the_key(self):
+        """Test that other parameters or other data miss the cache."""
+        cache = TransformCache()
+        cache.transform_ohlc(self.df, "1h", 15)
+        cache.transform_ohlc(self.df, "1h", 30)
+        cache.transform_ohlc(self.df, "1h", 15, gap_policy="ffill")
+        cache.transform_ohlc(self.df.assign(close=self.df["close"] + 1), "1h", 15)
+
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+
+    def test_appended_rows_recompute_only_the_tail(self):
+        """Test that appending rows only computes the new windows."""
+        cases: list[tuple[int | str, int]] = [("1h", 15), (7, 1), (10, 3)]
+        for timeframe, step_size_minutes in cases:
+            with self.subTest(timeframe=timeframe, step=step_size_minutes):
+                cache = TransformCache()
+                cache.transform_ohlc(self.df.iloc[:600], timeframe, step_size_minutes)
+
+                with patch(
+                    "ohlc_toolkit.transform_cache.transform_ohlc",
+                    wraps=transform_ohlc,
+                ) as mock_transform:
+                    result = cache.transform_ohlc(self.df, timeframe, step_size_minutes)
+                tail = mock_transform.call_args.args[0]
+                self.assertLess(len(tail), len(self.df) - 500)
+
+                self.assertEqual(cache.partial_hits, 1)
+                pd.testing.assert_frame_equal(
+                    result,
+                    transform_ohlc(self.df, timeframe, step_size_minutes),
+                    check_freq=False,
+                )
+
+    def test_appended_rows_without_new_windows(self):
+        """Test appending fewer rows than needed to complete a new window."""
+        cache = TransformCache()
+        cached = cache.transform_ohlc(self.df.iloc[:600], "1h", 60)
+        result = cache.transform_ohlc(self.df.iloc[:610], "1h", 60)
+
+        self.assertEqual(cache.partial_hits, 1)
+        pd.testing.assert_frame_equal(result, cached)
+
+    def test_validation_and_stats_are_forwarded(self):
+        """Test that the validation level and stats reach `transform_ohlc`."""
+        cache = TransformCache()
+        stats = PipelineStats()
+        cache.transform_ohlc(self.df, "1h", 15, validation="cheap", stats=stats)
+        names = [stage.name for stage in stats.stages]
+        self.assertIn("check_timestamps", names)
+        self.assertNotIn("check_data_integrity", names)
+
+        with self.assertRaises(ValueError):
+            cache.transform_ohlc(self.df, "2h", 15, validation="everything")
+
+    def test_lru_eviction_by_size(self):
+        """Test that the least recently used results are evicted past max_bytes."""
+        result_bytes = (
+            transform_ohlc(self.df, 5).memory_usage(index=True, deep=True).sum()
+        )
+        cache = TransformCache(max_bytes=int(result_bytes * 2.5))
+        for timeframe in [5, 6, 5, 7]:  # 5 is used again, so 7 evicts 6
+            cache.transform_ohlc(self.df, timeframe)
+
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.num_bytes, cache.max_bytes)
+        cache.transform_ohlc(self.df, 5)
+        cache.transform_ohlc(self.df, 6)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test_disk_tier(self):
+        """Test that results stored on disk are reused by another cache."""
+        TransformCache(cache_dir=self.temp_dir).transform_ohlc(self.df, "1h", 15)
+
+        cache = TransformCache(cache_dir=self.temp_dir)
+        with patch("ohlc_toolkit.transform_cache.transform_ohlc") as mock_transform:
+            result = cache.transform_ohlc(self.df, "1h", 15)
+        mock_transform.assert_not_called()
+        pd.testing.assert_frame_equal(result, transform_ohlc(self.df, "1h", 15))
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        cache.transform_ohlc(self.df, "1h", 15)
+        self.assertEqual(cache.misses, 1)
+
+    def test_fingerprint(self):
+        """Test that the fingerprint depends on the shape and sampled values."""
+        self.assertEqual(fingerprint(self.df), fingerprint(self.df.copy()))
+        self.assertNotEqual(fingerprint(self.df), fingerprint(self.df.iloc[:-1]))
+        self.assertNotEqual(
+            fingerprint(self.df), fingerprint(self.df.astype({"volume": "float64"}))
+        )
+        self.assertEqual(
+            fingerprint(self.df.iloc[:0]), fingerprint(self.df.iloc[:0].copy())
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
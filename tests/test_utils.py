@@ -5,7 +5,7 @@ import unittest
 import pandas as pd
 
 from ohlc_toolkit.config.logging import get_logger
-from ohlc_toolkit.utils import check_data_integrity, infer_time_step
+from ohlc_toolkit.utils import IntegrityReport, check_data_integrity, infer_time_step
 
 
 class TestUtils(unittest.TestCase):
@@ -92,6 +92,44 @@ class TestUtils(unittest.TestCase):
         df_missing_timestamps = self.df_valid.drop(2)
         check_data_integrity(df_missing_timestamps, self.logger, 60)
 
+    def test_check_data_integrity_report(self):
+        """Test the structured report returned by the integrity checks."""
+        report = check_data_integrity(self.df_valid, self.logger, 60)
+        self.assertIsInstance(report, IntegrityReport)
+        self.assertTrue(report.is_valid)
+        self.assertEqual(report.num_rows, 4)
+        self.assertEqual(report.gaps.shape, (0, 2))
+
+        report = check_data_integrity(self.df_with_nulls, self.logger, 60)
+        self.assertFalse(report.is_valid)
+        self.assertEqual(report.null_counts["close"], 1)
+        self.assertEqual(report.null_counts["open"], 0)
+
+        report = check_data_integrity(self.df_with_duplicates, self.logger)
+        self.assertEqual(report.duplicate_count, 1)
+        self.assertFalse(report.out_of_order)
+
+    def test_check_data_integrity_gaps(self):
+        """Test finding the ranges of missing timestamps."""
+        df_gaps = self.df_valid.copy()
+        df_gaps["timestamp"] = [0, 60, 300, 420]  # Missing 120-240 and 360
+
+        report = check_data_integrity(df_gaps, self.logger, 60)
+
+        self.assertEqual(report.missing_count, 4)
+        self.assertEqual(report.gaps.tolist(), [[120, 240], [360, 360]])
+        self.assertFalse(report.out_of_order)
+
+    def test_check_data_integrity_unsorted_gaps(self):
+        """Test that gaps are found on unsorted timestamps."""
+        df_unsorted = self.df_valid.copy()
+        df_unsorted["timestamp"] = [300, 0, 60, 180]
+
+        report = check_data_integrity(df_unsorted, self.logger, 60)
+
+        self.assertTrue(report.out_of_order)
+        self.assertEqual(report.gaps.tolist(), [[120, 120], [240, 240]])
+
 
 if __name__ == "__main__":
     unittest.main()